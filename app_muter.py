@@ -1,3 +1,6 @@
+from startup_profile import StartupProfile, profile_mode
+STARTUP = StartupProfile()  # Created before the imports below so they are measured
+
 import os
 import sys
 import psutil
@@ -5,15 +8,33 @@ import toml
 import win32gui
 import win32process
 import win32con
-import win32ui
 import ctypes
 import win32api
 import pyuac
 import time
-from tkinter import Tk, Listbox, Button, Label, END, Checkbutton, IntVar, Scale, Toplevel, Frame, Entry, StringVar, OptionMenu, LabelFrame, messagebox, Scrollbar, Canvas
-
-from pycaw.pycaw import AudioUtilities, IAudioMeterInformation
-from resize_widget import ResizeWidgetManager
+import atexit
+from tkinter import Tk, Listbox, Button, Label, END, Checkbutton, IntVar, Toplevel, Frame, Entry, StringVar, LabelFrame, messagebox
+
+from window_scheduler import DebouncedCall, TimerHeap
+from window_geometry import GeometryCache, place, read_display_topology
+from window_layout import LayoutTransaction, Win32LayoutBackend
+from window_guard import HungWindowGuard, Win32HangProbe
+from window_planner import WindowRulePlanner, Win32Desktop
+from window_events import AppWindowScanner, Win32WindowEvents
+from volume_rows import AppRowModel, VirtualAppList
+from config_store import ConfigStore
+from config_watcher import ConfigWatcher, Win32ChangeNotifier
+from config_model import ConfigError, ResolutionRule, WindowPosition, load_config, load_mute_groups, load_options, toml_value
+from icon_cache import IconCache
+from warm_start import SAVE_INTERVAL_MS, WarmStart, Win32ProcessProbe
+from single_instance import POLL_MS as INSTANCE_POLL_MS, InstanceChannel, command_from_args
+
+STARTUP.mark("imports")
+
+def audio_sessions():
+    """All audio sessions; pycaw (and comtypes with it) is imported on the first call"""
+    from pycaw.pycaw import AudioUtilities
+    return AudioUtilities.GetAllSessions()
 
 def read_config(filename):
     try:
@@ -27,6 +48,30 @@ def read_config(filename):
         print(f"File '{filename}' not found.")
         return {}
 
+# config.toml sections that can be reloaded while running -> AppState attribute
+RELOADABLE_TABLES = {
+    "APP_VOLUMES": "app_volumes",
+    "PID_MATCH_APPS": "pid_match_apps",
+    "HIDE_TITLEBAR_APPS": "hide_titlebar_apps",
+    "MAXIMIZE_APPS": "maximize_apps",
+    "ALWAYS_ON_TOP_APPS": "always_on_top_apps",
+    "RESIZE_WIDGET_APPS": "resize_widget_apps",
+    "CUSTOM_RESOLUTION_APPS": "custom_resolution_apps",
+    "WINDOW_PLACEMENTS": "window_placements",
+    "BORDER_STYLES": "border_styles",
+    "STARTUP_DELAYS": "startup_delays",
+    "WINDOW_POSITIONS": "window_positions",
+    "AUTO_RESTORE_POSITIONS": "auto_restore_positions",
+    "FORCE_MUTED_APPS": "force_muted_apps",
+}
+
+# Sections the window rule planner reads
+WINDOW_RULE_SECTIONS = {"HIDE_TITLEBAR_APPS", "BORDER_STYLES", "CUSTOM_RESOLUTION_APPS",
+                        "WINDOW_PLACEMENTS", "ALWAYS_ON_TOP_APPS"}
+# Rescan for resize widget windows at least every this many list ticks,
+# in case a window event was missed
+WIDGET_RESCAN_TICKS = 10
+
 class AppState:
     def __init__(self):
         # Add version constant
@@ -39,8 +84,21 @@ class AppState:
         self.config = read_config("config.toml")
         self.runtime = read_config("runtime.toml")
         
-        self.DEFAULT_EXCEPTION_LIST = self.config.get("DEFAULT_EXCEPTIONS", ["chrome.exe", "firefox.exe", "msedge.exe"])
-        self.MUTE_GROUPS = self.config.get("MUTE_GROUPS", [])
+        # Saves are journaled on a background thread; this also replays changes
+        # a crash left in the journals, so it has to happen before validation
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        debug_mode = self.config.get("OPTIONS", {}).get("debug_mode", False) is True
+        self.config_store = ConfigStore(os.path.join(script_dir, "config.toml"), self.config,
+                                        debug_mode=debug_mode)
+        self.runtime_store = ConfigStore(os.path.join(script_dir, "runtime.toml"), self.runtime,
+                                         debug_mode=debug_mode)
+        atexit.register(self.flush_config)
+        
+        # config.toml is validated once here, invalid values are dropped
+        self.settings = load_config(self.config)
+        
+        self.DEFAULT_EXCEPTION_LIST = self.settings.table("DEFAULT_EXCEPTIONS")
+        self.set_mute_groups(self.read_mute_groups())
         
         # Get settings
         runtime_settings = self.runtime.get("SETTINGS", {})
@@ -67,6 +125,8 @@ class AppState:
         self.to_unmute = []
         self.last_foreground_app_pid = None
         self.zero_cnt = 0
+        self.exe_names = {}  # pid -> exe name of every audio session process, pruned each mute tick
+        self.applied_audio = {}  # pid -> (muted, volume) the mute loop last applied
 
         # Create Tkinter variables with defaults from runtime config
         self.mute_last_app = IntVar(value=runtime_settings.get("mute_last_app", 0))
@@ -74,6 +134,7 @@ class AppState:
         self.force_mute_bg_var = IntVar(value=runtime_settings.get("force_mute_bg", 0))
         self.lock_var = IntVar(value=runtime_settings.get("lock", 0))
         self.mute_foreground_when_background = IntVar(value=runtime_settings.get("mute_foreground_when_background", 0))
+        self.reloading_runtime = False  # Set while reload_runtime() applies values read from disk
 
         # Get window geometry from runtime settings
         window_settings = self.runtime.get("WINDOW_STATE", {})
@@ -88,22 +149,22 @@ class AppState:
             self.save_exceptions()
 
         # Load app-specific volumes
-        self.app_volumes = self.config.get("APP_VOLUMES", {})
+        self.app_volumes = self.settings.table("APP_VOLUMES")
 
         # Add pid_match_apps setting
-        self.pid_match_apps = self.config.get("PID_MATCH_APPS", [])
+        self.pid_match_apps = self.settings.table("PID_MATCH_APPS")
 
         # Add hide_titlebar_apps setting
-        self.hide_titlebar_apps = self.config.get("HIDE_TITLEBAR_APPS", [])
+        self.hide_titlebar_apps = self.settings.table("HIDE_TITLEBAR_APPS")
 
         # Add maximize_apps setting
-        self.maximize_apps = self.config.get("MAXIMIZE_APPS", [])
+        self.maximize_apps = self.settings.table("MAXIMIZE_APPS")
 
         # Add always on top settings
-        self.always_on_top_apps = self.config.get("ALWAYS_ON_TOP_APPS", [])
+        self.always_on_top_apps = self.settings.table("ALWAYS_ON_TOP_APPS")
 
         # Add resize widget settings
-        self.resize_widget_apps = self.config.get("RESIZE_WIDGET_APPS", [])
+        self.resize_widget_apps = self.settings.table("RESIZE_WIDGET_APPS")
 
         # Define resolution presets by aspect ratio
         self.RESOLUTION_PRESETS = {
@@ -156,7 +217,10 @@ class AppState:
         }
         
         # Add custom resolution settings
-        self.custom_resolution_apps = self.config.get("CUSTOM_RESOLUTION_APPS", {})
+        self.custom_resolution_apps = self.settings.table("CUSTOM_RESOLUTION_APPS")
+
+        # Target rects, valid for the current display topology
+        self.geometry = GeometryCache()
 
         # Define window placement options
         self.WINDOW_PLACEMENTS = {
@@ -173,7 +237,7 @@ class AppState:
         }
         
         # Add window placement settings
-        self.window_placements = self.config.get("WINDOW_PLACEMENTS", {})
+        self.window_placements = self.settings.table("WINDOW_PLACEMENTS")
 
         # Define border style options
         self.BORDER_STYLES = {
@@ -186,23 +250,41 @@ class AppState:
         }
         
         # Add border style settings
-        self.border_styles = self.config.get("BORDER_STYLES", {})
-
-        # Add options settings
-        self.options = self.config.get("OPTIONS", {
-            "window_check_interval": 1000,  # milliseconds
-            "volume_check_interval": 100,   # milliseconds
-            "list_update_interval": 100,    # milliseconds
-            "debug_mode": False,
-            "resize_widget_size": 10,       # pixels
-        })
+        self.border_styles = self.settings.table("BORDER_STYLES")
+
+        # Add options settings; loops read self.settings.options, the dict is what gets saved
+        self.options = self.settings.options.as_dict()
 
         # Add startup delay settings
-        self.startup_delays = self.config.get("STARTUP_DELAYS", {})
+        self.startup_delays = self.settings.table("STARTUP_DELAYS")
         self.app_start_times = {}  # Track when apps were first seen
+        self.restored_processes = set()  # Process keys whose window position was auto-restored
+
+        # Windows whose startup delay has expired, and timers for the ones still waiting
+        self.active_windows = set()
+        self.window_timers = TimerHeap(self.root, debug_mode=self.settings.options.debug_mode)
+
+        # Start times, managed windows and mute inputs from the last run, so that
+        # startup delays don't restart and the first tick decides like the last one
+        self.warm_start = WarmStart(os.path.join(script_dir, "warm_start.bin"), Win32ProcessProbe(),
+                                    debug_mode=self.settings.options.debug_mode)
+        self.restore_warm_start()
+        self.root.after(SAVE_INTERVAL_MS, self.save_warm_start_periodic)
+
+        # Window moves collected during a tick and committed together
+        self.window_guard = HungWindowGuard(Win32HangProbe(), debug_mode=self.settings.options.debug_mode)
+        self.layout_backend = Win32LayoutBackend(guard=self.window_guard,
+                                                 debug_mode=self.settings.options.debug_mode)
+        self.pending_layout = None
+
+        # Window rules are planned first, then executed; dry runs plan on a copy (see plan_window_rules)
+        self.window_planner = WindowRulePlanner(self.hide_titlebar_apps, self.border_styles,
+                                                self.custom_resolution_apps, self.window_placements,
+                                                self.always_on_top_apps, self.geometry)
+        self.desktop = Win32Desktop(self.window_guard)
 
         # Start combined window state checks
-        self.root.after(self.options["window_check_interval"], self.check_all_window_states)
+        self.root.after(self.settings.options.window_check_interval, self.check_all_window_states)
 
         # Add volume control window state
         self.volume_window_state = self.runtime.get("VOLUME_WINDOW_STATE", {
@@ -213,40 +295,155 @@ class AppState:
         self.volume_control: VolumeControlWindow = None  # Reference to volume control window
 
         # Add saved window positions
-        self.window_positions = self.config.get("WINDOW_POSITIONS", {})
+        self.window_positions = self.settings.table("WINDOW_POSITIONS")
 
         # Add auto-restore settings
-        self.auto_restore_positions = self.config.get("AUTO_RESTORE_POSITIONS", [])
+        self.auto_restore_positions = self.settings.table("AUTO_RESTORE_POSITIONS")
 
         # Add force mute settings
-        self.force_muted_apps = self.config.get("FORCE_MUTED_APPS", [])
+        self.force_muted_apps = self.settings.table("FORCE_MUTED_APPS")
+
+        # Pick up edits to the config files without restarting
+        self.start_config_watcher()
+
+        # Commands forwarded by later launches, see start_instance_commands()
+        self.instance_channel = None
+
+    def read_mute_groups(self):
+        """Read mute groups from mute_groups.toml, falling back to config.toml"""
+        groups = read_config("mute_groups.toml").get("MUTE_GROUPS")
+        if groups is None:
+            return self.settings.mute_groups
+        return load_mute_groups(groups)
+
+    def set_mute_groups(self, groups):
+        """Install mute groups and index them by exe name"""
+        self.MUTE_GROUPS = groups
+        self.mute_group_of = {}
+        for index, group in enumerate(groups):
+            for exe_name in group:
+                self.mute_group_of[exe_name] = index
+
+    def start_config_watcher(self):
+        """Poll the config files for external edits"""
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        try:
+            notifier = Win32ChangeNotifier(script_dir)
+        except Exception as e:
+            notifier = None  # Fall back to mtime/size polling alone
+            if self.settings.options.debug_mode:
+                print(f"Change notifications unavailable, polling config files: {e}")
+
+        self.config_watcher = ConfigWatcher(self.root, {
+            "config": os.path.join(script_dir, "config.toml"),
+            "runtime": os.path.join(script_dir, "runtime.toml"),
+            "mute_groups": os.path.join(script_dir, "mute_groups.toml"),
+        }, self.reload_config_files,
+            interval_ms=self.settings.options.config_reload_interval,
+            notifier=notifier,
+            debug_mode=self.settings.options.debug_mode)
+        self.config_watcher.start()
+
+    def reload_config_files(self, changed):
+        """Reparse the changed config files and rebuild only the tables they affect"""
+        if "config" in changed:
+            self.reload_config()
+        if "runtime" in changed:
+            self.reload_runtime()
+        if "mute_groups" in changed or "config" in changed:
+            groups = self.read_mute_groups()
+            if groups != self.MUTE_GROUPS:
+                self.set_mute_groups(groups)
+                print(f"Reloaded mute groups: {groups}")
+
+    def changed_sections(self, old, new):
+        return {section for section in set(old) | set(new) if old.get(section) != new.get(section)}
+
+    def reload_config(self):
+        if self.config_store.is_own_write():
+            return
+        config = read_config("config.toml")
+        if not config or self.config_store.matches(config):
+            return  # Missing file, or the change was our own save
+        # Changes not compacted into the file yet are replayed over the edit, not dropped
+        self.config_store.reload(config)
+        sections = self.changed_sections(self.config, config)
+        if not sections:
+            return
+
+        # Replace the contents in place so the config store keeps tracking the same dict
+        self.config.clear()
+        self.config.update(config)
+        self.settings = load_config(config)
+
+        for section in sections & RELOADABLE_TABLES.keys():
+            setattr(self, RELOADABLE_TABLES[section], self.settings.table(section))
+        if "OPTIONS" in sections:
+            self.options = self.settings.options.as_dict()
+        if "DEFAULT_EXCEPTIONS" in sections:
+            self.DEFAULT_EXCEPTION_LIST = self.settings.table("DEFAULT_EXCEPTIONS")
+        if sections & WINDOW_RULE_SECTIONS:
+            # Swap in a planner over the new tables; the geometry cache stays valid
+            self.window_planner = WindowRulePlanner(self.hide_titlebar_apps, self.border_styles,
+                                                    self.custom_resolution_apps, self.window_placements,
+                                                    self.always_on_top_apps, self.geometry)
+        if self.volume_control is not None:
+            self.volume_control.reload_rows()
+        print(f"Reloaded config.toml: {', '.join(sorted(sections))}")
+
+    def reload_runtime(self):
+        if self.runtime_store.is_own_write():
+            return
+        runtime = read_config("runtime.toml")
+        if not runtime or self.runtime_store.matches(runtime):
+            return  # Missing file, or the change was our own save
+        self.runtime_store.reload(runtime)
+        sections = self.changed_sections(self.runtime, runtime)
+        if not sections:
+            return
+
+        self.runtime.clear()
+        self.runtime.update(runtime)
+
+        if "CURRENT_EXCEPTIONS" in sections:
+            self.exceptions_list = self.runtime.get("CURRENT_EXCEPTIONS", [])
+        if "SETTINGS" in sections:
+            # The variable traces would save a half-applied SETTINGS back over the file just read
+            settings = self.runtime.get("SETTINGS", {})
+            self.reloading_runtime = True
+            try:
+                for var, key in ((self.mute_last_app, "mute_last_app"),
+                                 (self.force_mute_fg_var, "force_mute_fg"),
+                                 (self.force_mute_bg_var, "force_mute_bg"),
+                                 (self.lock_var, "lock"),
+                                 (self.mute_foreground_when_background, "mute_foreground_when_background")):
+                    value = settings.get(key, 0)
+                    if var.get() != value:
+                        var.set(value)
+            finally:
+                self.reloading_runtime = False
+        print(f"Reloaded runtime.toml: {', '.join(sorted(sections))}")
 
     def setup_main_window(self):
         """Initialize main window settings"""
         self.root.title(f"App Muter v{self.VERSION}")
         self.root.configure(bg=self.theme['bg'])
         
-        # Set unique app ID and icon for Windows taskbar
+        # Set unique app ID for Windows taskbar
         try:
             import ctypes
             myappid = 'mycompany.appmuter.subversion.1'
             ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
-            
-            # Load icon for both window and taskbar
-            icon_path = self.ensure_app_icon()
-            if icon_path:
-                from PIL import Image, ImageTk
-                icon = Image.open(icon_path)
-                # Convert to PhotoImage for window icon
-                photo = ImageTk.PhotoImage(icon)
-                self.root.iconphoto(True, photo)
-                # Convert to ICO for taskbar
-                icon_ico = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_icon.ico")
-                if not os.path.exists(icon_ico):
-                    icon.save(icon_ico, format='ICO', sizes=[(256, 256)])
-                self.root.iconbitmap(icon_ico)
         except Exception as e:
-            print(f"Error setting app ID/icon: {e}")
+            print(f"Error setting app ID: {e}")
+        
+        # Icons come from the icon cache; a cold cache is rebuilt after the first mute tick
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.icon_cache = IconCache(os.path.join(script_dir, "app_icon.png"),
+                                    os.path.join(script_dir, "icon_cache"),
+                                    debug_mode=self.settings.options.debug_mode)
+        self.app_icons = None
+        self.load_app_icon()
             
         # Center window
         screen_width = self.root.winfo_screenwidth()
@@ -255,83 +452,84 @@ class AppState:
         center_y = int(screen_height/2 - self.window['height']/2)
         self.root.geometry(f'{self.window["width"]}x{self.window["height"]}+{center_x}+{center_y}')
         
-        # Bind window events
-        self.root.bind("<Configure>", lambda e: self.save_window_state())
+        # Bind window events; geometry is persisted once it has been stable for a moment
+        self.window_state_saver = DebouncedCall(self.root, 500, self.save_window_state)
+        self.root.bind("<Configure>", self.on_root_configure)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_root_close)
 
-    def ensure_app_icon(self):
-        """Generate and save app icon if it doesn't exist"""
+    def load_app_icon(self):
+        """Set the window and taskbar icon from the icon cache, if it is up to date"""
         try:
-            from PIL import Image, ImageDraw
-            
-            icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_icon.png")
-            
-            # Only generate if icon doesn't exist
-            if not os.path.exists(icon_path):
-                # Create base image with transparency
-                size = 256
-                image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-                draw = ImageDraw.Draw(image)
-                
-                # Define colors
-                bg_color = '#2b2b2b'
-                fg_color = '#4b6eaf'
-                
-                # Draw main circle
-                padding = size * 0.1
-                circle_bbox = [padding, padding, size-padding, size-padding]
-                draw.ellipse(circle_bbox, fill=bg_color)
-                
-                # Draw speaker symbol
-                speaker_size = size * 0.4
-                speaker_x = size * 0.3
-                speaker_y = size * 0.3
-                
-                # Speaker box
-                box_points = [
-                    (speaker_x, speaker_y),
-                    (speaker_x + speaker_size*0.4, speaker_y),
-                    (speaker_x + speaker_size*0.8, speaker_y - speaker_size*0.2),
-                    (speaker_x + speaker_size*0.8, speaker_y + speaker_size*1.2),
-                    (speaker_x + speaker_size*0.4, speaker_y + speaker_size),
-                    (speaker_x, speaker_y + speaker_size),
-                ]
-                draw.polygon(box_points, fill=fg_color)
-                
-                # Sound waves
-                wave_x = speaker_x + speaker_size*0.9
-                wave_y = speaker_y + speaker_size*0.5
-                wave_radius = speaker_size * 0.2
-                
-                for i in range(3):
-                    draw.arc([wave_x + i*wave_radius, wave_y - wave_radius,
-                             wave_x + wave_radius + i*wave_radius, wave_y + wave_radius],
-                            -60, 60, fill=fg_color, width=int(size*0.02))
-                
-                # Draw mute line
-                line_width = int(size*0.04)
-                draw.line([(size*0.2, size*0.8), (size*0.8, size*0.2)], 
-                         fill='#ff6b6b', width=line_width)
-                
-                # Save as PNG
-                image.save(icon_path, format='PNG')
-            
-            return icon_path
-            
+            if not self.icon_cache.is_fresh():
+                return False
+            self.app_icons = self.icon_cache.load(self.root)  # Tk drops images nothing references
+            self.root.iconphoto(True, *self.app_icons)
+            self.root.iconbitmap(self.icon_cache.ico_path)
+            return True
+        except Exception as e:
+            print(f"Error setting app icon: {e}")
+            return False
+
+    def build_app_icon(self):
+        """Rebuild the icon cache (imports PIL) and set the icon from it"""
+        try:
+            self.icon_cache.build()
         except Exception as e:
             print(f"Error generating icon: {e}")
-            return None
+            return
+        self.load_app_icon()
+
+    def start_instance_commands(self, channel):
+        """Run the commands later launches forward to this instance"""
+        self.instance_channel = channel
+        self.root.after(INSTANCE_POLL_MS, self.poll_instance_commands)
+
+    def poll_instance_commands(self):
+        for command in self.instance_channel.poll():
+            self.handle_command(command)
+        self.root.after(INSTANCE_POLL_MS, self.poll_instance_commands)
+
+    def handle_command(self, command):
+        """Show the window, toggle the mute lock or reload the config files"""
+        print(f"Instance command: {command}")
+        if command == "show":
+            if self.root.state() in ('iconic', 'withdrawn'):
+                self.root.deiconify()  # Leaves a maximized window maximized
+            self.root.lift()
+            self.root.focus_force()
+        elif command == "toggle_lock":
+            self.lock_var.set(0 if self.lock_var.get() else 1)
+            self.update_params()
+        elif command == "reload":
+            self.reload_config_files({"config", "runtime", "mute_groups"})
+
+    def on_root_configure(self, event):
+        """Track main window geometry in memory and schedule a save"""
+        if event.widget is not self.root:
+            return  # Configure also fires for every child widget
+        if self.root.state() != 'zoomed':
+            # Store current geometry for when window is unmaximized
+            self.root.last_normal_geometry = self.root.geometry()
+        self.window_state_saver.trigger()
+
+    def on_root_close(self):
+        """Save window state and the warm start snapshot once more before exiting"""
+        self.window_state_saver.flush()
+        self.save_warm_start()
+        if self.settings.options.debug_mode:
+            print(f"Hung window guard: {self.window_guard.report()}")
+        if self.instance_channel is not None:
+            self.instance_channel.close()
+        self.root.destroy()
 
     def save_exceptions(self):
         """Save exceptions to runtime file"""
         self.runtime["CURRENT_EXCEPTIONS"] = self.exceptions_list
-        self.save_runtime()
+        self.save_runtime("CURRENT_EXCEPTIONS")
 
-    def save_runtime(self):
-        """Save runtime settings to file"""
+    def save_runtime(self, *sections):
+        """Queue runtime settings (and the given runtime sections) for saving"""
         try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            runtime_path = os.path.join(script_dir, "runtime.toml")
-            
             # Update runtime settings
             self.runtime["SETTINGS"] = {
                 "mute_last_app": self.mute_last_app.get(),
@@ -341,8 +539,7 @@ class AppState:
                 "lock": self.lock_var.get(),
             }
             
-            with open(runtime_path, "w") as f:
-                toml.dump(self.runtime, f)
+            self.runtime_store.mark_dirty("SETTINGS", *sections)
         except Exception as e:
             print(f"Error saving runtime config: {e}")
 
@@ -359,26 +556,31 @@ class AppState:
 
     def update_params(self):
         """Update runtime parameters"""
+        if self.reloading_runtime:
+            return  # The values come from runtime.toml, nothing to write back
         self.save_runtime()
 
     def save_window_state(self):
-        """Save current window position and size"""
+        """Save current window position and size if they changed"""
         try:
             # Get current window state
+            window_state = dict(self.window_state)
             if self.root.state() == 'zoomed':  # Window is maximized
-                self.window_state['maximized'] = True
+                window_state['maximized'] = True
                 # Store the last known normal geometry
                 if hasattr(self.root, 'last_normal_geometry'):
-                    self.window_state['geometry'] = self.root.last_normal_geometry
+                    window_state['geometry'] = self.root.last_normal_geometry
             else:
-                self.window_state['maximized'] = False
-                self.window_state['geometry'] = self.root.geometry()
-                # Store current geometry for when window is unmaximized
-                self.root.last_normal_geometry = self.root.geometry()
+                window_state['maximized'] = False
+                window_state['geometry'] = self.root.geometry()
+
+            if window_state == self.runtime.get("WINDOW_STATE"):
+                return
+            self.window_state = window_state
 
             # Update runtime settings
             self.runtime["WINDOW_STATE"] = self.window_state
-            self.save_runtime()
+            self.save_runtime("WINDOW_STATE")
         except Exception as e:
             print(f"Error saving window state: {e}")
 
@@ -429,24 +631,25 @@ class AppState:
             if self.debug_mode:
                 print(f"Error restoring window state: {e}")
 
-    def save_config(self):
-        """Save configuration settings to file"""
+    def save_config(self, *sections):
+        """Queue configuration sections for saving; with no arguments, the whole file"""
         try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(script_dir, "config.toml")
-            
-            with open(config_path, "w") as f:
-                toml.dump(self.config, f)
+            self.config_store.mark_dirty(*sections)
         except Exception as e:
             print(f"Error saving config: {e}")
             import traceback
             traceback.print_exc()
 
+    def flush_config(self):
+        """Write any queued config/runtime changes before exiting"""
+        self.config_store.close()
+        self.runtime_store.close()
+
     def save_app_volume(self, app_name, volume):
         """Save volume setting for specific app"""
         self.app_volumes[app_name] = volume
         self.config["APP_VOLUMES"] = self.app_volumes
-        self.save_config()
+        self.save_config("APP_VOLUMES")
 
     def get_app_volume(self, app_name):
         """Get volume setting for specific app"""
@@ -460,7 +663,7 @@ class AppState:
             self.pid_match_apps.remove(app_name)
         
         self.config["PID_MATCH_APPS"] = self.pid_match_apps
-        self.save_config()
+        self.save_config("PID_MATCH_APPS")
 
     def save_hide_titlebar_app(self, app_name, should_hide):
         """Save hide titlebar setting for specific app"""
@@ -472,7 +675,7 @@ class AppState:
             self.restore_title_bars(app_name)
         
         self.config["HIDE_TITLEBAR_APPS"] = self.hide_titlebar_apps
-        self.save_config()
+        self.save_config("HIDE_TITLEBAR_APPS")
 
     def restore_title_bars(self, app_name):
         """Restore title bars for all windows of given app"""
@@ -483,15 +686,15 @@ class AppState:
                     process = psutil.Process(pid)
                     process_name = os.path.basename(process.exe())
                     
-                    if process_name == app_name:
+                    if process_name == app_name and self.window_guard.allow(hwnd, probe_responsive=True):
                         # Get current window style
                         style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
                         
                         # Add title bar back
                         new_style = style | win32con.WS_CAPTION
-                        win32gui.SetWindowLong(hwnd, win32con.GWL_STYLE, new_style)
+                        self.window_guard.call(hwnd, win32gui.SetWindowLong, hwnd, win32con.GWL_STYLE, new_style)
                         # Force window to redraw
-                        win32gui.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
+                        self.queue_layout().set_window_pos(hwnd, 0, 0, 0, 0, 0,
                                             win32con.SWP_NOMOVE | 
                                             win32con.SWP_NOSIZE | 
                                             win32con.SWP_NOZORDER |
@@ -502,218 +705,81 @@ class AppState:
                 return True
 
             win32gui.EnumWindows(enum_windows_callback, None)
+            self.commit_layout()
         except Exception as e:
             print(f"Error restoring title bars: {e}")
 
+    def restore_warm_start(self):
+        """Adopt the parts of the last run's snapshot that still match live processes"""
+        state = self.warm_start.load()
+        if state is None:
+            return
+        for pid, create_time, name, first_seen, auto_restored in state["processes"]:
+            self.app_start_times[f"{name}_{pid}"] = first_seen
+            if auto_restored:
+                self.restored_processes.add(f"{name}_{pid}")
+        self.active_windows.update(hwnd for hwnd, pid in state["windows"])
+        self.last_foreground_app_pid = state["foreground_pid"]
+        self.zero_cnt = state["zero_cnt"]
+        self.exe_names.update(state["exe_names"])
+        self.applied_audio.update(state["audio"])
+
+    def save_warm_start(self):
+        """Snapshot process start times, managed windows and mute state for the next run"""
+        processes = []
+        for pid, name in self.process_names().items():
+            process_key = f"{name}_{pid}"
+            processes.append((pid, name, self.app_start_times[process_key],
+                              process_key in self.restored_processes))
+        self.warm_start.save(processes, self.active_windows, self.last_foreground_app_pid, self.zero_cnt,
+                             self.exe_names, self.applied_audio)
+
+    def save_warm_start_periodic(self):
+        self.save_warm_start()
+        self.root.after(SAVE_INTERVAL_MS, self.save_warm_start_periodic)
+
+    def process_names(self):
+        """Return {pid: exe name} for every process seen with windows"""
+        names = {}
+        for process_key in self.app_start_times:
+            name, pid_str = process_key.rsplit('_', 1)
+            try:
+                names[int(pid_str)] = name
+            except ValueError:
+                continue
+        return names
+
     def check_all_window_states(self):
         """Check and manage all window states"""
         try:
+            seen_windows = set()
+
             def enum_windows_callback(hwnd, _):
                 try:
                     _, pid = win32process.GetWindowThreadProcessId(hwnd)
                     process = psutil.Process(pid)
                     process_name = os.path.basename(process.exe())
+                    seen_windows.add(hwnd)
                     
                     # Track first time we see this process ID
-                    current_time = time.time()
                     process_key = f"{process_name}_{pid}"  # Use both name and PID as key
-                    
-                    # Handle auto-restore of window position
-                    if process_name in self.auto_restore_positions:
-                        if process_key not in self.app_start_times:
-                            # This is the first time we're seeing this window
-                            if self.options["debug_mode"]:
-                                print(f"Auto-restoring position for {process_name}")
-                            self.restore_window_position(process_name)
-                    
                     if process_key not in self.app_start_times:
-                        self.app_start_times[process_key] = current_time
-                        if self.options["debug_mode"]:
+                        self.app_start_times[process_key] = time.time()
+                        if self.settings.options.debug_mode:
                             print(f"First time seeing {process_name} (PID: {pid})")
                     
-                    # Check if we need to wait before managing this window
-                    startup_delay = self.startup_delays.get(process_name, 0)
-                    if startup_delay > 0:
-                        time_since_start = current_time - self.app_start_times[process_key]
-                        if time_since_start < startup_delay:
-                            if self.options["debug_mode"]:
-                                print(f"Waiting {startup_delay - time_since_start:.1f}s before managing {process_name} (PID: {pid})")
-                            return True
-                    
-                    # Track if we need to update window
-                    needs_update = False
-                    needs_style_update = False
-                    update_flags = win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE
-                    x = y = width = height = 0
-                    
-                    # Get current style once
-                    style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
-                    original_style = style
-                    
-                    # Handle title bars and borders
-                    if process_name in self.hide_titlebar_apps:
-                        # Remove all title bar related styles
-                        style &= ~(win32con.WS_CAPTION | 
-                                 win32con.WS_SYSMENU |
-                                 win32con.WS_MINIMIZEBOX |
-                                 win32con.WS_MAXIMIZEBOX)
-                        needs_style_update = True
-                        
-                        # Apply border style if set
-                        border_style = self.border_styles.get(process_name, "no_change")
-                        if border_style != "no_change":
-                            style &= ~(win32con.WS_BORDER | win32con.WS_THICKFRAME | win32con.WS_DLGFRAME)
-                            
-                            if border_style == "normal":
-                                style |= (win32con.WS_THICKFRAME | win32con.WS_BORDER)
-                                style &= ~win32con.WS_DLGFRAME
-                                style &= ~win32con.WS_OVERLAPPED
-                                style &= ~win32con.WS_CAPTION
-                                style &= ~win32con.WS_SYSMENU
-                                style &= ~win32con.WS_MINIMIZEBOX
-                                style &= ~win32con.WS_MAXIMIZEBOX
-                                style &= ~win32con.WS_TILEDWINDOW
-                                style &= ~win32con.WS_POPUP
-                                style &= ~win32con.WS_TILED
-                                style &= ~win32con.WS_OVERLAPPED
-                                style &= ~win32con.WS_CAPTION
-                                style &= ~win32con.WS_SYSMENU
-                                style &= ~win32con.WS_MINIMIZEBOX
-                                style &= ~win32con.WS_MAXIMIZEBOX
-                                # print style in hex
-                                print(f"Style: {hex(style)}")
-                                # style |= win32con.WS_POPUP
-                                style |= win32con.WS_THICKFRAME
-                            elif border_style == "thin":
-                                style |= win32con.WS_BORDER
-                            elif border_style == "dialog":
-                                style |= win32con.WS_DLGFRAME
-                            elif border_style == "tool":
-                                style |= win32con.WS_BORDER
-                                style &= ~(win32con.WS_MAXIMIZEBOX | win32con.WS_MINIMIZEBOX)
-                    
-                    # Apply style changes if needed
-                    if needs_style_update and style != original_style:
-                        win32gui.SetWindowLong(hwnd, win32con.GWL_STYLE, style)
-                        needs_update = True
-                        update_flags |= win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_FRAMECHANGED
-                    
-                    # Handle custom resolutions
-                    if process_name in self.custom_resolution_apps:
-                        if win32gui.IsWindowVisible(hwnd) and not win32gui.IsIconic(hwnd):
-                            placement = win32gui.GetWindowPlacement(hwnd)
-                            if placement[1] != win32con.SW_SHOWMAXIMIZED:
-                                settings = self.custom_resolution_apps[process_name]
-                                
-                                # Debug window info
-                                print(f"\nWindow debug for {process_name}:")
-                                print(f"  Window handle: {hwnd}")
-                                
-                                # Ensure process and window are DPI aware
-                                try:
-                                    user32 = ctypes.windll.user32
-                                    process_handle = win32api.OpenProcess(win32con.PROCESS_ALL_ACCESS, False, pid)
-                                    user32.SetProcessDpiAwarenessContext(process_handle, -4)
-                                    win32gui.SetWindowDisplayAffinity(hwnd, 0)
-                                except:
-                                    pass
-                                
-                                # Get screen dimensions and calculate size/position
-                                monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONEAREST)
-                                monitor_info = win32api.GetMonitorInfo(monitor)
-                                work_area = monitor_info['Work']
-                                screen_width = work_area[2] - work_area[0]
-                                screen_height = work_area[3] - work_area[1]
-                                
-                                # Calculate target dimensions
-                                target_width = settings["width"]
-                                target_height = settings["height"]
-                                
-                                if isinstance(target_width, str) and target_width.startswith("fit_"):
-                                    aspect_ratio = target_width.split("_", 1)[1]
-                                    if aspect_ratio == "3_4":
-                                        ratio = 3/4
-                                    elif aspect_ratio == "9_8":
-                                        ratio = 9/8
-                                    elif aspect_ratio == "16_9":
-                                        ratio = 16/9
-                                    elif aspect_ratio == "19_5_9":
-                                        ratio = 19.5/9
-                                    elif aspect_ratio == "21_9":
-                                        ratio = 21/9
-                                    elif aspect_ratio == "24_9":
-                                        ratio = 24/9
-                                    elif aspect_ratio == "32_9":
-                                        ratio = 32/9
-                                    
-                                    # Calculate dimensions that fit the screen while maintaining aspect ratio
-                                    # Ensure we're using DPI-aware dimensions
-                                    dpi_scale = user32.GetDpiForWindow(hwnd) / 96.0
-                                    scaled_width = int(screen_width / dpi_scale)
-                                    scaled_height = int(screen_height / dpi_scale)
-                                    
-                                    if (scaled_width/scaled_height) > ratio:
-                                        # Screen is wider than target ratio, fit to height
-                                        target_height = scaled_height
-                                        target_width = int(scaled_height * ratio)
-                                    else:
-                                        # Screen is taller than target ratio, fit to width
-                                        target_width = scaled_width
-                                        target_height = int(scaled_width / ratio)
-                                    
-                                    # Scale back to actual pixels
-                                    target_width = int(target_width * dpi_scale)
-                                    target_height = int(target_height * dpi_scale)
-                                
-                                # Calculate position
-                                placement = self.window_placements.get(process_name, "center")
-                                new_x, new_y = self.get_window_position(placement, screen_width, screen_height, 
-                                                                      target_width, target_height)
-                                
-                                if new_x is None or new_y is None:
-                                    rect = win32gui.GetWindowRect(hwnd)
-                                    new_x, new_y = rect[0], rect[1]
-                                
-                                # Update position and size
-                                x, y = new_x, new_y
-                                width, height = target_width, target_height
-                                needs_update = True
-                                update_flags &= ~(win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                                
-                                print(f"  Target size: {width}x{height}")
-                                print(f"  Position: {x},{y}")
-                    
-                    # Handle always on top
-                    if process_name in self.always_on_top_apps:
-                        # Set window to be always on top
-                        win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
-                                            win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
-                    
-                    # Apply all window updates at once
-                    if needs_update:
-                        try:
-                            user32 = ctypes.windll.user32
-                            user32.SetWindowPos(hwnd, 0, x, y, width, height, update_flags)
-                            
-                            # Verify size if we changed it
-                            if width > 0 and height > 0:
-                                time.sleep(0.1)
-                                new_rect = win32gui.GetWindowRect(hwnd)
-                                new_width = new_rect[2] - new_rect[0]
-                                new_height = new_rect[3] - new_rect[1]
-                                
-                                if new_width != width or new_height != height:
-                                    print(f"  Size mismatch, retrying... ({width}x{height} != {new_width}x{new_height})")
-                                    user32.SetWindowPos(hwnd, 0, x, y, width, height, update_flags)
-                        except Exception as e:
-                            print(f"  Error updating window: {e}")
+                    # Windows still inside their startup delay are handled by the timer heap
+                    if hwnd not in self.active_windows:
+                        if not self.window_timers.is_pending(hwnd):
+                            self.schedule_window_activation(hwnd, process_name, pid)
+                        return True
                     
+                    self.apply_window_rules(hwnd, process_name, pid)
                 except Exception as e:
                     print(f"Window callback error: {e}")
                 return True
 
             # Clean up old process entries
-            current_time = time.time()
             for process_key in list(self.app_start_times.keys()):
                 try:
                     name, pid_str = process_key.rsplit('_', 1)
@@ -721,23 +787,161 @@ class AppState:
                     psutil.Process(pid)  # Will raise error if process no longer exists
                 except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
                     del self.app_start_times[process_key]
+                    self.restored_processes.discard(process_key)
+
+            # Cached target rects stay valid until the monitor layout changes
+            if self.custom_resolution_apps:
+                self.geometry.update_topology(read_display_topology())
 
             win32gui.EnumWindows(enum_windows_callback, None)
+            self.commit_layout()
+
+            # Forget windows that have closed since the last pass
+            self.active_windows &= seen_windows
+            self.window_guard.forget(seen_windows)
+            for hwnd in self.window_timers.pending_keys():
+                if hwnd not in seen_windows:
+                    self.window_timers.cancel(hwnd)
         except Exception as e:
             print(f"Error checking window states: {e}")
         
         # Schedule next check
-        self.root.after(self.options["window_check_interval"], self.check_all_window_states)
+        self.root.after(self.settings.options.window_check_interval, self.check_all_window_states)
+
+    def schedule_window_activation(self, hwnd, process_name, pid):
+        """Schedule the first rule application for a window once its startup delay expires"""
+        process_key = f"{process_name}_{pid}"
+        startup_delay = self.startup_delays.get(process_name, 0)
+        due = self.app_start_times.get(process_key, time.time()) + startup_delay
+        
+        if due <= time.time():
+            self.activate_window(hwnd, process_name, pid)
+            return
+        
+        if self.settings.options.debug_mode:
+            print(f"Waiting {due - time.time():.1f}s before managing {process_name} (PID: {pid})")
+        self.window_timers.schedule(hwnd, due, lambda: self.activate_window(hwnd, process_name, pid))
+
+    def activate_window(self, hwnd, process_name, pid):
+        """Start managing a window: auto-restore its position and apply its rules"""
+        try:
+            if not win32gui.IsWindow(hwnd):
+                return
+            self.active_windows.add(hwnd)
+            
+            # Auto-restore once per process, to its first visible window; later popups
+            # and secondary windows keep their own positions
+            process_key = f"{process_name}_{pid}"
+            if (process_name in self.auto_restore_positions and process_name in self.window_positions
+                    and process_key not in self.restored_processes):
+                if win32gui.IsWindowVisible(hwnd) and self.window_guard.allow(hwnd):
+                    if self.settings.options.debug_mode:
+                        print(f"Auto-restoring position for {process_name}")
+                    self.restore_hwnd_position(hwnd, self.window_positions[process_name])
+                    self.restored_processes.add(process_key)
+            
+            self.apply_window_rules(hwnd, process_name, pid)
+        except Exception as e:
+            print(f"Error activating window {hwnd}: {e}")
+
+    def apply_window_rules(self, hwnd, process_name, pid):
+        """Apply title bar, border, resolution and topmost rules to a single window"""
+        if not self.window_planner.manages(process_name):
+            return
+
+        # Never block the Tk thread on a hung window
+        if not self.window_guard.allow(hwnd):
+            return
+
+        info = self.desktop.describe(hwnd, pid, process_name,
+                                     geometry=self.window_planner.needs_geometry(process_name))
+        self.execute_window_actions(info, self.window_planner.plan_window(info))
+
+    def plan_window_rules(self, desktop=None):
+        """Return what check_all_window_states would do right now, without touching any window"""
+        # Planning installs the desktop's topology, which must not evict the live cached rects
+        planner = self.window_planner.dry_run()
+        if desktop is None:
+            # Windows still inside their startup delay are not managed yet
+            return planner.plan(self.desktop, skip=set(self.window_timers.pending_keys()))
+        return planner.plan(desktop)
+
+    def execute_window_actions(self, info, actions):
+        """Apply planned actions for one window through the tick's layout transaction"""
+        if not actions:
+            return
+        hwnd = info.hwnd
+        layout = self.queue_layout()
+        update_flags = (win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE |
+                        win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+        x, y = info.rect[0], info.rect[1]
+        width, height = info.rect[2] - x, info.rect[3] - y
+        needs_update = False
+
+        for action in actions:
+            if self.settings.options.debug_mode:
+                print(f"  {action.describe()}")
+
+            if action.kind == "style":
+                # SetWindowLong sends style messages to the window and waits for them
+                if not self.window_guard.allow(hwnd, probe_responsive=True):
+                    return
+                self.window_guard.call(hwnd, win32gui.SetWindowLong, hwnd, win32con.GWL_STYLE, action.value)
+                update_flags |= win32con.SWP_FRAMECHANGED
+                needs_update = True
+            elif action.kind == "resize":
+                width, height = action.value
+                update_flags &= ~win32con.SWP_NOSIZE
+                needs_update = True
+            elif action.kind == "move":
+                x, y = action.value
+                update_flags &= ~win32con.SWP_NOMOVE
+                needs_update = True
+            elif action.kind == "topmost":
+                # Set window to be always on top
+                layout.set_window_pos(hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
+                                      win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+
+        if needs_update:
+            if not update_flags & (win32con.SWP_NOMOVE | win32con.SWP_NOSIZE):
+                # Ensure process and window are DPI aware before resizing
+                try:
+                    user32 = ctypes.windll.user32
+                    process_handle = win32api.OpenProcess(win32con.PROCESS_ALL_ACCESS, False, info.pid)
+                    user32.SetProcessDpiAwarenessContext(process_handle, -4)
+                    win32gui.SetWindowDisplayAffinity(hwnd, 0)
+                except:
+                    pass
+            layout.set_window_pos(hwnd, 0, x, y, width, height, update_flags)
+
+    def queue_layout(self):
+        """Return the layout transaction for this tick, committed once Tk is idle"""
+        if self.pending_layout is None:
+            self.pending_layout = LayoutTransaction(self.layout_backend)
+            self.root.after_idle(self.commit_layout)
+        return self.pending_layout
+
+    def commit_layout(self):
+        """Apply all queued window moves in a single deferred batch"""
+        layout, self.pending_layout = self.pending_layout, None
+        if layout is None:
+            return
+        try:
+            count = layout.commit()
+            if count and self.settings.options.debug_mode:
+                print(f"Applied layout for {count} window(s); hung window guard: {self.window_guard.report()}")
+        except Exception as e:
+            print(f"Error applying window layout: {e}")
 
     def save_custom_resolution(self, app_name, enabled, preset=None):
         """Save custom resolution setting for specific app"""
         if enabled and preset in self.RESOLUTION_PRESETS:
-            self.custom_resolution_apps[app_name] = self.RESOLUTION_PRESETS[preset]
+            self.custom_resolution_apps[app_name] = ResolutionRule.from_dims(self.RESOLUTION_PRESETS[preset])
         elif app_name in self.custom_resolution_apps:
             del self.custom_resolution_apps[app_name]
         
-        self.config["CUSTOM_RESOLUTION_APPS"] = self.custom_resolution_apps
-        self.save_config()
+        self.config["CUSTOM_RESOLUTION_APPS"] = toml_value(self.custom_resolution_apps)
+        self.save_config("CUSTOM_RESOLUTION_APPS")
 
     def save_window_placement(self, app_name, placement):
         """Save window placement setting for specific app"""
@@ -747,7 +951,7 @@ class AppState:
             del self.window_placements[app_name]
         
         self.config["WINDOW_PLACEMENTS"] = self.window_placements
-        self.save_config()
+        self.save_config("WINDOW_PLACEMENTS")
 
     def save_border_style(self, app_name, style):
         """Save border style setting for specific app"""
@@ -757,7 +961,7 @@ class AppState:
             del self.border_styles[app_name]
         
         self.config["BORDER_STYLES"] = self.border_styles
-        self.save_config()
+        self.save_config("BORDER_STYLES")
 
     def apply_window_style(self, hwnd, style_name):
         """Apply window border style"""
@@ -801,32 +1005,17 @@ class AppState:
 
     def get_window_position(self, placement, screen_width, screen_height, window_width, window_height):
         """Calculate window position based on placement setting"""
-        if placement == "no_change":
-            return None, None
-        elif placement == "center":
-            return (screen_width - window_width) // 2, (screen_height - window_height) // 2
-        elif placement == "top":
-            return (screen_width - window_width) // 2, 0
-        elif placement == "bottom":
-            return (screen_width - window_width) // 2, screen_height - window_height
-        elif placement == "left":
-            return 0, (screen_height - window_height) // 2
-        elif placement == "right":
-            return screen_width - window_width, (screen_height - window_height) // 2
-        elif placement == "top_left":
-            return 0, 0
-        elif placement == "top_right":
-            return screen_width - window_width, 0
-        elif placement == "bottom_left":
-            return 0, screen_height - window_height
-        elif placement == "bottom_right":
-            return screen_width - window_width, screen_height - window_height
-        return None, None
-
-    def save_options(self):
-        """Save options to config file"""
+        return place(placement, screen_width, screen_height, window_width, window_height)
+
+    def save_options(self, options=None):
+        """Validate and save options to config file; raises ConfigError for invalid values"""
+        if options is not None:
+            self.settings.options = load_options(options, strict=True)
+            self.options.update(options)
+        else:
+            self.settings.options = load_options(self.options)
         self.config["OPTIONS"] = self.options
-        self.save_config()
+        self.save_config("OPTIONS")
 
     def save_always_on_top_app(self, app_name, should_be_on_top):
         """Save always on top setting for specific app"""
@@ -838,7 +1027,7 @@ class AppState:
             self.remove_always_on_top(app_name)
         
         self.config["ALWAYS_ON_TOP_APPS"] = self.always_on_top_apps
-        self.save_config()
+        self.save_config("ALWAYS_ON_TOP_APPS")
 
     def remove_always_on_top(self, app_name):
         """Remove always on top flag from app windows"""
@@ -849,13 +1038,14 @@ class AppState:
                     process = psutil.Process(pid)
                     if os.path.basename(process.exe()) == app_name:
                         # Remove TOPMOST flag
-                        win32gui.SetWindowPos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
-                                            win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+                        self.queue_layout().set_window_pos(hwnd, win32con.HWND_NOTOPMOST, 0, 0, 0, 0,
+                                                           win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
                 except:
                     pass
                 return True
 
             win32gui.EnumWindows(enum_windows_callback, None)
+            self.commit_layout()
         except Exception as e:
             print(f"Error removing always on top: {e}")
 
@@ -866,9 +1056,11 @@ class AppState:
                 'maximized': maximized,
                 'geometry': geometry
             }
+            if volume_state == self.runtime.get("VOLUME_WINDOW_STATE"):
+                return
             self.volume_window_state = volume_state
             self.runtime["VOLUME_WINDOW_STATE"] = volume_state
-            self.save_runtime()
+            self.save_runtime("VOLUME_WINDOW_STATE")
         except Exception as e:
             if self.debug_mode:
                 print(f"Error saving volume window state: {e}")
@@ -881,12 +1073,12 @@ class AppState:
             self.resize_widget_apps.remove(app_name)
         
         self.config["RESIZE_WIDGET_APPS"] = self.resize_widget_apps
-        self.save_config()
+        self.save_config("RESIZE_WIDGET_APPS")
 
     def update_resize_widgets(self, hwnd, process_name):
         """Update or create resize widgets for a window"""
         try:
-            if self.options["debug_mode"]:
+            if self.settings.options.debug_mode:
                 print(f"\nUpdating resize widgets for {process_name}")
                 print(f"Window handle: {hwnd}")
             
@@ -896,7 +1088,7 @@ class AppState:
             width = right - x
             height = bottom - y
             
-            if self.options["debug_mode"]:
+            if self.settings.options.debug_mode:
                 print(f"Window dimensions: {width}x{height} at ({x},{y})")
 
             # Widget size
@@ -907,7 +1099,7 @@ class AppState:
             
             # Create new widgets if they don't exist for this window
             if widget_key not in self.resize_widgets:
-                if self.options["debug_mode"]:
+                if self.settings.options.debug_mode:
                     print(f"Creating new resize widgets for {widget_key}")
                 
                 self.resize_widgets[widget_key] = []
@@ -934,13 +1126,13 @@ class AppState:
                         
                         self.resize_widgets[widget_key].append(widget)
                         
-                        if self.options["debug_mode"]:
+                        if self.settings.options.debug_mode:
                             print(f"Created {corner} widget at ({wx},{wy})")
                     except Exception as e:
                         print(f"Error creating {corner} widget: {e}")
             else:
                 # Update existing widgets positions
-                if self.options["debug_mode"]:
+                if self.settings.options.debug_mode:
                     print(f"Updating existing widgets for {widget_key}")
                 
                 corners = [
@@ -954,10 +1146,10 @@ class AppState:
                     try:
                         if widget.winfo_exists():
                             widget.geometry(f"{widget_size}x{widget_size}+{wx}+{wy}")
-                            if self.options["debug_mode"]:
+                            if self.settings.options.debug_mode:
                                 print(f"Updated {corner} widget to ({wx},{wy})")
                         else:
-                            if self.options["debug_mode"]:
+                            if self.settings.options.debug_mode:
                                 print(f"Widget for {corner} no longer exists, recreating")
                             # Recreate widget if it was destroyed
                             new_widget = Toplevel()
@@ -992,10 +1184,7 @@ class AppState:
                             rect = win32gui.GetWindowRect(hwnd)
                             tup = win32gui.GetWindowPlacement(hwnd)
                             is_maximized = tup[1] == win32con.SW_MAXIMIZE
-                            positions.append({
-                                'rect': list(rect),
-                                'maximized': is_maximized
-                            })
+                            positions.append(WindowPosition(tuple(rect), is_maximized))
                 except Exception as e:
                     print(f"Error in enum_windows_callback: {e}")
                     import traceback
@@ -1007,8 +1196,8 @@ class AppState:
             print(f"Positions: {positions}")    
             if positions:
                 self.window_positions[app_name] = positions[0]
-                self.config["WINDOW_POSITIONS"] = self.window_positions
-                self.save_config()
+                self.config["WINDOW_POSITIONS"] = toml_value(self.window_positions)
+                self.save_config("WINDOW_POSITIONS")
                 return True
             return False
         except Exception as e:
@@ -1032,20 +1221,8 @@ class AppState:
                     if win32gui.IsWindowVisible(hwnd):
                         _, pid = win32process.GetWindowThreadProcessId(hwnd)
                         process = psutil.Process(pid)
-                        if os.path.basename(process.exe()) == app_name:
-                            # Find best matching saved position
-                            rect = saved_positions['rect']
-                            is_maximized = saved_positions['maximized']
-                            
-                            if is_maximized:
-                                win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
-                            else:
-                                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                                win32gui.SetWindowPos(hwnd, 0,
-                                    rect[0], rect[1],
-                                    rect[2] - rect[0],
-                                    rect[3] - rect[1],
-                                    win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
+                        if os.path.basename(process.exe()) == app_name and self.window_guard.allow(hwnd):
+                            self.restore_hwnd_position(hwnd, saved_positions)
                             nonlocal restored
                             restored = True
                 except Exception as e:
@@ -1056,11 +1233,26 @@ class AppState:
                 return True
             
             win32gui.EnumWindows(enum_windows_callback, None)
+            self.commit_layout()
             return restored
         except Exception as e:
             print(f"Error restoring window position: {e}")
             return False
 
+    def restore_hwnd_position(self, hwnd, saved_position):
+        """Queue a single window's move to a saved position"""
+        rect = saved_position.rect
+        
+        if saved_position.maximized:
+            win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
+        else:
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            self.queue_layout().set_window_pos(hwnd, 0,
+                rect[0], rect[1],
+                rect[2] - rect[0],
+                rect[3] - rect[1],
+                win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
+
     def save_auto_restore_position(self, app_name, should_auto_restore):
         """Save auto-restore setting for specific app"""
         if should_auto_restore and app_name not in self.auto_restore_positions:
@@ -1069,7 +1261,7 @@ class AppState:
             self.auto_restore_positions.remove(app_name)
         
         self.config["AUTO_RESTORE_POSITIONS"] = self.auto_restore_positions
-        self.save_config()
+        self.save_config("AUTO_RESTORE_POSITIONS")
 
     def save_force_mute_app(self, app_name, should_force_mute):
         """Save force mute setting for specific app"""
@@ -1079,7 +1271,7 @@ class AppState:
             self.force_muted_apps.remove(app_name)
         
         self.config["FORCE_MUTED_APPS"] = self.force_muted_apps
-        self.save_config()
+        self.save_config("FORCE_MUTED_APPS")
 
     def is_force_muted(self, app_name):
         """Check if app is force muted"""
@@ -1114,11 +1306,26 @@ class VolumeControlWindow:
         # Store app_state reference
         self.app_state = app_state
         
-        # Initialize resize widget manager
+        # One EnumWindows pass finds the windows of every resize widget app,
+        # and only after the window event hook saw something change
+        self.window_scanner = AppWindowScanner(debug_mode=app_state.settings.options.debug_mode)
+        self.window_scanner.process_names.update(app_state.process_names())  # Skip exe lookups already done
+        self.window_events = None
+        try:
+            self.window_events = Win32WindowEvents()
+        except Exception as e:
+            print(f"Window events unavailable, scanning windows every tick: {e}")
+        self.widget_ticks = 0
+        
+        # Initialize resize widget manager; its overlays follow window moves from the same hook.
+        # Imported here because it loads and hooks the keyboard module.
+        from resize_widget import ResizeWidgetManager
         self.resize_manager = ResizeWidgetManager(
-            debug_mode=app_state.options["debug_mode"],
-            widget_size=app_state.options["resize_widget_size"],
-            app_state=app_state
+            parent,
+            debug_mode=app_state.settings.options.debug_mode,
+            widget_size=app_state.settings.options.resize_widget_size,
+            app_state=app_state,
+            window_events=self.window_events
         )
         
         self.window = Toplevel(parent)
@@ -1135,31 +1342,38 @@ class VolumeControlWindow:
         if app_state.volume_window_state.get('maximized', False):
             self.window.state('zoomed')
         
-        # Save window state on changes
-        def save_window_state(event=None):
-            if event and event.widget != self.window:
+        # Save window state once it stops changing
+        def save_window_state():
+            if not self.window.winfo_exists():
                 return
-                
             if self.window.state() == 'zoomed':  # Window is maximized
                 app_state.save_volume_window_state(
                     getattr(self.window, 'last_normal_geometry', self.window.geometry()),
                     True
                 )
             else:
-                current_geometry = self.window.geometry()
                 app_state.save_volume_window_state(
-                    current_geometry,
+                    self.window.geometry(),
                     False
                 )
+        self.window_state_saver = DebouncedCall(self.window, 500, save_window_state)
+        
+        def on_configure(event):
+            if event.widget != self.window:
+                return
+            if self.window.state() != 'zoomed':
                 # Store current geometry for when window is unmaximized
-                self.window.last_normal_geometry = current_geometry
+                self.window.last_normal_geometry = self.window.geometry()
+            self.window_state_saver.trigger()
         
         # Bind window events
-        self.window.bind("<Configure>", save_window_state)
+        self.window.bind("<Configure>", on_configure)
         
         # Handle window close
         def on_close():
             app_state.volume_control = None
+            self.window_state_saver.flush()
+            self.dispose()
             self.window.destroy()
         
         self.window.protocol("WM_DELETE_WINDOW", on_close)
@@ -1173,7 +1387,7 @@ class VolumeControlWindow:
               fg=app_state.theme['fg']).pack(side='left')
         
         self.search_var = StringVar()
-        self.search_var.trace('w', self.filter_apps)
+        self.search_trace = self.search_var.trace('w', self.filter_apps)
         Entry(search_frame, textvariable=self.search_var,
               bg=app_state.theme['button'],
               fg=app_state.theme['fg']).pack(side='left', fill='x', expand=True)
@@ -1182,21 +1396,20 @@ class VolumeControlWindow:
         self.apps_frame = Frame(self.window, bg=app_state.theme['bg'])
         self.apps_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
+        # Only the visible rows get widgets, recycled from a pool as the list scrolls
+        self.app_list = VirtualAppList(self.apps_frame, self)
+        
+        # Remove mousewheel binding when window is destroyed
+        def on_destroy(event):
+            if event.widget == self.window:
+                self.app_list.unbind_mousewheel()
+        self.window.bind("<Destroy>", on_destroy)
+        
         # Initialize variables
-        self.volume_vars = {}
-        self.pid_match_vars = {}
-        self.mute_labels = {}
-        self.volume_labels = {}
-        self.hide_titlebar_vars = {}
-        self.maximize_vars = {}
-        self.resolution_vars = {}
-        self.preset_vars = {}
-        self.placement_vars = {}
-        self.border_vars = {}
-        self.mute_vars = {}
-        self.always_on_top_vars = {}
+        self.row_models = {}  # app name -> AppRowModel, in session order
         self.last_app_list = set()  # Initialize last_app_list
-        self.resize_widget_vars = {}
+        self.list_update_job = None
+        self.mute_status_job = None
         
         # Start periodic updates
         self.update_app_list_periodic()
@@ -1204,418 +1417,107 @@ class VolumeControlWindow:
         
     def filter_apps(self, *args):
         search_text = self.search_var.get().lower()
-        # Clear only inner frame widgets
-        if hasattr(self.apps_frame, 'inner'):
-            for widget in self.apps_frame.inner.winfo_children():
-                widget.destroy()
-        self.update_app_list(search_text)
+        self.app_list.set_models([model for app_name, model in self.row_models.items()
+                                  if not search_text or search_text in app_name.lower()])
+        
+    def sync_rows(self, app_names):
+        """Add models for new apps and drop vanished ones, leaving the rest untouched"""
+        current = set(app_names)
+        removed = [app_name for app_name in self.row_models if app_name not in current]
+        added = [app_name for app_name in app_names if app_name not in self.row_models]
+        if not added and not removed:
+            return
+        if self.app_state.settings.options.debug_mode:
+            print(f"App list changed: +{added} -{removed}")
+        
+        for app_name in removed:
+            self.app_list.release(self.row_models.pop(app_name))
+        # New apps go to the end so existing rows do not shift around
+        for app_name in added:
+            self.row_models[app_name] = AppRowModel(app_name).load(self.app_state)
+        self.filter_apps()
+        
+    def dispose(self):
+        """Release rows, Tk variables and pending callbacks before the window closes"""
+        for job in (self.list_update_job, self.mute_status_job):
+            if job is not None:
+                self.window.after_cancel(job)
+        self.list_update_job = None
+        self.mute_status_job = None
+        
+        if self.window_events is not None:
+            self.window_events.close()
+            self.window_events = None
+        self.resize_manager.cleanup()
+        
+        if self.search_trace is not None:
+            self.search_var.trace_vdelete('w', self.search_trace)
+            self.search_trace = None
+        
+        self.app_list.dispose()
+        self.row_models.clear()
+        self.last_app_list = set()
+        
+    def reload_rows(self):
+        """Re-read every row's settings after the config file changed on disk"""
+        for model in self.row_models.values():
+            model.load(self.app_state)
+        self.app_list.rebind()
+        
+    def manual_mute(self, app_name):
+        """Return the Force Mute checkbox state for an app shown in the list, or None"""
+        model = self.row_models.get(app_name)
+        if model is None:
+            return None
+        return bool(model.force_muted)
         
     def update_app_list_periodic(self):
         """Periodically check for new apps and update the list if needed"""
         try:
-            # Update resize widgets for enabled apps
-            for app_name in self.app_state.resize_widget_apps:
-                def enum_windows_callback(hwnd, _):
-                    try:
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        process = psutil.Process(pid)
-                        if os.path.basename(process.exe()) == app_name:
-                            self.resize_manager.create_or_update_widgets(app_name, hwnd)
-                    except:
-                        pass
-                    return True
-                win32gui.EnumWindows(enum_windows_callback, None)
+            # Update resize widgets for enabled apps when windows changed
+            self.widget_ticks += 1
+            if self.app_state.resize_widget_apps and (self.window_events is None
+                                                      or self.window_events.changed()
+                                                      or self.widget_ticks % WIDGET_RESCAN_TICKS == 0):
+                self.update_resize_widgets(self.app_state.resize_widget_apps)
             
             # Clean up widgets for closed windows
             self.resize_manager.cleanup_closed_windows()
             
-            # Get current apps
-            current_apps = set()
-            sessions = AudioUtilities.GetAllSessions()
+            # Get current apps, in session order without duplicates
+            current_apps = {}
+            sessions = audio_sessions()
             for session in sessions:
                 if session.Process:
                     try:
                         process = psutil.Process(session.ProcessId)
-                        current_apps.add(os.path.basename(process.exe()))
+                        current_apps[os.path.basename(process.exe())] = None
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         continue
             
-            # If app list changed, update the UI
-            if current_apps != self.last_app_list:
-                self.last_app_list = current_apps
-                search_text = self.search_var.get().lower()
-                
-                # Remember scroll position
-                scroll_pos = 0
-                if hasattr(self.apps_frame, 'vscrollbar'):
-                    scroll_pos = self.apps_frame.vscrollbar.get()[0]
-                
-                # Clear only the inner frame widgets
-                if hasattr(self.apps_frame, 'inner'):
-                    for widget in self.apps_frame.inner.winfo_children():
-                        widget.destroy()
-                
-                # Update the list
-                self.update_app_list(search_text)
-                
-                # Restore scroll position
-                if hasattr(self.apps_frame, 'vscrollbar'):
-                    self.apps_frame.vscrollbar.set(scroll_pos, scroll_pos + 0.1)
+            # If app list changed, update only the rows that came or went
+            if current_apps.keys() != self.last_app_list:
+                self.last_app_list = set(current_apps)
+                self.sync_rows(list(current_apps))
             
             # Schedule next check if window still exists
             if self.window.winfo_exists():
-                self.window.after(app_state.options["list_update_interval"], 
-                                self.update_app_list_periodic)
+                self.list_update_job = self.window.after(app_state.settings.options.list_update_interval, 
+                                                         self.update_app_list_periodic)
                 
         except Exception as e:
             print(f"Error updating app list: {e}")
             # Retry even if there was an error
             if self.window.winfo_exists():
-                self.window.after(app_state.options["list_update_interval"], 
-                                self.update_app_list_periodic)
-
-    def update_app_list(self, filter_text=""):
-        print("update app list")
-        # Add scrollbar if not exists
-        if not hasattr(self.apps_frame, 'vscrollbar'):
-            self.apps_frame.vscrollbar = Scrollbar(self.apps_frame)
-            self.apps_frame.vscrollbar.pack(side='right', fill='y')
-            
-            # Create canvas and inner frame for scrolling
-            self.apps_frame.canvas = Canvas(self.apps_frame, 
-                                          bg=app_state.theme['bg'],
-                                          yscrollcommand=self.apps_frame.vscrollbar.set,
-                                          highlightthickness=0)  # Remove canvas border
-            self.apps_frame.canvas.pack(side='left', fill='both', expand=True)
-            
-            self.apps_frame.inner = Frame(self.apps_frame.canvas, 
-                                        bg=app_state.theme['bg'])
-            
-            # Create window ID for inner frame
-            self.window_id = self.apps_frame.canvas.create_window(
-                (0, 0),
-                window=self.apps_frame.inner,
-                anchor='nw',
-                width=self.apps_frame.canvas.winfo_width()  # Make inner frame full width
-            )
-            
-            # Configure scrolling
-            self.apps_frame.vscrollbar.config(command=self.apps_frame.canvas.yview)
-            
-            # Update scroll region when inner frame changes
-            def on_configure(event):
-                self.apps_frame.canvas.configure(scrollregion=self.apps_frame.canvas.bbox('all'))
-            self.apps_frame.inner.bind('<Configure>', on_configure)
-            
-            # Update inner frame width when canvas resizes
-            def on_canvas_configure(event):
-                self.apps_frame.canvas.itemconfig(self.window_id, width=event.width)
-            self.apps_frame.canvas.bind('<Configure>', on_canvas_configure)
-            
-            # Add mouse wheel scrolling
-            def on_mousewheel(event):
-                self.apps_frame.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-            self.apps_frame.canvas.bind_all("<MouseWheel>", on_mousewheel)
-            
-            # Remove mousewheel binding when window is destroyed
-            def on_destroy(event):
-                self.apps_frame.canvas.unbind_all("<MouseWheel>")
-            self.window.bind("<Destroy>", on_destroy)
+                self.list_update_job = self.window.after(app_state.settings.options.list_update_interval, 
+                                                         self.update_app_list_periodic)
 
-        sessions = AudioUtilities.GetAllSessions()
-        
-        for session in sessions:
-            if not session.Process:
-                continue
-                
-            try:
-                process = psutil.Process(session.ProcessId)
-                app_name = os.path.basename(process.exe())
-                
-                if filter_text and filter_text not in app_name.lower():
-                    continue
-                
-                frame = Frame(self.apps_frame.inner, bg=app_state.theme['bg'])
-                frame.pack(fill='x', padx=5, pady=2)
-                
-                # App name label
-                Label(frame, text=app_name, 
-                      bg=app_state.theme['bg'],
-                      fg=app_state.theme['fg'],
-                      width=20, anchor='w').pack(side='left')
-                
-                # Status frame to hold mute and volume labels
-                status_frame = Frame(frame, bg=app_state.theme['bg'])
-                status_frame.pack(side='left', padx=5)
-                
-                # Add mute checkbox with stored variable
-                mute_var = IntVar(value=1 if app_name in self.app_state.force_muted_apps else 0)
-                self.mute_vars[app_name] = mute_var  # Store the mute variable
-                Checkbutton(status_frame, text="Force Mute",
-                           variable=mute_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_mute_change(a)).pack(side='left', padx=5)
-                
-                # Mute status label
-                mute_label = Label(status_frame, text="", width=8,
-                                 bg=app_state.theme['bg'],
-                                 fg=app_state.theme['fg'])
-                mute_label.pack(side='left')
-                self.mute_labels[app_name] = mute_label
-                
-                # Volume level label
-                volume_label = Label(status_frame, text="", width=6,
-                                   bg=app_state.theme['bg'],
-                                   fg=app_state.theme['fg'])
-                volume_label.pack(side='left')
-                self.volume_labels[app_name] = volume_label
-                
-                # Volume slider
-                volume_var = IntVar(value=app_state.get_app_volume(app_name))
-                self.volume_vars[app_name] = volume_var
-                
-                scale = Scale(frame, from_=0, to=100,
-                            orient='horizontal',
-                            variable=volume_var,
-                            bg=app_state.theme['bg'],
-                            fg=app_state.theme['fg'],
-                            troughcolor=app_state.theme['button'],
-                            activebackground=app_state.theme['active'],
-                            command=lambda v, a=app_name: self.on_volume_change(a, v))
-                scale.pack(side='left', fill='x', expand=True)
-                
-                # PID match checkbox
-                pid_match_var = IntVar(value=1 if app_name in app_state.pid_match_apps else 0)
-                self.pid_match_vars[app_name] = pid_match_var
-                
-                Checkbutton(frame, text="Match PID",
-                           variable=pid_match_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_pid_match_change(a)).pack(side='left', padx=5)
-
-                # Hide titlebar checkbox
-                hide_titlebar_var = IntVar(value=1 if app_name in app_state.hide_titlebar_apps else 0)
-                self.hide_titlebar_vars[app_name] = hide_titlebar_var
-                
-                Checkbutton(frame, text="Hide Title",
-                           variable=hide_titlebar_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_hide_titlebar_change(a)).pack(side='left', padx=5)
-
-                # Maximize checkbox
-                maximize_var = IntVar(value=1 if app_name in app_state.maximize_apps else 0)
-                self.maximize_vars[app_name] = maximize_var
-                
-                Checkbutton(frame, text="Maximize",
-                           variable=maximize_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_maximize_change(a)).pack(side='left', padx=5)
-                
-                # Custom resolution frame
-                resolution_frame = Frame(frame, bg=app_state.theme['bg'])
-                resolution_frame.pack(side='left', padx=5)
-                
-                # Resolution checkbox and dropdown
-                has_custom = app_name in app_state.custom_resolution_apps
-                resolution_var = IntVar(value=1 if has_custom else 0)
-                self.resolution_vars[app_name] = resolution_var
-                
-                # Get current preset based on saved dimensions
-                current_dims = app_state.custom_resolution_apps.get(app_name, {})
-                current_preset = "1080p"  # default
-                for preset, dims in app_state.RESOLUTION_PRESETS.items():
-                    if dims == current_dims:
-                        current_preset = preset
-                
-                preset_var = StringVar(value=current_preset)
-                self.preset_vars[app_name] = preset_var
-                
-                Checkbutton(resolution_frame, text="Resolution:",
-                           variable=resolution_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_resolution_change(a)).pack(side='left')
-                
-                # Resolution preset dropdown
-                resolution_menu = OptionMenu(resolution_frame, preset_var, 
-                                          "8k",
-                                          "3:4 720p", "3:4 1080p", "3:4 1440p", "3:4 Fit Screen",
-                                          "a:b 1080p", "a:b 1440p",
-                                          "9:8 720p", "9:8 1080p", "9:8 1440p", "9:8 Fit Screen",
-                                          "16:9 720p", "16:9 1080p", "16:9 1440p", "16:9 4K", "16:9 Fit Screen",
-                                          "19.5:9 720p", "19.5:9 1080p", "19.5:9 1440p", "19.5:9 Fit Screen",
-                                          "21:9 720p", "21:9 1080p", "21:9 1440p", "21:9 Fit Screen",
-                                          "24:9 720p", "24:9 1080p", "24:9 1440p", "24:9 Fit Screen",
-                                          "32:9 720p", "32:9 1080p", "32:9 Fit Screen",
-                                          command=lambda *args, a=app_name: self.on_resolution_change(a))
-                resolution_menu.config(bg=app_state.theme['button'],
-                                    fg=app_state.theme['fg'],
-                                    activebackground=app_state.theme['active'])
-                resolution_menu["menu"].config(bg=app_state.theme['button'],
-                                            fg=app_state.theme['fg'])
-                resolution_menu.pack(side='left', padx=2)
-                
-                # Window placement dropdown
-                placement_frame = Frame(frame, bg=app_state.theme['bg'])
-                placement_frame.pack(side='left', padx=5)
-                
-                Label(placement_frame, text="Position:",
-                      bg=app_state.theme['bg'],
-                      fg=app_state.theme['fg']).pack(side='left')
-                
-                current_placement = app_state.window_placements.get(app_name, "center")
-                placement_var = StringVar(value=[k for k, v in app_state.WINDOW_PLACEMENTS.items() 
-                                               if v == current_placement][0])
-                self.placement_vars[app_name] = placement_var
-                
-                placement_menu = OptionMenu(placement_frame, placement_var, 
-                                          *app_state.WINDOW_PLACEMENTS.keys(),
-                                          command=lambda *args, a=app_name: self.on_placement_change(a))
-                placement_menu.config(bg=app_state.theme['button'],
-                                   fg=app_state.theme['fg'],
-                                   activebackground=app_state.theme['active'])
-                placement_menu["menu"].config(bg=app_state.theme['button'],
-                                           fg=app_state.theme['fg'])
-                placement_menu.pack(side='left', padx=2)
-                
-                # Border style dropdown
-                border_frame = Frame(frame, bg=app_state.theme['bg'])
-                border_frame.pack(side='left', padx=5)
-                
-                Label(border_frame, text="Border:",
-                      bg=app_state.theme['bg'],
-                      fg=app_state.theme['fg']).pack(side='left')
-                
-                current_style = app_state.border_styles.get(app_name, "no_change")
-                border_var = StringVar(value=[k for k, v in app_state.BORDER_STYLES.items() 
-                                            if v == current_style][0])
-                self.border_vars[app_name] = border_var
-                
-                border_menu = OptionMenu(border_frame, border_var, 
-                                       *app_state.BORDER_STYLES.keys(),
-                                       command=lambda *args, a=app_name: self.on_border_change(a))
-                border_menu.config(bg=app_state.theme['button'],
-                                 fg=app_state.theme['fg'],
-                                 activebackground=app_state.theme['active'])
-                border_menu["menu"].config(bg=app_state.theme['button'],
-                                         fg=app_state.theme['fg'])
-                border_menu.pack(side='left', padx=2)
-                
-                # Add startup delay setting
-                delay_frame = Frame(frame, bg=app_state.theme['bg'])
-                delay_frame.pack(side='left', padx=5)
-                
-                Label(delay_frame, text="Startup Delay (s):",
-                      bg=app_state.theme['bg'],
-                      fg=app_state.theme['fg']).pack(side='left')
-                
-                delay_var = StringVar(value=str(app_state.startup_delays.get(app_name, 0)))
-                delay_entry = Entry(delay_frame, textvariable=delay_var,
-                                  bg=app_state.theme['button'],
-                                  fg=app_state.theme['fg'],
-                                  width=5)
-                delay_entry.pack(side='left', padx=2)
-                
-                def save_delay(event, app=app_name, var=delay_var):
-                    try:
-                        print(f"Saving delay for {app}: {var.get()}")
-                        delay = float(var.get())
-                        if delay >= 0:
-                            app_state.startup_delays[app] = delay
-                            app_state.config["STARTUP_DELAYS"] = app_state.startup_delays
-                            app_state.save_config()
-                        else:
-                            var.set("0")
-                    except ValueError:
-                        var.set(str(app_state.startup_delays.get(app, 0)))
-                        # Open messagebox to user
-                        messagebox.showerror("Error", "Invalid delay value. Please enter a positive number.")
-                
-                delay_entry.bind('<Return>', save_delay)
-                delay_entry.bind('<FocusOut>', save_delay)
-                
-                # Add Always on Top checkbox after the Hide Title checkbox
-                always_on_top_var = IntVar(value=1 if app_name in app_state.always_on_top_apps else 0)
-                self.always_on_top_vars[app_name] = always_on_top_var
-                
-                Checkbutton(frame, text="Always on Top",
-                           variable=always_on_top_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_always_on_top_change(a)).pack(side='left', padx=5)
-
-                # Add resize widget checkbox
-                resize_widget_var = IntVar(value=1 if app_name in app_state.resize_widget_apps else 0)
-                self.resize_widget_vars[app_name] = resize_widget_var
-                
-                Checkbutton(frame, text="Resize Widgets",
-                           variable=resize_widget_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_resize_widget_change(a)).pack(side='left', padx=5)
-
-                # Add window position buttons frame
-                position_frame = Frame(frame, bg=app_state.theme['bg'])
-                position_frame.pack(side='left', padx=5)
-                
-                def make_save_position_handler(target_app):
-                    def handler():
-                        if self.app_state.save_window_position(target_app):
-                            messagebox.showinfo("Success", f"Window position saved for {target_app}")
-                        else:
-                            messagebox.showwarning("Warning", f"No visible windows found for {target_app}")
-                    return handler
-                
-                def make_restore_position_handler(target_app):
-                    def handler():
-                        if self.app_state.restore_window_position(target_app):
-                            messagebox.showinfo("Success", f"Window position restored for {target_app}")
-                        else:
-                            messagebox.showwarning("Warning", f"No saved position found for {target_app}")
-                    return handler
-                
-                Button(position_frame, text="Save Position",
-                       command=make_save_position_handler(app_name),
-                       bg=app_state.theme['button'],
-                       fg=app_state.theme['fg'],
-                       activebackground=app_state.theme['active']).pack(side='left', padx=2)
-                
-                Button(position_frame, text="Restore Position",
-                       command=make_restore_position_handler(app_name),
-                       bg=app_state.theme['button'],
-                       fg=app_state.theme['fg'],
-                       activebackground=app_state.theme['active']).pack(side='left', padx=2)
-
-                # Add auto-restore checkbox
-                auto_restore_var = IntVar(value=1 if app_name in app_state.auto_restore_positions else 0)
-                Checkbutton(position_frame, text="Auto-Restore",
-                           variable=auto_restore_var,
-                           bg=app_state.theme['bg'],
-                           fg=app_state.theme['fg'],
-                           selectcolor=app_state.theme['button'],
-                           activebackground=app_state.theme['bg'],
-                           command=lambda a=app_name: self.on_auto_restore_change(a, auto_restore_var)).pack(side='left', padx=5)
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+    def update_resize_widgets(self, app_names):
+        """Create or move resize widgets for every window of the given apps"""
+        for app_name, hwnds in self.window_scanner.scan(app_names).items():
+            for hwnd in hwnds:
+                self.resize_manager.create_or_update_widgets(app_name, hwnd)
+        self.resize_manager.refresh_states("Window position updated")
 
     def on_volume_change(self, app_name, value):
         """Handle volume slider changes"""
@@ -1624,7 +1526,7 @@ class VolumeControlWindow:
             app_state.save_app_volume(app_name, int(float(value)))
             
             # Immediately apply volume change
-            sessions = AudioUtilities.GetAllSessions()
+            sessions = audio_sessions()
             for session in sessions:
                 if session.Process:
                     try:
@@ -1641,39 +1543,59 @@ class VolumeControlWindow:
         except Exception as e:
             print(f"Error changing volume: {e}")
 
-    def on_pid_match_change(self, app_name):
-        should_match_pid = bool(self.pid_match_vars[app_name].get())
+    def on_pid_match_change(self, app_name, should_match_pid):
         app_state.save_pid_match_app(app_name, should_match_pid)
 
-    def on_hide_titlebar_change(self, app_name):
-        should_hide = bool(self.hide_titlebar_vars[app_name].get())
+    def on_hide_titlebar_change(self, app_name, should_hide):
         app_state.save_hide_titlebar_app(app_name, should_hide)
 
-    def on_maximize_change(self, app_name):
-        should_maximize = bool(self.maximize_vars[app_name].get())
+    def on_maximize_change(self, app_name, should_maximize):
         app_state.save_maximize_app(app_name, should_maximize)
 
-    def on_resolution_change(self, app_name):
-        enabled = bool(self.resolution_vars[app_name].get())
-        preset = self.preset_vars[app_name].get() if enabled else None
+    def on_resolution_change(self, app_name, enabled, preset):
         app_state.save_custom_resolution(app_name, enabled, preset)
 
-    def on_placement_change(self, app_name):
-        placement_name = self.placement_vars[app_name].get()
+    def on_placement_change(self, app_name, placement_name):
         placement = app_state.WINDOW_PLACEMENTS[placement_name]
         app_state.save_window_placement(app_name, placement)
 
-    def on_border_change(self, app_name):
-        style_name = self.border_vars[app_name].get()
+    def on_border_change(self, app_name, style_name):
         style = app_state.BORDER_STYLES[style_name]
         app_state.save_border_style(app_name, style)
 
-    def on_mute_change(self, app_name):
+    def on_startup_delay_change(self, app_name, value):
+        """Save a startup delay typed into a row and return the text the entry should show"""
+        try:
+            print(f"Saving delay for {app_name}: {value}")
+            delay = float(value)
+            if delay >= 0:
+                app_state.startup_delays[app_name] = delay
+                app_state.config["STARTUP_DELAYS"] = app_state.startup_delays
+                app_state.save_config("STARTUP_DELAYS")
+                return value
+            return "0"
+        except ValueError:
+            # Open messagebox to user
+            messagebox.showerror("Error", "Invalid delay value. Please enter a positive number.")
+            return str(app_state.startup_delays.get(app_name, 0))
+
+    def on_save_position(self, app_name):
+        if self.app_state.save_window_position(app_name):
+            messagebox.showinfo("Success", f"Window position saved for {app_name}")
+        else:
+            messagebox.showwarning("Warning", f"No visible windows found for {app_name}")
+
+    def on_restore_position(self, app_name):
+        if self.app_state.restore_window_position(app_name):
+            messagebox.showinfo("Success", f"Window position restored for {app_name}")
+        else:
+            messagebox.showwarning("Warning", f"No saved position found for {app_name}")
+
+    def on_mute_change(self, app_name, should_mute):
         """Handle mute checkbox changes"""
-        should_mute = self.mute_vars[app_name].get()
         self.app_state.save_force_mute_app(app_name, should_mute)
         
-        sessions = AudioUtilities.GetAllSessions()
+        sessions = audio_sessions()
         for session in sessions:
             if session.Process:
                 try:
@@ -1691,15 +1613,13 @@ class VolumeControlWindow:
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
 
-    def on_always_on_top_change(self, app_name):
+    def on_always_on_top_change(self, app_name, should_be_on_top):
         """Handle always on top checkbox changes"""
-        should_be_on_top = bool(self.always_on_top_vars[app_name].get())
         app_state.save_always_on_top_app(app_name, should_be_on_top)
 
-    def on_resize_widget_change(self, app_name):
+    def on_resize_widget_change(self, app_name, should_show_widgets):
         """Handle resize widget checkbox changes"""
-        should_show_widgets = bool(self.resize_widget_vars[app_name].get())
-        if self.app_state.options["debug_mode"]:
+        if self.app_state.settings.options.debug_mode:
             print(f"\nResize widgets {'enabled' if should_show_widgets else 'disabled'} for {app_name}")
         
         self.app_state.save_resize_widget_app(app_name, should_show_widgets)
@@ -1709,70 +1629,51 @@ class VolumeControlWindow:
             self.resize_manager.remove_widgets(app_name)
         else:
             # Find all windows for this app and create widgets
-            def enum_windows_callback(hwnd, _):
-                try:
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    process = psutil.Process(pid)
-                    if os.path.basename(process.exe()) == app_name and win32gui.IsWindowVisible(hwnd):
-                        self.resize_manager.create_or_update_widgets(app_name, hwnd)
-                except Exception as e:
-                    if self.app_state.options["debug_mode"]:
-                        print(f"Error in enum_windows_callback: {e}")
-                return True
-            
-            win32gui.EnumWindows(enum_windows_callback, None)
+            self.update_resize_widgets([app_name])
 
     def update_mute_status(self):
         """Update mute status and volume for all apps"""
-        sessions = AudioUtilities.GetAllSessions()
+        try:
+            sessions = audio_sessions()
         
-        for session in sessions:
-            if not session.Process:
-                continue
+            for session in sessions:
+                if not session.Process:
+                    continue
                 
-            try:
-                process = psutil.Process(session.ProcessId)
-                app_name = os.path.basename(process.exe())
+                try:
+                    process = psutil.Process(session.ProcessId)
+                    app_name = os.path.basename(process.exe())
                 
-                if app_name in self.mute_labels:
-                    volume = session.SimpleAudioVolume
-                    if volume:
-                        is_muted = volume.GetMute()
-                        current_volume = int(volume.GetMasterVolume() * 100)
+                    model = self.row_models.get(app_name)
+                    if model is not None:
+                        volume = session.SimpleAudioVolume
+                        if volume:
+                            is_muted = volume.GetMute()
+                            current_volume = int(volume.GetMasterVolume() * 100)
                         
-                        # Update volume slider to match actual volume if different
-                        if app_name in self.volume_vars:
+                            # Enforce the saved volume if the app changed it
                             target_volume = app_state.get_app_volume(app_name)
                             if abs(current_volume - target_volume) > 1:  # 1% threshold
                                 volume.SetMasterVolume(float(target_volume) / 100, None)
                                 current_volume = target_volume
-                            self.volume_vars[app_name].set(current_volume)
-                        
-                        # Update mute checkbox to match force mute state
-                        if app_name in self.mute_vars:
-                            force_muted = self.app_state.is_force_muted(app_name)
-                            if self.mute_vars[app_name].get() != force_muted:
-                                self.mute_vars[app_name].set(1 if force_muted else 0)
-                        
-                        # Update mute status
-                        self.mute_labels[app_name].config(
-                            text="Muted" if is_muted else "Unmuted",
-                            fg="#ff6b6b" if is_muted else "#69db7c"
-                        )
                         
-                        # Update volume label
-                        self.volume_labels[app_name].config(
-                            text=f"{current_volume}%",
-                            fg=app_state.theme['fg']
-                        )
+                            # Only the model is updated here, rows read it when visible
+                            model.volume = target_volume
+                            model.force_muted = 1 if self.app_state.is_force_muted(app_name) else 0
+                            model.is_muted = is_muted
+                            model.current_volume = current_volume
                     
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
         
-        # Schedule next update
+            self.app_list.update_status()
+        except Exception as e:
+            print(f"Error updating mute status: {e}")
+        
+        # Schedule next update, also after an error so the status keeps refreshing
         if not self.window.winfo_exists():
             return
-        self.window.after(100, self.update_mute_status)
+        self.mute_status_job = self.window.after(100, self.update_mute_status)
 
     def start_resize(self, event, hwnd, widget, corner):
         """Start window resize operation"""
@@ -1806,9 +1707,8 @@ class VolumeControlWindow:
         except Exception as e:
             print(f"Error resizing window: {e}")
 
-    def on_auto_restore_change(self, app_name, var):
+    def on_auto_restore_change(self, app_name, should_auto_restore):
         """Handle auto-restore checkbox changes"""
-        should_auto_restore = bool(var.get())
         self.app_state.save_auto_restore_position(app_name, should_auto_restore)
 
 # Function to check if a specific process ID is the foreground window
@@ -1831,10 +1731,9 @@ def is_foreground_process(pid):
         bg_process_exe_name = os.path.basename(bg_process.exe())
 
         if fg_process_exe_name != bg_process_exe_name:
-            # Check if both processes are in the mute group
-            if fg_process_exe_name in app_state.MUTE_GROUPS and bg_process_exe_name in app_state.MUTE_GROUPS:
-                    return True
-            return False
+            # Check if both processes are in the same mute group
+            group = app_state.mute_group_of.get(fg_process_exe_name)
+            return group is not None and group == app_state.mute_group_of.get(bg_process_exe_name)
             
         # Check if app should match PID
         if bg_process_exe_name in app_state.pid_match_apps:
@@ -1855,7 +1754,7 @@ def update_lists():
     lb_non_exceptions.delete(0, END)
 
     # Get the list of all the current sessions
-    sessions = AudioUtilities.GetAllSessions()
+    sessions = audio_sessions()
     for session in sessions:
         if session.Process:
             try:
@@ -1884,11 +1783,28 @@ def mute_unmute_apps():
     global app_state
 
     if app_state.lock_var.get():
+        if "first_mute_tick" not in STARTUP.marks:
+            after_first_mute_tick()
         app_state.root.after(100, mute_unmute_apps)
         return
 
+    from pycaw.pycaw import IAudioMeterInformation
+
     # Get the list of all the current sessions
-    sessions = AudioUtilities.GetAllSessions()
+    sessions = audio_sessions()
+
+    # Exe names are looked up once per session process, and kept only while it has a session
+    known_names = app_state.exe_names
+    exe_names = {}
+
+    def session_name(pid):
+        name = exe_names.get(pid)
+        if name is None:
+            name = known_names.get(pid)
+            if name is None:
+                name = os.path.basename(psutil.Process(pid).exe())
+            exe_names[pid] = name
+        return name
 
     # First pass - check for audio activity
     non_zero_other = False
@@ -1896,8 +1812,7 @@ def mute_unmute_apps():
     for session in sessions:
         if session.Process:
             try:
-                process = psutil.Process(session.ProcessId)
-                process_name = os.path.basename(process.exe())
+                process_name = session_name(session.ProcessId)
                 if process_name in app_state.exceptions_list:
                     volume = session.SimpleAudioVolume
                     if volume is not None:
@@ -1918,10 +1833,9 @@ def mute_unmute_apps():
         if not session.Process:
             continue
             
+        pid = session.ProcessId
         try:
-            process = psutil.Process(session.ProcessId)
-            process_name = os.path.basename(process.exe())
-            process_exe = process.exe().split("/", -1).split("\\", -1)
+            process_name = session_name(pid)
         except:
             continue
 
@@ -1932,15 +1846,15 @@ def mute_unmute_apps():
         # Check if app has manual mute override
         manual_mute = None
         if hasattr(app_state, 'volume_control') and app_state.volume_control is not None:
-            if process_exe in app_state.volume_control.mute_vars:
-                manual_mute = bool(app_state.volume_control.mute_vars[process_name].get())
+            manual_mute = app_state.volume_control.manual_mute(process_name)
 
         # If manual mute is set, respect it
         if manual_mute is not None:
             if volume.GetMute() != manual_mute:
                 volume.SetMute(manual_mute, None)
                 reason = "Manual Mute Override"
-                print(f"{'Muted' if manual_mute else 'Unmuted'}({process.pid}): {process_name} - Reason: {reason}")
+                print(f"{'Muted' if manual_mute else 'Unmuted'}({pid}): {process_name} - Reason: {reason}")
+            app_state.applied_audio[pid] = (bool(manual_mute), None)
             continue
 
         # Rest of existing muting logic
@@ -1968,29 +1882,51 @@ def mute_unmute_apps():
             elif app_state.mute_foreground_when_background.get() == 1 and app_state.zero_cnt <= 30:
                 should_be_muted = True
                 mute_reason = "Background Audio Playing"
-            elif is_foreground_process(process.pid):
-                app_state.last_foreground_app_pid = process.pid
+            elif is_foreground_process(pid):
+                app_state.last_foreground_app_pid = pid
                 # Unmute the audio if it's in the foreground
                 should_be_muted = False
                 mute_reason = "Foreground App"
             else:
                 should_be_muted = True
-                mute_reason = f"Not Foreground App {process.pid} {is_foreground_process(process.pid)}"
-                if  app_state.mute_last_app.get() and process.pid == app_state.last_foreground_app_pid:
+                mute_reason = f"Not Foreground App {pid} {is_foreground_process(pid)}"
+                if  app_state.mute_last_app.get() and pid == app_state.last_foreground_app_pid:
                     if not non_zero_other:
                         should_be_muted = False
                         mute_reason = "Last Active App"
 
         if volume.GetMute() == 0 and should_be_muted:
             volume.SetMute(1, None)
-            print(f"Muted({process.pid}): {process_name} - Reason: {mute_reason}")
+            print(f"Muted({pid}): {process_name} - Reason: {mute_reason}")
         elif volume.GetMute() == 1 and not should_be_muted:
             volume.SetMute(0, None)
-            print(f"Unmuted({process.pid}): {process_name} - Reason: {mute_reason}")
+            print(f"Unmuted({pid}): {process_name} - Reason: {mute_reason}")
+        app_state.applied_audio[pid] = (should_be_muted, round(volume_value * 100))
+
+    # Forget processes whose sessions are gone, so a reused pid is looked up again
+    app_state.exe_names = exe_names
+    for pid in [pid for pid in app_state.applied_audio if pid not in exe_names]:
+        del app_state.applied_audio[pid]
 
     app_state.to_unmute.clear()
+    if "first_mute_tick" not in STARTUP.marks:
+        after_first_mute_tick()
     app_state.root.after(100, mute_unmute_apps)
 
+def after_first_mute_tick():
+    """Report the startup profile and run startup work that can wait until muting is enforced"""
+    STARTUP.mark("first_mute_tick")
+    mode = profile_mode()
+    if mode or app_state.settings.options.debug_mode:
+        print(STARTUP.report())
+    if mode:
+        STARTUP.emit()
+    if mode == "exit":
+        app_state.root.after_idle(app_state.on_root_close)
+        return
+    if app_state.app_icons is None:
+        app_state.root.after_idle(app_state.build_app_icon)
+
 # Add this debug function at the top level
 def debug_mute_decision(process_name, process_id, should_be_muted, reason):
     if process_name == "chrome.exe":
@@ -2053,7 +1989,7 @@ class OptionsWindow:
               bg=app_state.theme['bg'],
               fg=app_state.theme['fg']).pack(side='left')
         
-        window_var = StringVar(value=str(app_state.options["window_check_interval"]))
+        window_var = StringVar(value=str(app_state.settings.options.window_check_interval))
         window_entry = Entry(window_frame, textvariable=window_var,
                            bg=app_state.theme['button'],
                            fg=app_state.theme['fg'],
@@ -2068,7 +2004,7 @@ class OptionsWindow:
               bg=app_state.theme['bg'],
               fg=app_state.theme['fg']).pack(side='left')
         
-        volume_var = StringVar(value=str(app_state.options["volume_check_interval"]))
+        volume_var = StringVar(value=str(app_state.settings.options.volume_check_interval))
         volume_entry = Entry(volume_frame, textvariable=volume_var,
                            bg=app_state.theme['button'],
                            fg=app_state.theme['fg'],
@@ -2083,7 +2019,7 @@ class OptionsWindow:
               bg=app_state.theme['bg'],
               fg=app_state.theme['fg']).pack(side='left')
         
-        list_var = StringVar(value=str(app_state.options["list_update_interval"]))
+        list_var = StringVar(value=str(app_state.settings.options.list_update_interval))
         list_entry = Entry(list_frame, textvariable=list_var,
                           bg=app_state.theme['button'],
                           fg=app_state.theme['fg'],
@@ -2094,7 +2030,7 @@ class OptionsWindow:
         debug_frame = Frame(main_frame, bg=app_state.theme['bg'])
         debug_frame.pack(fill='x', padx=5, pady=5)
         
-        debug_var = IntVar(value=int(app_state.options["debug_mode"]))
+        debug_var = IntVar(value=int(app_state.settings.options.debug_mode))
         Checkbutton(debug_frame, text="Debug Mode",
                    variable=debug_var,
                    bg=app_state.theme['bg'],
@@ -2116,20 +2052,23 @@ class OptionsWindow:
         
         def save_options():
             try:
-                app_state.options["window_check_interval"] = int(window_var.get())
-                app_state.options["volume_check_interval"] = int(volume_var.get())
-                app_state.options["list_update_interval"] = int(list_var.get())
-                app_state.options["debug_mode"] = bool(debug_var.get())
-                app_state.options["resize_widget_size"] = max(5, min(50, int(size_var.get())))  # Limit between 5-50 pixels
-                print(f"Resize widget size: {app_state.options['resize_widget_size']}")
-                app_state.save_options()
+                options = dict(app_state.options)
+                options["window_check_interval"] = int(window_var.get())
+                options["volume_check_interval"] = int(volume_var.get())
+                options["list_update_interval"] = int(list_var.get())
+                options["debug_mode"] = bool(debug_var.get())
+                options["resize_widget_size"] = max(5, min(50, int(size_var.get())))  # Limit between 5-50 pixels
+                print(f"Resize widget size: {options['resize_widget_size']}")
+                app_state.save_options(options)
                 
                 # Update existing resize widgets if any
                 if hasattr(app_state.volume_control, 'resize_manager'):
-                    app_state.volume_control.resize_manager.widget_size = app_state.options["resize_widget_size"]
+                    app_state.volume_control.resize_manager.widget_size = app_state.settings.options.resize_widget_size
                     app_state.volume_control.resize_manager.update_all_widgets()
                 
                 self.window.destroy()
+            except ConfigError as e:
+                messagebox.showerror("Error", "\n".join(e.errors))
             except ValueError:
                 messagebox.showerror("Error", "Please enter valid numbers for all fields")
         
@@ -2159,7 +2098,7 @@ class OptionsWindow:
               bg=app_state.theme['bg'],
               fg=app_state.theme['fg']).pack(side='left')
         
-        size_var = StringVar(value=str(app_state.options["resize_widget_size"]))
+        size_var = StringVar(value=str(app_state.settings.options.resize_widget_size))
         size_entry = Entry(size_frame, textvariable=size_var,
                           bg=app_state.theme['button'],
                           fg=app_state.theme['fg'],
@@ -2176,15 +2115,30 @@ def show_volume_control():
 
 if __name__ == "__main__":
 
-    if not pyuac.isUserAdmin():
+    # A running instance takes this launch's command, without an elevation prompt.
+    # Profiling runs skip the channel so the benchmark always measures a fresh start.
+    command = command_from_args(sys.argv[1:])
+    instance = None if profile_mode() else InstanceChannel()
+    if instance is not None and instance.send(command):
+        sys.exit(0)
+
+    # Startup profiling runs unelevated so the benchmark can read its output
+    if not pyuac.isUserAdmin() and not profile_mode():
         pyuac.runAsAdmin(wait=False)
         sys.exit(0)
+
+    # Only one instance runs the mute loops and writes the config files
+    if instance is not None and not instance.listen():
+        if not instance.send(command):
+            print("App Muter is already running")
+        sys.exit(0)
     import ctypes
     user32 = ctypes.windll.user32
     user32.SetProcessDPIAware()
     
     # Create global state instance
     app_state = AppState()
+    STARTUP.mark("config")
     app_state.setup_main_window()
 
     # Create main frame for lists
@@ -2326,9 +2280,9 @@ if __name__ == "__main__":
                         activebackground=app_state.theme['active'])
     btn_options.pack(side='right', pady=5)
 
-    # Schedule the first update of the lists
+    # Schedule the first update of the lists; muting starts as soon as the window is up
     app_state.root.after(100, update_lists)
-    app_state.root.after(100, mute_unmute_apps)
+    app_state.root.after_idle(mute_unmute_apps)
 
     # Update variable traces
     app_state.mute_last_app.trace_add("write", lambda *args: app_state.update_params())
@@ -2338,6 +2292,12 @@ if __name__ == "__main__":
 
     # Restore window position and size
     app_state.restore_window_state()
+    STARTUP.mark("window")
+
+    if instance is not None:
+        app_state.start_instance_commands(instance)
+    if command != "show":
+        app_state.handle_command(command)
 
     # Start the GUI loop
     app_state.root.mainloop()
\ No newline at end of file
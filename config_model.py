@@ -0,0 +1,296 @@
+import sys
+from dataclasses import dataclass, field, fields
+
+from window_geometry import compile_size_spec
+
+PLACEMENTS = ("no_change", "center", "top", "bottom", "left", "right",
+              "top_left", "top_right", "bottom_left", "bottom_right")
+BORDER_STYLES = ("no_change", "normal", "thin", "none", "dialog", "tool")
+DEFAULT_EXCEPTIONS = ("chrome.exe", "firefox.exe", "msedge.exe")
+
+_INVALID = object()
+
+
+class ConfigError(ValueError):
+    """Raised for invalid config values; errors lists every problem found"""
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class _Checker:
+    """Converts raw TOML values, collecting an error for each one that is invalid"""
+
+    def __init__(self):
+        self.errors = []
+
+    def fail(self, path, message, value):
+        self.errors.append(f"{path}: {message} (got {value!r})")
+        return _INVALID
+
+    def integer(self, path, value, minimum=None, maximum=None):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            return self.fail(path, "expected a whole number", value)
+        value = int(value)
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            return self.fail(path, f"expected a number between {minimum} and {maximum}", value)
+        return value
+
+    def number(self, path, value, minimum=None, maximum=None):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return self.fail(path, "expected a number", value)
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            return self.fail(path, f"expected a number between {minimum} and {maximum}", value)
+        return value
+
+    def boolean(self, path, value):
+        if isinstance(value, bool):
+            return value
+        if value in (0, 1):
+            return bool(value)
+        return self.fail(path, "expected true or false", value)
+
+    def choice(self, path, value, choices):
+        if value not in choices:
+            return self.fail(path, f"expected one of {', '.join(choices)}", value)
+        return value
+
+    def app_list(self, path, value):
+        if not isinstance(value, list):
+            self.fail(path, "expected a list of exe names", value)
+            return []
+        apps = []
+        for index, item in enumerate(value):
+            if isinstance(item, str) and item:
+                apps.append(item)
+            else:
+                self.fail(f"{path}[{index}]", "expected an exe name", item)
+        return apps
+
+    def app_table(self, path, value, convert):
+        if not isinstance(value, dict):
+            self.fail(path, "expected a table keyed by exe name", value)
+            return {}
+        table = {}
+        for app_name, item in value.items():
+            converted = convert(f"{path}.{app_name}", item)
+            if converted is not _INVALID:
+                table[app_name] = converted
+        return table
+
+    def mute_groups(self, path, value):
+        if not isinstance(value, list):
+            self.fail(path, "expected a list of exe name lists", value)
+            return []
+        return [self.app_list(f"{path}[{index}]", group) for index, group in enumerate(value)]
+
+
+@dataclass(slots=True)
+class Options:
+    window_check_interval: int = 1000  # milliseconds
+    volume_check_interval: int = 100  # milliseconds
+    list_update_interval: int = 100  # milliseconds
+    debug_mode: bool = False
+    resize_widget_size: int = 10  # pixels
+    config_reload_interval: int = 1000  # milliseconds
+    extra: dict = field(default_factory=dict)  # Options this version doesn't know, saved back as they are
+
+    @classmethod
+    def parse(cls, data, checker):
+        options = cls()
+        if not isinstance(data, dict):
+            checker.fail("OPTIONS", "expected a table", data)
+            return options
+        limits = {
+            "window_check_interval": (10, 60000),
+            "volume_check_interval": (10, 60000),
+            "list_update_interval": (10, 60000),
+            "resize_widget_size": (5, 50),
+            "config_reload_interval": (100, 60000),
+        }
+        for name, value in data.items():
+            if name == "debug_mode":
+                value = checker.boolean("OPTIONS.debug_mode", value)
+            elif name in limits:
+                value = checker.integer(f"OPTIONS.{name}", value, *limits[name])
+            else:
+                options.extra[name] = value
+                continue
+            if value is not _INVALID:
+                setattr(options, name, value)
+        return options
+
+    def as_dict(self):
+        options = dict(self.extra)
+        options.update((f.name, getattr(self, f.name)) for f in fields(self) if f.name != "extra")
+        return options
+
+
+@dataclass(slots=True)
+class ResolutionRule:
+    width: object  # Pixels, or a "fit_W_H" preset
+    height: object
+    spec: tuple  # ("fixed", width, height) or ("fit", ratio)
+
+    @classmethod
+    def parse(cls, path, data, checker):
+        if not isinstance(data, dict) or "width" not in data or "height" not in data:
+            return checker.fail(path, "expected width and height", data)
+        width, height = data["width"], data["height"]
+        if isinstance(width, str) or isinstance(height, str):
+            if width != height:
+                return checker.fail(path, "fit presets need the same value for width and height", data)
+        else:
+            for name, value in (("width", width), ("height", height)):
+                if checker.integer(f"{path}.{name}", value, 1, 16384) is _INVALID:
+                    return _INVALID
+        try:
+            spec = compile_size_spec(data)
+        except (TypeError, ValueError, ZeroDivisionError):
+            return checker.fail(path, "expected pixels or a fit_W_H preset", data)
+        return cls(width, height, spec)
+
+    @classmethod
+    def from_dims(cls, dims):
+        """Build a rule from a trusted {"width": ..., "height": ...} preset"""
+        return cls(dims["width"], dims["height"], compile_size_spec(dims))
+
+    def as_dict(self):
+        return {"width": self.width, "height": self.height}
+
+
+@dataclass(slots=True)
+class WindowPosition:
+    rect: tuple  # (left, top, right, bottom)
+    maximized: bool
+
+    @classmethod
+    def parse(cls, path, data, checker):
+        if not isinstance(data, dict):
+            return checker.fail(path, "expected rect and maximized", data)
+        rect = data.get("rect")
+        if (not isinstance(rect, list) or len(rect) != 4
+                or any(isinstance(v, bool) or not isinstance(v, int) for v in rect)):
+            return checker.fail(f"{path}.rect", "expected [left, top, right, bottom]", rect)
+        maximized = checker.boolean(f"{path}.maximized", data.get("maximized", False))
+        if maximized is _INVALID:
+            return _INVALID
+        return cls(tuple(rect), maximized)
+
+    def as_dict(self):
+        return {"rect": list(self.rect), "maximized": self.maximized}
+
+
+@dataclass(slots=True)
+class AppConfig:
+    """Validated contents of config.toml; field names are the lower-cased section names"""
+
+    options: Options
+    default_exceptions: list
+    mute_groups: list
+    app_volumes: dict
+    pid_match_apps: list
+    hide_titlebar_apps: list
+    maximize_apps: list
+    always_on_top_apps: list
+    resize_widget_apps: list
+    custom_resolution_apps: dict  # exe name -> ResolutionRule
+    window_placements: dict
+    border_styles: dict
+    startup_delays: dict
+    window_positions: dict  # exe name -> WindowPosition
+    auto_restore_positions: list
+    force_muted_apps: list
+
+    def table(self, section):
+        """Return a fresh, mutable copy of a section for AppState to own; records stay typed"""
+        value = getattr(self, section.lower())
+        return dict(value) if isinstance(value, dict) else list(value)
+
+
+def toml_value(table):
+    """Turn a table that may hold records back into the plain values config.toml stores"""
+    if isinstance(table, dict):
+        return {key: item.as_dict() if hasattr(item, "as_dict") else item for key, item in table.items()}
+    return list(table)
+
+
+def parse_config(data, checker):
+    get = data.get
+    volume = lambda path, value: checker.number(path, value, 0, 100)
+    delay = lambda path, value: checker.number(path, value, 0, 3600)
+    placement = lambda path, value: checker.choice(path, value, PLACEMENTS)
+    border = lambda path, value: checker.choice(path, value, BORDER_STYLES)
+    resolution = lambda path, value: ResolutionRule.parse(path, value, checker)
+    position = lambda path, value: WindowPosition.parse(path, value, checker)
+
+    return AppConfig(
+        options=Options.parse(get("OPTIONS", {}), checker),
+        default_exceptions=checker.app_list("DEFAULT_EXCEPTIONS", get("DEFAULT_EXCEPTIONS", list(DEFAULT_EXCEPTIONS))),
+        mute_groups=checker.mute_groups("MUTE_GROUPS", get("MUTE_GROUPS", [])),
+        app_volumes=checker.app_table("APP_VOLUMES", get("APP_VOLUMES", {}), volume),
+        pid_match_apps=checker.app_list("PID_MATCH_APPS", get("PID_MATCH_APPS", [])),
+        hide_titlebar_apps=checker.app_list("HIDE_TITLEBAR_APPS", get("HIDE_TITLEBAR_APPS", [])),
+        maximize_apps=checker.app_list("MAXIMIZE_APPS", get("MAXIMIZE_APPS", [])),
+        always_on_top_apps=checker.app_list("ALWAYS_ON_TOP_APPS", get("ALWAYS_ON_TOP_APPS", [])),
+        resize_widget_apps=checker.app_list("RESIZE_WIDGET_APPS", get("RESIZE_WIDGET_APPS", [])),
+        custom_resolution_apps=checker.app_table("CUSTOM_RESOLUTION_APPS", get("CUSTOM_RESOLUTION_APPS", {}), resolution),
+        window_placements=checker.app_table("WINDOW_PLACEMENTS", get("WINDOW_PLACEMENTS", {}), placement),
+        border_styles=checker.app_table("BORDER_STYLES", get("BORDER_STYLES", {}), border),
+        startup_delays=checker.app_table("STARTUP_DELAYS", get("STARTUP_DELAYS", {}), delay),
+        window_positions=checker.app_table("WINDOW_POSITIONS", get("WINDOW_POSITIONS", {}), position),
+        auto_restore_positions=checker.app_list("AUTO_RESTORE_POSITIONS", get("AUTO_RESTORE_POSITIONS", [])),
+        force_muted_apps=checker.app_list("FORCE_MUTED_APPS", get("FORCE_MUTED_APPS", [])),
+    )
+
+
+def _finish(checker, result, strict, source):
+    if checker.errors:
+        if strict:
+            raise ConfigError(checker.errors)
+        for error in checker.errors:
+            print(f"Ignoring invalid value in {source}: {error}")
+    return result
+
+
+def load_config(data, strict=False, source="config.toml"):
+    """Validate a parsed config.toml; invalid values are dropped (or raise ConfigError if strict)"""
+    checker = _Checker()
+    return _finish(checker, parse_config(data, checker), strict, source)
+
+
+def load_options(data, strict=False, source="OPTIONS"):
+    """Validate just the [OPTIONS] table"""
+    checker = _Checker()
+    return _finish(checker, Options.parse(data, checker), strict, source)
+
+
+def load_mute_groups(data, strict=False, source="mute_groups.toml"):
+    """Validate a MUTE_GROUPS list of exe name lists"""
+    checker = _Checker()
+    return _finish(checker, checker.mute_groups("MUTE_GROUPS", data), strict, source)
+
+
+def main(argv):
+    """Validate config files from the command line"""
+    import toml
+
+    status = 0
+    for path in argv:
+        try:
+            load_config(toml.load(path), strict=True)
+            print(f"{path}: OK")
+        except (OSError, toml.TomlDecodeError) as e:
+            status = 1
+            print(f"{path}: {e}")
+        except ConfigError as e:
+            status = 1
+            print(f"{path}: {len(e.errors)} invalid value(s)")
+            for error in e.errors:
+                print(f"  {error}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
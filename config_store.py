@@ -0,0 +1,218 @@
+import copy
+import os
+import threading
+import time
+
+import toml
+
+from config_watcher import file_stamp
+from state_journal import StateJournal
+
+_DELETED = object()
+
+
+class ConfigStore:
+    """Write-behind persistence for one TOML file
+
+    mark_dirty() copies the changed sections on the caller's thread and
+    returns at once. A background thread waits until nothing changed for
+    `debounce` seconds (or `max_delay` after the first unsaved change) and
+    appends just those sections to a journal next to the file. The TOML file
+    itself is rewritten (through a temp file and os.replace()) only when the
+    journal is compacted: once it grows past compact_size, after
+    compact_interval seconds, and on close. Records left in the journal by a
+    hard kill are replayed on the next start.
+    """
+
+    def __init__(self, path, data, debounce=0.2, max_delay=1.0, compact_interval=30.0,
+                 compact_size=64 * 1024, debug_mode=False):
+        self.path = path
+        self.data = data  # Live dict owned by the caller
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.compact_interval = compact_interval
+        self.compact_size = compact_size
+        self.debug_mode = debug_mode
+
+        # Recover changes that were journaled but never compacted into the file
+        self.journal = StateJournal(f"{path}.journal")
+        recovered = self.journal.replay(data)
+        if recovered:
+            print(f"Recovered {recovered} unsaved change(s) for {os.path.basename(path)}")
+
+        self.document = copy.deepcopy(data)  # Writer's own copy, only touched under write_lock
+        self.sections = set(data)  # Every section ever saved, so removed ones get dropped too
+        self.pending = {}  # section -> snapshot (or _DELETED)
+        self.first_dirty = None
+        self.last_dirty = None
+        self.last_compact = time.monotonic()
+        self.written_stamp = None  # File stamp of our own last compaction
+        self.closed = False
+        self.appends = 0
+        self.compactions = 0
+        self.coalesced = 0
+
+        self.lock = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, daemon=True,
+                                       name=f"ConfigStore({os.path.basename(path)})")
+        self.thread.start()
+
+    def mark_dirty(self, *sections):
+        """Queue sections of the live data for saving; with no arguments, queue everything"""
+        if not sections:
+            sections = set(self.data) | self.sections
+        self.sections.update(sections)
+        snapshots = {section: copy.deepcopy(self.data[section]) if section in self.data else _DELETED
+                     for section in sections}
+
+        with self.lock:
+            if self.pending:
+                self.coalesced += 1
+            self.pending.update(snapshots)
+            now = time.monotonic()
+            if self.first_dirty is None:
+                self.first_dirty = now
+            self.last_dirty = now
+            self.lock.notify()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.closed:
+                    if not self.journal.records:
+                        self.lock.wait()
+                        continue
+                    # Compact once the journal has been sitting for compact_interval
+                    remaining = self.last_compact + self.compact_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.lock.wait(remaining)
+                if self.closed and not self.pending:
+                    return
+
+                # Debounce: keep waiting while changes are still coming in
+                while self.pending and not self.closed:
+                    due = min(self.last_dirty + self.debounce, self.first_dirty + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.lock.wait(remaining)
+
+            self.flush()
+
+    def flush(self, compact=False):
+        """Journal pending changes now, on the calling thread, compacting when due"""
+        with self.write_lock:
+            with self.lock:
+                pending = self.pending
+                self.pending = {}
+                self.first_dirty = None
+
+            try:
+                if pending:
+                    for section, value in pending.items():
+                        if value is _DELETED:
+                            self.document.pop(section, None)
+                        else:
+                            self.document[section] = value
+                    try:
+                        self.journal.append(pending, deleted=_DELETED)
+                    except Exception:
+                        self._requeue(pending)
+                        raise
+                    self.appends += 1
+
+                if self.journal.records and (compact
+                                             or self.journal.size >= self.compact_size
+                                             or time.monotonic() - self.last_compact >= self.compact_interval):
+                    self._compact()
+                elif pending and self.debug_mode:
+                    print(f"Journaled {os.path.basename(self.path)} ({', '.join(pending)}); "
+                          f"{self.journal.records} records, {self.coalesced} changes coalesced")
+                return bool(pending)
+            except Exception as e:
+                print(f"Error saving {os.path.basename(self.path)}: {e}")
+                return False
+
+    def _requeue(self, pending):
+        """Put changes that could not be journaled back in front of newer ones, retried after max_delay"""
+        with self.lock:
+            pending.update(self.pending)
+            self.pending = pending
+            now = time.monotonic()
+            self.first_dirty = now
+            self.last_dirty = max(self.last_dirty or now, now + self.max_delay)
+
+    def _compact(self):
+        """Rewrite the TOML file from the document and empty the journal"""
+        records = self.journal.records
+        self.last_compact = time.monotonic()  # Also when writing fails, so retries are paced
+        self._write_atomic(toml.dumps(self.document))
+        self.written_stamp = file_stamp(self.path)
+        self.journal.reset()
+        self.compactions += 1
+        if self.debug_mode:
+            print(f"Compacted {records} journal records into {os.path.basename(self.path)}")
+
+    def is_own_write(self):
+        """Check if the file on disk is the one our last compaction wrote"""
+        return self.written_stamp is not None and file_stamp(self.path) == self.written_stamp
+
+    def matches(self, data):
+        """Check if data equals our current saved state"""
+        with self.write_lock:
+            return data == self.document
+
+    def reload(self, data):
+        """Adopt data just read from disk as the saved state
+
+        Changes that were journaled or queued but not compacted yet are
+        replayed over data in place and compacted into the file, so the
+        external edit only wins for sections we had not changed since.
+        Returns the sections that kept our version.
+        """
+        with self.write_lock:
+            with self.lock:
+                pending = self.pending
+                self.pending = {}
+                self.first_dirty = None
+            edited = copy.deepcopy(data)
+            self.journal.replay(data)
+            for section, value in pending.items():
+                if value is _DELETED:
+                    data.pop(section, None)
+                else:
+                    data[section] = copy.deepcopy(value)
+            kept = sorted(section for section in set(edited) | set(data)
+                          if edited.get(section, _DELETED) != data.get(section, _DELETED))
+
+            self.document = copy.deepcopy(data)
+            self.sections = set(data)
+            if not kept:
+                self.journal.reset()
+                return kept
+            print(f"Kept unsaved changes to {os.path.basename(self.path)} over the external edit: "
+                  f"{', '.join(kept)}")
+            try:
+                self._compact()
+            except Exception as e:
+                # The journal still holds the changes, so they are replayed on the next start
+                print(f"Error saving {os.path.basename(self.path)}: {e}")
+            return kept
+
+    def _write_atomic(self, text):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        """Stop the writer thread and compact everything into the TOML file"""
+        with self.lock:
+            self.closed = True
+            self.lock.notify()
+        self.thread.join(timeout=5)
+        self.flush(compact=True)
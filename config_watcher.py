@@ -0,0 +1,102 @@
+import os
+
+
+def file_stamp(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Win32ChangeNotifier:
+    """Non-blocking directory change notification from FindFirstChangeNotification"""
+
+    def __init__(self, directory):
+        import win32con
+        import win32event
+        import win32file
+        self.win32event = win32event
+        self.win32file = win32file
+        self.handle = win32file.FindFirstChangeNotification(
+            directory, False,
+            win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_FILE_NAME)
+
+    def changed(self):
+        """Check (without waiting) whether anything in the directory changed"""
+        if self.win32event.WaitForSingleObject(self.handle, 0) != self.win32event.WAIT_OBJECT_0:
+            return False
+        self.win32file.FindNextChangeNotification(self.handle)
+        return True
+
+    def close(self):
+        if self.handle is not None:
+            self.win32file.FindCloseChangeNotification(self.handle)
+            self.handle = None
+
+
+class ConfigWatcher:
+    """Polls config files by mtime and size and reports the ones that changed
+
+    With a notifier, files are only stat'ed when it reports a change, plus a
+    slow safety poll every safety_ticks ticks in case a notification is missed.
+    Polling runs on the Tk loop, so on_change runs between ticks of the other
+    loops and they always see either the old or the new policy.
+    """
+
+    def __init__(self, root, files, on_change, interval_ms=1000, notifier=None, safety_ticks=30,
+                 debug_mode=False):
+        self.root = root
+        self.files = dict(files)  # name -> path
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.notifier = notifier
+        self.safety_ticks = safety_ticks
+        self.debug_mode = debug_mode
+        self.stamps = {name: file_stamp(path) for name, path in self.files.items()}
+        self.ticks = 0
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self.poll)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.notifier is not None:
+            self.notifier.close()
+
+    def check(self):
+        """Return the names of files whose stamp changed since the last check"""
+        changed = []
+        for name, path in self.files.items():
+            stamp = file_stamp(path)
+            if stamp != self.stamps[name]:
+                self.stamps[name] = stamp
+                changed.append(name)
+        return changed
+
+    def poll(self):
+        self._after_id = None
+        self.ticks += 1
+
+        should_check = True
+        if self.notifier is not None:
+            should_check = self.notifier.changed() or self.ticks % self.safety_ticks == 0
+
+        if should_check:
+            changed = self.check()
+            if changed:
+                if self.debug_mode:
+                    print(f"Config files changed: {', '.join(changed)}")
+                try:
+                    self.on_change(changed)
+                except Exception as e:
+                    print(f"Error reloading config: {e}")
+
+        self._after_id = self.root.after(self.interval_ms, self.poll)
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+
+ICON_SIZES = (16, 32, 48, 256)  # Window icon sizes; the .ico holds the same set
+CACHE_VERSION = 1  # Bump when the cached formats change
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def draw_app_icon(path, size=256):
+    """Draw the default app icon and save it as a PNG (needs PIL)"""
+    from PIL import Image, ImageDraw
+
+    # Create base image with transparency
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    # Define colors
+    bg_color = '#2b2b2b'
+    fg_color = '#4b6eaf'
+
+    # Draw main circle
+    padding = size * 0.1
+    circle_bbox = [padding, padding, size-padding, size-padding]
+    draw.ellipse(circle_bbox, fill=bg_color)
+
+    # Draw speaker symbol
+    speaker_size = size * 0.4
+    speaker_x = size * 0.3
+    speaker_y = size * 0.3
+
+    # Speaker box
+    box_points = [
+        (speaker_x, speaker_y),
+        (speaker_x + speaker_size*0.4, speaker_y),
+        (speaker_x + speaker_size*0.8, speaker_y - speaker_size*0.2),
+        (speaker_x + speaker_size*0.8, speaker_y + speaker_size*1.2),
+        (speaker_x + speaker_size*0.4, speaker_y + speaker_size),
+        (speaker_x, speaker_y + speaker_size),
+    ]
+    draw.polygon(box_points, fill=fg_color)
+
+    # Sound waves
+    wave_x = speaker_x + speaker_size*0.9
+    wave_y = speaker_y + speaker_size*0.5
+    wave_radius = speaker_size * 0.2
+
+    for i in range(3):
+        draw.arc([wave_x + i*wave_radius, wave_y - wave_radius,
+                  wave_x + wave_radius + i*wave_radius, wave_y + wave_radius],
+                 -60, 60, fill=fg_color, width=int(size*0.02))
+
+    # Draw mute line
+    line_width = int(size*0.04)
+    draw.line([(size*0.2, size*0.8), (size*0.8, size*0.2)],
+              fill='#ff6b6b', width=line_width)
+
+    # Save as PNG
+    image.save(path, format='PNG')
+
+
+class IconCache:
+    """App icon resources precomputed into the formats Tk loads natively
+
+    build() renders one PNG per size in ICON_SIZES plus a multi-size .ico
+    from the source PNG (drawing the source first if it is missing), and
+    writes a manifest with the source's hash last. While that hash still
+    matches, load() only needs Tk's own PNG support, so PIL is imported
+    only when the cache is cold.
+    """
+
+    def __init__(self, source_path, cache_dir, debug_mode=False):
+        self.source_path = source_path
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.ico_path = os.path.join(cache_dir, "app_icon.ico")
+        self.debug_mode = debug_mode
+
+    def png_path(self, size):
+        return os.path.join(self.cache_dir, f"app_icon_{size}.png")
+
+    def expected_manifest(self):
+        return {"version": CACHE_VERSION, "sizes": list(ICON_SIZES),
+                "source": file_hash(self.source_path)}
+
+    def is_fresh(self):
+        """Check that every cached file exists and was built from the current source"""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest != self.expected_manifest():
+                return False
+        except (OSError, ValueError):
+            return False
+        paths = [self.png_path(size) for size in ICON_SIZES] + [self.ico_path]
+        return all(os.path.exists(path) for path in paths)
+
+    def build(self):
+        """Render the cached icons from the source PNG (needs PIL)"""
+        from PIL import Image
+
+        if not os.path.exists(self.source_path):
+            draw_app_icon(self.source_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        with Image.open(self.source_path) as source:
+            source = source.convert('RGBA')
+            for size in ICON_SIZES:
+                self._write_atomic(self.png_path(size),
+                                   lambda f, size=size: source.resize((size, size), Image.LANCZOS).save(f, format='PNG'))
+            self._write_atomic(self.ico_path,
+                               lambda f: source.save(f, format='ICO', sizes=[(size, size) for size in ICON_SIZES]))
+
+        # Written last, so an interrupted build is simply rebuilt next time
+        manifest = self.expected_manifest()
+        self._write_atomic(self.manifest_path, lambda f: f.write(json.dumps(manifest).encode()))
+        if self.debug_mode:
+            print(f"Built icon cache in {self.cache_dir} from {os.path.basename(self.source_path)}")
+
+    def load(self, master):
+        """Return one PhotoImage per cached size, largest first; the caller must keep them referenced"""
+        from tkinter import PhotoImage
+        return [PhotoImage(master=master, file=self.png_path(size)) for size in sorted(ICON_SIZES, reverse=True)]
+
+    def _write_atomic(self, path, write):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
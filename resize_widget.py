@@ -1,205 +1,251 @@
 import win32gui
 import win32con
-from tkinter import Toplevel, Label, Scale, DoubleVar
-from pycaw.pycaw import AudioUtilities
+from tkinter import Toplevel, Label, Canvas, TclError
 import os
-import win32process
-import psutil
-import keyboard  # Add keyboard import
+import queue
 import time
+from window_events import FRAME_MS, WindowTracker
 
-class MuteWidget:
-    def __init__(self, hwnd, position, size, process_name, debug_mode=False, app_state=None):
-        self.hwnd = hwnd
-        self.size = size
-        self.process_name = process_name
-        self.debug_mode = debug_mode
-        self.last_reason = "Unknown"
-        self.app_state = app_state
-        
-        self.window = Toplevel()
-        self.window.overrideredirect(True)
-        self.window.attributes('-topmost', True)
-        self.window.geometry(f"{size}x{size}+{position[0]}+{position[1]}")
-        
-        # Create tooltip window
-        self.tooltip = Toplevel()
-        self.tooltip.withdraw()  # Hide initially
-        self.tooltip.overrideredirect(True)
-        self.tooltip.attributes('-topmost', True)
-        self.tooltip.configure(bg='#2b2b2b')
-        self.tooltip_label = Label(self.tooltip, bg='#2b2b2b', fg='white', 
-                                 font=('Arial', 8), padx=5, pady=3)
-        self.tooltip_label.pack()
-        
-        # Bind mouse events for tooltip
-        self.window.bind('<Enter>', self.show_tooltip)
-        self.window.bind('<Leave>', self.hide_tooltip)
-        self.window.bind('<Motion>', self.update_tooltip_position)
-        
-        # Set initial mute state and color
-        self.update_mute_state("Initial state")
-        
-        # Bind click event
-        self.window.bind('<Button-1>', self.toggle_mute)
+ALT_POLL_MS = 30  # How often the Tk thread applies Alt key changes
+# Overlay pixels of this color are see-through and let clicks reach the window below
+TRANSPARENT_COLOR = '#010203'
 
-    def show_tooltip(self, event):
-        """Show the tooltip"""
-        if self.tooltip.state() == 'withdrawn':
-            self.update_tooltip_position(event)
-            self.tooltip.deiconify()
+class SharedTooltip:
+    """One tooltip window for every overlay, created the first time it is shown"""
 
-    def hide_tooltip(self, event):
-        """Hide the tooltip"""
-        self.tooltip.withdraw()
+    def __init__(self):
+        self.window = None
+        self.label = None
+        self.owner = None  # Control the tooltip is showing for
 
-    def update_tooltip_position(self, event):
-        """Update tooltip position near the widget"""
-        x = self.window.winfo_rootx() + self.size + 5
-        y = self.window.winfo_rooty()
-        self.tooltip.geometry(f"+{x}+{y}")
-
-    def exists(self):
-        """Check if widget window still exists"""
-        return self.window.winfo_exists()
-
-    def update_position(self, x, y):
-        """Update widget position"""
-        self.window.geometry(f"{self.size}x{self.size}+{x}+{y}")
+    def show(self, owner, x, y):
+        """Show owner's tooltip text at screen position (x, y), or hide if it has none"""
+        text = owner.tooltip_text()
+        if not text:
+            self.hide()
+            return
+        if self.window is None or not self.window.winfo_exists():
+            self.window = Toplevel()
+            self.window.withdraw()
+            self.window.overrideredirect(True)
+            self.window.attributes('-topmost', True)
+            self.window.configure(bg='#2b2b2b')
+            self.label = Label(self.window, bg='#2b2b2b', fg='white',
+                               font=('Arial', 8), padx=5, pady=3)
+            self.label.pack()
+        self.owner = owner
+        self.label.config(text=text)
+        self.window.geometry(f"+{x}+{y}")
+        self.window.deiconify()
+
+    def refresh(self, owner):
+        """Update the text if the tooltip is showing for owner"""
+        if owner is self.owner:
+            self.label.config(text=owner.tooltip_text())
+
+    def hide(self, widget_set=None):
+        """Hide the tooltip; with a widget_set, only if it belongs to that overlay"""
+        if self.owner is None or (widget_set is not None and self.owner.widget_set is not widget_set):
+            return
+        self.owner = None
+        if self.window.winfo_exists():
+            self.window.withdraw()
 
     def destroy(self):
-        """Destroy the widget window"""
-        if self.exists():
-            self.tooltip.destroy()
+        self.owner = None
+        if self.window is not None and self.window.winfo_exists():
             self.window.destroy()
+        self.window = None
+
+class FramePacedDrag:
+    """Applies the latest drag target at most once per frame, off the motion events
+
+    Motion handlers only submit() a target; apply(target) runs from a Tk
+    callback, right away if a frame has passed since the last apply and
+    otherwise at the start of the next frame. Intermediate targets are
+    dropped. Latency is measured from the oldest unapplied input to the end
+    of apply().
+    """
+
+    def __init__(self, widget, apply, frame_ms=FRAME_MS, debug_mode=False):
+        self.widget = widget
+        self.apply = apply
+        self.frame = frame_ms / 1000
+        self.debug_mode = debug_mode
+        self.job = None
+        self.target = None
+        self.input_time = None  # perf_counter() of the oldest input not applied yet
+        self.last_apply = 0
+        self.inputs = 0
+        self.latencies = []
+
+    def submit(self, target):
+        now = time.perf_counter()
+        self.target = target
+        self.inputs += 1
+        if self.input_time is None:
+            self.input_time = now
+        if self.job is None:
+            wait = self.last_apply + self.frame - now
+            if wait > 0:
+                self.job = self.widget.after(max(1, round(wait * 1000)), self.run)
+            else:
+                self.job = self.widget.after_idle(self.run)
 
-    def update_mute_state(self, reason="Unknown"):
-        """Update widget color based on mute state"""
+    def run(self):
+        self.job = None
+        target, self.target = self.target, None
+        if target is None:
+            return
+        input_time, self.input_time = self.input_time, None
         try:
-            # Get exe name from window handle
-            _, pid = win32process.GetWindowThreadProcessId(self.hwnd)
-            process = psutil.Process(pid)
-            exe_name = os.path.basename(process.exe())
-
-            is_muted = False
-            is_force_muted = self.app_state and self.app_state.is_force_muted(exe_name)
-            
-            sessions = AudioUtilities.GetAllSessions()
-            for session in sessions:
-                if session.Process and os.path.basename(session.Process.exe()) == exe_name:
-                    volume = session.SimpleAudioVolume
-                    if volume:
-                        is_muted = volume.GetMute()
-                        if is_force_muted:
-                            self.last_reason = "Force Muted"
-                        else:
-                            self.last_reason = reason
-                        break
+            self.apply(target)
+        except Exception as e:
+            if self.debug_mode:
+                print(f"Error applying drag: {e}")
+        self.last_apply = time.perf_counter()
+        self.latencies.append(self.last_apply - input_time)
+
+    def finish(self, label="Drag"):
+        """Apply any pending target now and reset for the next drag"""
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        self.run()
+        if self.debug_mode and self.latencies:
+            latencies = sorted(self.latencies)
+            print(f"{label}: {len(latencies)} frames for {self.inputs} motion events, "
+                  f"input-to-window latency median {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                  f"max {latencies[-1] * 1000:.1f} ms")
+        self.inputs = 0
+        self.latencies = []
+
+class OverlayControl:
+    """A rectangular region of a WidgetSet overlay that handles its own clicks"""
+
+    color = 'gray'
+    span = 1  # Width in widget sizes
+
+    def __init__(self, widget_set):
+        self.widget_set = widget_set
+        self.manager = widget_set.manager
+        self.hwnd = widget_set.hwnd
+        self.size = widget_set.size
+        self.debug_mode = widget_set.manager.debug_mode
+        self.canvas = widget_set.canvas
+        self.bounds = (0, 0, 0, 0)  # Overlay coordinates: left, top, right, bottom
+        self.item = self.canvas.create_rectangle(*self.bounds, fill=self.color, width=0)
+
+    def place(self, x, y):
+        """Move the region to overlay coordinates (x, y)"""
+        self.bounds = (x, y, x + self.size * self.span, y + self.size)
+        self.canvas.coords(self.item, *self.bounds)
+
+    def contains(self, x, y):
+        left, top, right, bottom = self.bounds
+        return left <= x < right and top <= y < bottom
+
+    def set_color(self, color):
+        self.canvas.itemconfigure(self.item, fill=color)
+
+    def tooltip_text(self):
+        return None
+
+    def press(self, event):
+        pass
+
+    def drag(self, event):
+        pass
+
+    def release(self, event):
+        pass
+
+class MuteWidget(OverlayControl):
+    def __init__(self, widget_set, process_name, app_state=None):
+        super().__init__(widget_set)
+        self.process_name = process_name
+        self.last_reason = "Unknown"
+        self.app_state = app_state
+        self.state = None  # (is_muted, is_force_muted), None until read or if reading failed
+        # The manager sets the mute state and color with its next batched refresh
+
+    def tooltip_text(self):
+        if self.state is None:
+            return "Mute state unavailable"
+        is_muted, is_force_muted = self.state
+        status = f"{'Muted' if is_muted else 'Unmuted'}\nReason: {self.last_reason}"
+        if is_force_muted:
+            status += "\n(Force Mute enabled)"
+        return status
+
+    def press(self, event):
+        self.toggle_mute(event)
+
+    def set_state(self, state):
+        self.state = state
+        self.manager.tooltip.refresh(self)
+
+    def update_mute_state(self, reason="Unknown", mute_states=None):
+        """Update widget color from an {exe name: is_muted} map, scanning sessions if none is given"""
+        try:
+            exe_name = self.process_name
+            if mute_states is None:
+                mute_states = self.manager.read_mute_states({exe_name})
+
+            is_muted = mute_states.get(exe_name, False)
+            is_force_muted = bool(self.app_state and self.app_state.is_force_muted(exe_name))
+            if exe_name in mute_states:
+                if is_force_muted:
+                    self.last_reason = "Force Muted"
+                else:
+                    self.last_reason = reason
             
-            self.window.configure(bg='#ff6b6b' if is_muted else '#69db7c')
-            status = f"{'Muted' if is_muted else 'Unmuted'}\nReason: {self.last_reason}"
-            if is_force_muted:
-                status += "\n(Force Mute enabled)"
-            self.tooltip_label.config(text=status)
+            self.set_color('#ff6b6b' if is_muted else '#69db7c')
+            self.set_state((is_muted, is_force_muted))
             
             if self.debug_mode:
-                print(f"Updated mute widget state for {exe_name}: {status}")
+                print(f"Updated mute widget state for {exe_name}: {self.tooltip_text()}")
         except Exception as e:
             if self.debug_mode:
                 print(f"Error updating mute state: {e}")
-            self.window.configure(bg='gray')
-            self.tooltip_label.config(text="Error getting mute state")
+            self.set_color('gray')
+            self.set_state(None)
 
     def toggle_mute(self, event=None):
         """Toggle mute state of the application"""
-        print(f"chaning app state")
         try:
-            # Get exe name from window handle
-            _, pid = win32process.GetWindowThreadProcessId(self.hwnd)
-            process = psutil.Process(pid)
-            exe_name = os.path.basename(process.exe())
-
-            print(f"for exe_name{exe_name} {self.app_state}")
+            exe_name = self.process_name
+            if self.debug_mode:
+                print(f"Toggling force mute for {exe_name}")
 
             # Toggle force mute state
             if self.app_state:
                 current_force_mute = self.app_state.is_force_muted(exe_name)
                 self.app_state.save_force_mute_app(exe_name, not current_force_mute)
                 
-                sessions = AudioUtilities.GetAllSessions()
-                for session in sessions:
-                    if session.Process and os.path.basename(session.Process.exe()) == exe_name:
-                        volume = session.SimpleAudioVolume
-                        if volume:
-                            volume.SetMute(not current_force_mute, None)
-                            self.update_mute_state("Manual toggle via widget")
-                            if self.debug_mode:
-                                print(f"Toggled force mute for {exe_name}: {'Muted' if not current_force_mute else 'Unmuted'} (Manual toggle)")
-                            break
+                # One scan serves the toggle and the refresh of every widget that follows it
+                sessions = self.manager.read_sessions(self.manager.window_names() | {exe_name})
+                volume = sessions.get(exe_name)
+                if volume:
+                    volume.SetMute(not current_force_mute, None)
+                    # Every window of this app shows the new state
+                    self.manager.refresh_states("Manual toggle via widget", sessions)
+                    if self.debug_mode:
+                        print(f"Toggled force mute for {exe_name}: {'Muted' if not current_force_mute else 'Unmuted'} (Manual toggle)")
         except Exception as e:
             import traceback
             traceback.print_exc()
             if self.debug_mode:
                 print(f"Error toggling mute: {e}")
 
-class MinimizeWidget:
-    def __init__(self, hwnd, position, size, debug_mode=False):
-        self.hwnd = hwnd
-        self.size = size
-        self.debug_mode = debug_mode
-        
-        self.window = Toplevel()
-        self.window.overrideredirect(True)
-        self.window.attributes('-topmost', True)
-        self.window.geometry(f"{size}x{size}+{position[0]}+{position[1]}")
-        self.window.configure(bg='#ffd43b')  # Yellow color to distinguish it
-        
-        # Create tooltip window
-        self.tooltip = Toplevel()
-        self.tooltip.withdraw()  # Hide initially
-        self.tooltip.overrideredirect(True)
-        self.tooltip.attributes('-topmost', True)
-        self.tooltip.configure(bg='#2b2b2b')
-        self.tooltip_label = Label(self.tooltip, bg='#2b2b2b', fg='white',
-                                 text="Click to minimize window",
-                                 font=('Arial', 8), padx=5, pady=3)
-        self.tooltip_label.pack()
-        
-        # Bind mouse events
-        self.window.bind('<Button-1>', self.minimize_window)
-        self.window.bind('<Enter>', self.show_tooltip)
-        self.window.bind('<Leave>', self.hide_tooltip)
-        self.window.bind('<Motion>', self.update_tooltip_position)
-
-    def show_tooltip(self, event):
-        """Show the tooltip"""
-        if self.tooltip.state() == 'withdrawn':
-            self.update_tooltip_position(event)
-            self.tooltip.deiconify()
-
-    def hide_tooltip(self, event):
-        """Hide the tooltip"""
-        self.tooltip.withdraw()
-
-    def update_tooltip_position(self, event):
-        """Update tooltip position near the widget"""
-        x = self.window.winfo_rootx() + self.size + 5
-        y = self.window.winfo_rooty()
-        self.tooltip.geometry(f"+{x}+{y}")
-
-    def exists(self):
-        """Check if widget window still exists"""
-        return self.window.winfo_exists()
+class MinimizeWidget(OverlayControl):
+    color = '#ffd43b'  # Yellow color to distinguish it
 
-    def update_position(self, x, y):
-        """Update widget position"""
-        self.window.geometry(f"{self.size}x{self.size}+{x}+{y}")
+    def tooltip_text(self):
+        return "Click to minimize window"
 
-    def destroy(self):
-        """Destroy the widget window"""
-        if self.exists():
-            self.tooltip.destroy()
-            self.window.destroy()
+    def press(self, event):
+        self.minimize_window(event)
 
     def minimize_window(self, event=None):
         """Minimize the window"""
@@ -211,121 +257,88 @@ class MinimizeWidget:
             if self.debug_mode:
                 print(f"Error minimizing window: {e}")
 
-class VolumeWidget:
-    def __init__(self, hwnd, position, size, process_name, debug_mode=False, app_state=None):
-        self.hwnd = hwnd
-        self.size = size
+class VolumeWidget(OverlayControl):
+    color = '#2b2b2b'
+    span = 8  # Wider for the slider
+
+    def __init__(self, widget_set, process_name, app_state=None):
+        super().__init__(widget_set)
         self.process_name = process_name
-        self.debug_mode = debug_mode
         self.app_state = app_state
         self.is_dragging = False
+        self.session_volume = None  # Session SimpleAudioVolume, looked up once per drag
+        self.volume = 100  # None if it couldn't be read
         
-        # Create main window
-        self.window = Toplevel()
-        self.window.overrideredirect(True)
-        self.window.attributes('-topmost', True)
-        self.window.configure(bg='#2b2b2b')
-        
-        # Make window wider for the slider
-        slider_width = size * 8
-        self.window.geometry(f"{slider_width}x{size}+{position[0]}+{position[1]}")
-        
-        # Create tooltip window
-        self.tooltip = Toplevel()
-        self.tooltip.withdraw()
-        self.tooltip.overrideredirect(True)
-        self.tooltip.attributes('-topmost', True)
-        self.tooltip.configure(bg='#2b2b2b')
-        self.tooltip_label = Label(self.tooltip, bg='#2b2b2b', fg='white',
-                                 font=('Arial', 8), padx=5, pady=3)
-        self.tooltip_label.pack()
-        
-        # Create volume slider
-        self.volume_var = DoubleVar()
-        self.slider = Scale(self.window, from_=0, to=100,
-                          orient='horizontal',
-                          variable=self.volume_var,
-                          command=self.on_volume_change,
-                          showvalue=False,
-                          length=slider_width-4,
-                          width=size-4,
-                          bd=0,
-                          bg='#4b6eaf',
-                          highlightthickness=0,
-                          troughcolor='#2b2b2b',
-                          activebackground='#4b6eaf')
-        self.slider.pack(padx=2, pady=2)
-        
-        # Bind mouse events
-        self.window.bind('<Enter>', self.show_tooltip)
-        self.window.bind('<Leave>', self.hide_tooltip)
-        self.window.bind('<Motion>', self.update_tooltip_position)
-        self.slider.bind('<Button-1>', self.start_volume_change)
-        self.slider.bind('<ButtonRelease-1>', self.end_volume_change)
+        # Filled part of the slider, drawn over the trough
+        self.bar = self.canvas.create_rectangle(0, 0, 0, 0, fill='#4b6eaf', width=0)
         
         # Set initial volume
         self.update_volume_state()
 
-    def show_tooltip(self, event):
-        """Show the tooltip"""
-        if self.tooltip.state() == 'withdrawn':
-            self.update_tooltip_position(event)
-            self.tooltip.deiconify()
+    def place(self, x, y):
+        super().place(x, y)
+        self.draw_bar()
 
-    def hide_tooltip(self, event):
-        """Hide the tooltip"""
-        self.tooltip.withdraw()
+    def draw_bar(self):
+        left, top, right, bottom = self.bounds
+        width = (right - left - 4) * (self.volume or 0) / 100
+        self.canvas.coords(self.bar, left + 2, top + 2, left + 2 + width, bottom - 2)
 
-    def update_tooltip_position(self, event):
-        """Update tooltip position near the widget"""
-        x = self.window.winfo_rootx() + self.size + 5
-        y = self.window.winfo_rooty()
-        self.tooltip.geometry(f"+{x}+{y}")
+    def set_volume(self, volume):
+        self.volume = volume
+        self.draw_bar()
+        self.manager.tooltip.refresh(self)
 
-    def exists(self):
-        """Check if widget window still exists"""
-        return self.window.winfo_exists()
+    def value_at(self, x):
+        """Volume for an overlay x coordinate on the slider"""
+        left, _, right, _ = self.bounds
+        return max(0, min(100, (x - left - 2) * 100 / max(1, right - left - 4)))
 
-    def update_position(self, x, y):
-        """Update widget position"""
-        self.window.geometry(f"{self.size * 8}x{self.size}+{x}+{y}")
+    def tooltip_text(self):
+        if self.volume is None:
+            return "Error getting volume"
+        return f"Volume: {int(self.volume)}%"
 
-    def destroy(self):
-        """Destroy the widget window"""
-        if self.exists():
-            self.tooltip.destroy()
-            self.window.destroy()
+    def press(self, event):
+        self.start_volume_change(event)
+        self.on_volume_change(self.value_at(event.x))
+
+    def drag(self, event):
+        self.on_volume_change(self.value_at(event.x))
+
+    def release(self, event):
+        self.end_volume_change(event)
 
     def start_volume_change(self, event):
         """Handle start of volume change"""
         self.is_dragging = True
+        try:
+            self.session_volume = self.manager.read_sessions({self.process_name}).get(self.process_name)
+        except Exception as e:
+            if self.debug_mode:
+                print(f"Error finding audio session: {e}")
 
     def end_volume_change(self, event):
         """Handle end of volume change"""
         self.is_dragging = False
+        self.session_volume = None
         self.update_volume_state()
 
     def update_volume_state(self):
         """Update volume state and tooltip"""
         try:
-            # Get exe name from window handle
-            _, pid = win32process.GetWindowThreadProcessId(self.hwnd)
-            process = psutil.Process(pid)
-            exe_name = os.path.basename(process.exe())
+            exe_name = self.process_name
             
             # Get current volume from app state
             current_volume = self.app_state.get_app_volume(exe_name) if self.app_state else 100
-            self.volume_var.set(current_volume)
-            
-            # Update tooltip
-            self.tooltip_label.config(text=f"Volume: {int(current_volume)}%")
+            self.set_volume(current_volume)
             
             if self.debug_mode:
                 print(f"Updated volume state for {exe_name}: {current_volume}%")
         except Exception as e:
             if self.debug_mode:
                 print(f"Error updating volume state: {e}")
-            self.tooltip_label.config(text="Error getting volume")
+            self.set_volume(None)
 
     def on_volume_change(self, value):
         """Handle volume change"""
@@ -334,91 +347,170 @@ class VolumeWidget:
                 return
                 
             volume = float(value)
-            # Get exe name from window handle
-            _, pid = win32process.GetWindowThreadProcessId(self.hwnd)
-            process = psutil.Process(pid)
-            exe_name = os.path.basename(process.exe())
+            self.set_volume(volume)
+            exe_name = self.process_name
             
             # Update volume in app state
             if self.app_state:
                 self.app_state.save_app_volume(exe_name, volume)
             
             # Update audio session volume
-            sessions = AudioUtilities.GetAllSessions()
-            for session in sessions:
-                if session.Process and os.path.basename(session.Process.exe()) == exe_name:
-                    volume_interface = session.SimpleAudioVolume
-                    if volume_interface:
-                        volume_interface.SetMasterVolume(volume / 100.0, None)
-                        self.tooltip_label.config(text=f"Volume: {int(volume)}%")
-                        if self.debug_mode:
-                            print(f"Set volume for {exe_name} to {volume}%")
-                        break
+            if self.session_volume:
+                self.session_volume.SetMasterVolume(volume / 100.0, None)
+                if self.debug_mode:
+                    print(f"Set volume for {exe_name} to {volume}%")
         except Exception as e:
             if self.debug_mode:
                 print(f"Error changing volume: {e}")
 
 class ResizeWidgetManager:
-    def __init__(self, debug_mode=False, widget_size=10, app_state=None):
-        self.widgets = {}
-        self.mute_widgets = {}
-        self.move_widgets = {}
-        self.minimize_widgets = {}
-        self.volume_widgets = {}  # Add storage for volume widgets
+    def __init__(self, root, debug_mode=False, widget_size=10, app_state=None, window_events=None):
+        self.root = root
+        self.widget_sets = {}  # hwnd -> WidgetSet
         self.debug_mode = debug_mode
         self.widget_size = widget_size
         self.app_state = app_state
         self.active_window = None
         self.is_resizing = False
         self.widgets_visible = False
+        self.tooltip = SharedTooltip()
+        
+        # Mute/volume controls are refreshed together from one session scan
+        self.session_names = {}  # pid -> exe name of audio sessions
+        self.new_sets = set()  # hwnds whose controls were never refreshed
+        self.stale_reason = None  # Refresh reason saved while the widgets were hidden
+        
+        # Overlays follow their windows as they move, once per frame while shown;
+        # without window events they only move on create_or_update_widgets
+        self.tracker = None
+        if window_events is not None:
+            self.tracker = WindowTracker(root, window_events, self.follow_window,
+                                         is_active=lambda: self.widgets_visible,
+                                         debug_mode=debug_mode)
         
-        # Start keyboard listener for Alt key
+        # The keyboard hook thread must not touch Tk, so it only queues Alt
+        # up/down edges; the Tk thread drains them and applies the latest one
+        self.alt_events = queue.SimpleQueue()
+        self.alt_down = False  # Hook thread's view, used to drop key repeats
+        self.alt_wanted = False  # Tk thread's view of the last drained state
+        self.alt_job = self.root.after(ALT_POLL_MS, self.drain_alt_events)
+        
+        # Start keyboard listener for Alt key; imported here as it is slow to load
+        import keyboard
+        self.keyboard = keyboard
         keyboard.on_press_key('alt', self.on_alt_press, suppress=False)
         keyboard.on_release_key('alt', self.on_alt_release, suppress=False)
 
     def on_alt_press(self, _):
-        """Handle Alt key press"""
-        if not self.widgets_visible and not self.is_resizing:
-            self.show_widgets()
-            self.widgets_visible = True
-            if self.debug_mode:
-                print("Showing widgets (Alt pressed)")
+        """Handle Alt key press (keyboard hook thread)"""
+        if not self.alt_down:  # Auto-repeat keeps firing presses while held
+            self.alt_down = True
+            self.alt_events.put(True)
 
     def on_alt_release(self, _):
-        """Handle Alt key release"""
-        if self.widgets_visible and not self.is_resizing:
-            self.hide_widgets()
-            self.widgets_visible = False
+        """Handle Alt key release (keyboard hook thread)"""
+        if self.alt_down:
+            self.alt_down = False
+            self.alt_events.put(False)
+
+    def drain_alt_events(self):
+        """Apply queued Alt key changes as one visibility change (Tk thread)"""
+        self.alt_job = None
+        try:
+            edges = 0
+            while True:
+                try:
+                    self.alt_wanted = self.alt_events.get_nowait()
+                except queue.Empty:
+                    break
+                edges += 1
+
+            # Visibility is left alone while dragging and caught up afterwards
+            if self.alt_wanted != self.widgets_visible and not self.is_resizing:
+                if self.alt_wanted:
+                    self.show_widgets()
+                else:
+                    self.hide_widgets()
+                self.widgets_visible = self.alt_wanted
+                if self.debug_mode:
+                    print(f"{'Showing' if self.alt_wanted else 'Hiding'} widgets "
+                          f"(Alt {'pressed' if self.alt_wanted else 'released'}, {edges} edges)")
+        finally:
+            self.alt_job = self.root.after(ALT_POLL_MS, self.drain_alt_events)
+
+    def follow_window(self, hwnd):
+        """Move a window's overlay to where the window is now"""
+        widget_set = self.widget_sets.get(hwnd)
+        if widget_set is not None and win32gui.IsWindow(hwnd):
+            widget_set.move_to(win32gui.GetWindowRect(hwnd))
+
+    def read_sessions(self, names):
+        """Map each of names that has an audio session to its SimpleAudioVolume, in one scan"""
+        from pycaw.pycaw import AudioUtilities
+        found = {}
+        seen = {}
+        for session in AudioUtilities.GetAllSessions():
+            pid = session.ProcessId
+            if not pid:
+                continue
+            name = self.session_names.get(pid)
+            if name is None:
+                try:
+                    name = os.path.basename(session.Process.exe())
+                except Exception:
+                    name = ""
+            seen[pid] = name
+            if name in names and name not in found:
+                volume = session.SimpleAudioVolume
+                if volume:
+                    found[name] = volume
+        self.session_names = seen
+        return found
+
+    def window_names(self):
+        """Exe names of every window with widgets"""
+        return {widget_set.window_name for widget_set in self.widget_sets.values()}
+
+    def read_mute_states(self, names, sessions=None):
+        """Map each of names that has an audio session to whether it is muted
+
+        Pass sessions already read by read_sessions() (covering names) to skip the scan.
+        """
+        if sessions is None:
+            sessions = self.read_sessions(names)
+        return {name: bool(volume.GetMute()) for name, volume in sessions.items() if name in names}
+
+    def refresh_states(self, reason="Unknown", sessions=None):
+        """Refresh every mute and volume control; deferred until shown while the widgets are hidden"""
+        if not self.widgets_visible:
+            self.stale_reason = reason
+            return
+        self.apply_states(reason, sessions)
+
+    def apply_states(self, reason, sessions=None):
+        self.stale_reason = None
+        if not self.widget_sets:
+            return
+        try:
+            mute_states = self.read_mute_states(self.window_names(), sessions)
+        except Exception as e:
             if self.debug_mode:
-                print("Hiding widgets (Alt released)")
+                print(f"Error reading audio sessions: {e}")
+            mute_states = None
+        for hwnd, widget_set in self.widget_sets.items():
+            widget_set.refresh_state("Widget created" if hwnd in self.new_sets else reason, mute_states)
+        self.new_sets.clear()
 
     def show_widgets(self):
         """Show all widgets"""
         try:
-            for widget_key in self.widgets:
-                for widget in self.widgets[widget_key]:
-                    if widget.exists():
-                        widget.window.deiconify()
-                
-                if widget_key in self.mute_widgets:
-                    mute_widget = self.mute_widgets[widget_key]
-                    if mute_widget.exists():
-                        mute_widget.window.deiconify()
-                
-                if widget_key in self.move_widgets:
-                    move_widget = self.move_widgets[widget_key]
-                    if move_widget.exists():
-                        move_widget.window.deiconify()
-                
-                if widget_key in self.minimize_widgets:
-                    minimize_widget = self.minimize_widgets[widget_key]
-                    if minimize_widget.exists():
-                        minimize_widget.window.deiconify()
-                
-                if widget_key in self.volume_widgets:
-                    volume_widget = self.volume_widgets[widget_key]
-                    if volume_widget.exists():
-                        volume_widget.window.deiconify()
+            # Catch up with windows that moved, and audio that changed, while hidden
+            if self.tracker is not None:
+                self.tracker.flush()
+            if self.stale_reason is not None:
+                self.apply_states(self.stale_reason)
+            for widget_set in self.widget_sets.values():
+                widget_set.show()
         except Exception as e:
             if self.debug_mode:
                 print(f"Error showing widgets: {e}")
@@ -426,30 +518,8 @@ class ResizeWidgetManager:
     def hide_widgets(self):
         """Hide all widgets"""
         try:
-            for widget_key in self.widgets:
-                for widget in self.widgets[widget_key]:
-                    if widget.exists():
-                        widget.window.withdraw()
-                
-                if widget_key in self.mute_widgets:
-                    mute_widget = self.mute_widgets[widget_key]
-                    if mute_widget.exists():
-                        mute_widget.window.withdraw()
-                
-                if widget_key in self.move_widgets:
-                    move_widget = self.move_widgets[widget_key]
-                    if move_widget.exists():
-                        move_widget.window.withdraw()
-                
-                if widget_key in self.minimize_widgets:
-                    minimize_widget = self.minimize_widgets[widget_key]
-                    if minimize_widget.exists():
-                        minimize_widget.window.withdraw()
-                
-                if widget_key in self.volume_widgets:
-                    volume_widget = self.volume_widgets[widget_key]
-                    if volume_widget.exists():
-                        volume_widget.window.withdraw()
+            for widget_set in self.widget_sets.values():
+                widget_set.hide()
         except Exception as e:
             if self.debug_mode:
                 print(f"Error hiding widgets: {e}")
@@ -459,7 +529,7 @@ class ResizeWidgetManager:
         try:
             # Check if window still exists and is visible
             if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd):
-                self.remove_widgets_for_hwnd(window_name, hwnd)
+                self.remove_widgets_for_hwnd(hwnd)
                 return
 
             # Get active window
@@ -478,7 +548,7 @@ class ResizeWidgetManager:
 
             # Only hide widgets if active window is different and not a widget window
             if active_hwnd != hwnd and not is_widget_window:
-                self.remove_widgets_for_hwnd(window_name, hwnd)
+                self.remove_widgets_for_hwnd(hwnd)
                 return
 
             if self.debug_mode:
@@ -487,345 +557,286 @@ class ResizeWidgetManager:
             
             # Get window rect
             rect = win32gui.GetWindowRect(hwnd)
-            x, y, right, bottom = rect
-            width = right - x
-            height = bottom - y
             
             if self.debug_mode:
-                print(f"Window dimensions: {width}x{height} at ({x},{y})")
+                x, y, right, bottom = rect
+                print(f"Window dimensions: {right - x}x{bottom - y} at ({x},{y})")
 
-            widget_key = f"{window_name}_{hwnd}"
-            
-            # Create new widgets if they don't exist for this window
-            if widget_key not in self.widgets:
+            widget_set = self.widget_sets.get(hwnd)
+            # A reused hwnd or a new widget size needs fresh widgets
+            if widget_set is not None and (widget_set.window_name != window_name
+                                           or widget_set.size != self.widget_size):
+                widget_set.destroy()
+                widget_set = None
+
+            if widget_set is None:
                 if self.debug_mode:
-                    print(f"Creating new resize widgets for {widget_key}")
-                
-                self.widgets[widget_key] = []
-                
-                # Create widgets for each corner
-                corners = [
-                    ('nw', x, y),
-                    ('ne', right - self.widget_size, y),
-                    ('sw', x, bottom - self.widget_size),
-                    ('se', right - self.widget_size, bottom - self.widget_size)
-                ]
-                
-                for corner, wx, wy in corners:
-                    try:
-                        widget = ResizeWidget(
-                            hwnd=hwnd,
-                            corner=corner,
-                            position=(wx, wy),
-                            size=self.widget_size,
-                            debug_mode=self.debug_mode,
-                            manager=self
-                        )
-                        self.widgets[widget_key].append(widget)
-                        
-                        # Create mute, move, and minimize widgets next to NE corner
-                        if corner == 'ne':
-                            move_x = x + (width - self.widget_size) // 2
-                            move_y = y
-                            
-                            # Create minimize widget
-                            minimize_widget = MinimizeWidget(
-                                hwnd=hwnd,
-                                position=(move_x + self.widget_size * 2, move_y),
-                                size=self.widget_size,
-                                debug_mode=self.debug_mode
-                            )
-                            self.minimize_widgets[widget_key] = minimize_widget
-                            
-                            # Create move widget
-                            move_widget = MoveWidget(
-                                hwnd=hwnd,
-                                position=(move_x, move_y),
-                                size=self.widget_size,
-                                debug_mode=self.debug_mode,
-                                manager=self
-                            )
-                            self.move_widgets[widget_key] = move_widget
-                            
-                            # Create mute widget
-                            mute_widget = MuteWidget(
-                                hwnd=hwnd,
-                                position=(move_x - self.widget_size * 2, move_y),
-                                size=self.widget_size,
-                                process_name=window_name,
-                                debug_mode=self.debug_mode,
-                                app_state=self.app_state
-                            )
-                            self.mute_widgets[widget_key] = mute_widget
-                            mute_widget.update_mute_state("Widget created")
-                            
-                            # Create volume widget (add after minimize widget)
-                            volume_widget = VolumeWidget(
-                                hwnd=hwnd,
-                                position=(move_x + self.widget_size * 4, move_y),  # Position after minimize widget
-                                size=self.widget_size,
-                                process_name=window_name,
-                                debug_mode=self.debug_mode,
-                                app_state=self.app_state
-                            )
-                            self.volume_widgets[widget_key] = volume_widget
-                        
-                        if self.debug_mode:
-                            print(f"Created {corner} widget at ({wx},{wy})")
-                    except Exception as e:
-                        print(f"Error creating {corner} widget: {e}")
+                    print(f"Creating new resize widgets for {window_name} ({hwnd})")
+                widget_set = WidgetSet(self, window_name, hwnd, rect)
+                self.widget_sets[hwnd] = widget_set
+                if self.tracker is not None:
+                    self.tracker.watch(hwnd)
+                self.new_sets.add(hwnd)
             else:
-                # Update existing widgets positions
                 if self.debug_mode:
-                    print(f"Updating existing widgets for {widget_key}")
-                
-                corners = [
-                    ('nw', x, y),
-                    ('ne', right - self.widget_size, y),
-                    ('sw', x, bottom - self.widget_size),
-                    ('se', right - self.widget_size, bottom - self.widget_size)
-                ]
-                
-                for widget, (corner, wx, wy) in zip(self.widgets[widget_key], corners):
-                    try:
-                        if widget.exists():
-                            widget.update_position(wx, wy)
-                            
-                            # Update move, mute, and minimize widget positions if this is the NE corner
-                            if corner == 'ne':
-                                move_x = x + (width - self.widget_size) // 2
-                                move_y = y
-                                
-                                # Update minimize widget
-                                if widget_key in self.minimize_widgets:
-                                    minimize_widget = self.minimize_widgets[widget_key]
-                                    if minimize_widget.exists():
-                                        minimize_widget.update_position(move_x + self.widget_size * 2, move_y)
-                                    else:
-                                        # Recreate minimize widget if it was destroyed
-                                        self.minimize_widgets[widget_key] = MinimizeWidget(
-                                            hwnd=hwnd,
-                                            position=(move_x + self.widget_size * 2, move_y),
-                                            size=self.widget_size,
-                                            debug_mode=self.debug_mode
-                                        )
-                                
-                                # Update move widget
-                                if widget_key in self.move_widgets:
-                                    move_widget = self.move_widgets[widget_key]
-                                    if move_widget.exists():
-                                        move_widget.update_position(move_x, move_y)
-                                    else:
-                                        # Recreate move widget if it was destroyed
-                                        self.move_widgets[widget_key] = MoveWidget(
-                                            hwnd=hwnd,
-                                            position=(move_x, move_y),
-                                            size=self.widget_size,
-                                            debug_mode=self.debug_mode,
-                                            manager=self
-                                        )
-                                
-                                # Update mute widget
-                                if widget_key in self.mute_widgets:
-                                    mute_widget = self.mute_widgets[widget_key]
-                                    if mute_widget.exists():
-                                        mute_widget.update_position(move_x - self.widget_size * 2, move_y)
-                                        mute_widget.update_mute_state("Window position updated")
-                                    else:
-                                        # Recreate mute widget if it was destroyed
-                                        self.mute_widgets[widget_key] = MuteWidget(
-                                            hwnd=hwnd,
-                                            position=(move_x - self.widget_size * 2, move_y),
-                                            size=self.widget_size,
-                                            process_name=window_name,
-                                            debug_mode=self.debug_mode,
-                                            app_state=self.app_state
-                                        )
-                                        self.mute_widgets[widget_key].update_mute_state("Widget recreated")
-                                
-                                # Update volume widget
-                                if widget_key in self.volume_widgets:
-                                    volume_widget = self.volume_widgets[widget_key]
-                                    if volume_widget.exists():
-                                        volume_widget.update_position(move_x + self.widget_size * 4, move_y)
-                                        volume_widget.update_volume_state()
-                                    else:
-                                        # Recreate volume widget if it was destroyed
-                                        self.volume_widgets[widget_key] = VolumeWidget(
-                                            hwnd=hwnd,
-                                            position=(move_x + self.widget_size * 4, move_y),
-                                            size=self.widget_size,
-                                            process_name=window_name,
-                                            debug_mode=self.debug_mode,
-                                            app_state=self.app_state
-                                        )
-                            
-                            if self.debug_mode:
-                                print(f"Updated {corner} widget to ({wx},{wy})")
-                        else:
-                            if self.debug_mode:
-                                print(f"Widget for {corner} no longer exists, recreating")
-                            new_widget = ResizeWidget(
-                                hwnd=hwnd,
-                                corner=corner,
-                                position=(wx, wy),
-                                size=self.widget_size,
-                                debug_mode=self.debug_mode,
-                                manager=self
-                            )
-                            self.widgets[widget_key][self.widgets[widget_key].index(widget)] = new_widget
-                    except Exception as e:
-                        print(f"Error updating {corner} widget: {e}")
+                    print(f"Updating existing widgets for {window_name} ({hwnd})")
+                if not widget_set.exists():
+                    self.new_sets.add(hwnd)
+                widget_set.repair(rect)
+                widget_set.move_to(rect)
                     
             # After creating or updating widgets, set their visibility based on current state
             if not self.widgets_visible:
-                self.hide_widgets()
+                widget_set.hide()
         except Exception as e:
             print(f"Error in create_or_update_widgets: {e}")
             import traceback
             traceback.print_exc()
 
-    def remove_widgets_for_hwnd(self, window_name, hwnd):
+    def remove_widgets_for_hwnd(self, hwnd):
         """Remove widgets for a specific window handle"""
         if self.is_resizing:
             return
 
-        widget_key = f"{window_name}_{hwnd}"
-        if widget_key in self.widgets:
-            print(f"Removing resize widgets for {widget_key}")
+        widget_set = self.widget_sets.pop(hwnd, None)
+        if self.tracker is not None:
+            self.tracker.unwatch(hwnd)
+        if widget_set is not None:
             if self.debug_mode:
-                print(f"Removing resize widgets for {widget_key}")
-            for widget in self.widgets[widget_key]:
-                widget.destroy()
-            del self.widgets[widget_key]
-            
-            # Remove minimize widget
-            if widget_key in self.minimize_widgets:
-                self.minimize_widgets[widget_key].destroy()
-                del self.minimize_widgets[widget_key]
-            
-            # Remove move widget
-            if widget_key in self.move_widgets:
-                self.move_widgets[widget_key].destroy()
-                del self.move_widgets[widget_key]
-            
-            # Remove mute widget
-            if widget_key in self.mute_widgets:
-                self.mute_widgets[widget_key].destroy()
-                del self.mute_widgets[widget_key]
-            
-            # Remove volume widget
-            if widget_key in self.volume_widgets:
-                self.volume_widgets[widget_key].destroy()
-                del self.volume_widgets[widget_key]
+                print(f"Removing resize widgets for {widget_set.window_name} ({hwnd})")
+            widget_set.destroy()
 
     def remove_widgets(self, window_name):
         """Remove all resize widgets for a window name"""
-        for key in list(self.widgets.keys()):
-            if key.startswith(f"{window_name}_"):
+        for hwnd, widget_set in list(self.widget_sets.items()):
+            if widget_set.window_name == window_name:
                 if self.debug_mode:
-                    print(f"Removing resize widgets for {key}")
-                for widget in self.widgets[key]:
-                    widget.destroy()
-                del self.widgets[key]
-                
-                # Remove minimize widget
-                if key in self.minimize_widgets:
-                    self.minimize_widgets[key].destroy()
-                    del self.minimize_widgets[key]
-                
-                # Remove move widget
-                if key in self.move_widgets:
-                    self.move_widgets[key].destroy()
-                    del self.move_widgets[key]
-                
-                # Remove mute widget
-                if key in self.mute_widgets:
-                    self.mute_widgets[key].destroy()
-                    del self.mute_widgets[key]
-                
-                # Remove volume widget
-                if key in self.volume_widgets:
-                    self.volume_widgets[key].destroy()
-                    del self.volume_widgets[key]
+                    print(f"Removing resize widgets for {window_name} ({hwnd})")
+                widget_set.destroy()
+                del self.widget_sets[hwnd]
+                if self.tracker is not None:
+                    self.tracker.unwatch(hwnd)
 
     def update_all_widgets(self):
         """Update all existing widgets with new size"""
-        for window_name in list(self.widgets.keys()):
+        for hwnd, widget_set in list(self.widget_sets.items()):
             try:
-                # Extract hwnd from the key
-                hwnd = int(window_name.split('_')[-1])
-                window_base_name = window_name.rsplit('_', 1)[0]
-                self.create_or_update_widgets(window_base_name, hwnd)
+                self.create_or_update_widgets(widget_set.window_name, hwnd)
             except Exception as e:
                 if self.debug_mode:
-                    print(f"Error updating widgets for {window_name}: {e}")
+                    print(f"Error updating widgets for {widget_set.window_name}: {e}")
+        self.refresh_states("Window position updated")
 
     def cleanup_closed_windows(self):
         """Remove widgets for windows that no longer exist"""
-        for window_name in list(self.widgets.keys()):
+        for hwnd, widget_set in list(self.widget_sets.items()):
             try:
-                hwnd = int(window_name.split('_')[-1])
                 if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd):
-                    self.remove_widgets_for_hwnd(window_name.rsplit('_', 1)[0], hwnd)
+                    self.remove_widgets_for_hwnd(hwnd)
             except Exception as e:
                 if self.debug_mode:
-                    print(f"Error cleaning up widgets for {window_name}: {e}")
+                    print(f"Error cleaning up widgets for {widget_set.window_name}: {e}")
 
     def cleanup(self):
         """Clean up keyboard listeners when closing"""
         try:
-            keyboard.unhook_all()
+            self.keyboard.unhook_all()
         except Exception as e:
             if self.debug_mode:
                 print(f"Error cleaning up keyboard hooks: {e}")
         
+        if self.alt_job is not None:
+            self.root.after_cancel(self.alt_job)
+            self.alt_job = None
+        if self.tracker is not None:
+            self.tracker.stop()
+        
         # Remove all widgets
-        for window_name in list(self.widgets.keys()):
-            self.remove_widgets(window_name)
+        for widget_set in self.widget_sets.values():
+            widget_set.destroy()
+        self.widget_sets.clear()
+        self.tooltip.destroy()
 
-class ResizeWidget:
-    def __init__(self, hwnd, corner, position, size, debug_mode, manager:ResizeWidgetManager):
-        self.hwnd = hwnd
-        self.corner = corner
-        self.size = size
-        self.debug_mode = debug_mode
+class WidgetSet:
+    """Overlay for one managed window
+
+    A single borderless, topmost Toplevel covers the window. Its background
+    is the transparent color, so empty areas show and pass clicks through to
+    the window below. The corner handles and controls are canvas regions
+    hit-tested here, so showing, hiding or moving all of them is one window
+    operation.
+    """
+
+    __slots__ = ("manager", "window_name", "hwnd", "size", "rect", "window", "canvas",
+                 "controls", "active", "hover")
+
+    # Control name -> horizontal offset, in widget sizes, from the centered move widget
+    CONTROL_OFFSETS = {'move': 0, 'mute': -2, 'minimize': 2, 'volume': 4}
+
+    def __init__(self, manager, window_name, hwnd, rect):
         self.manager = manager
-        
+        self.window_name = window_name
+        self.hwnd = hwnd
+        self.size = manager.widget_size
+        self.build()
+        self.move_to(rect)
+
+    def build(self):
+        """Create the overlay window and draw every control on it"""
+        self.rect = None
+        self.active = None  # Control holding the mouse button
+        self.hover = None  # Control under the pointer
+
         self.window = Toplevel()
+        if not self.manager.widgets_visible:
+            self.window.withdraw()
         self.window.overrideredirect(True)
         self.window.attributes('-topmost', True)
-        self.window.geometry(f"{size}x{size}+{position[0]}+{position[1]}")
-        self.window.configure(bg='gray')
-        
-        # Store initial positions for drag calculation
-        self.window.bind('<Button-1>', self.start_resize)
-        self.window.bind('<B1-Motion>', self.do_resize)
-        self.window.bind('<ButtonRelease-1>', self.end_resize)
-
-        self.start_x = None
-        self.start_y = None
-        self.resizing = False
-        self.last_resize_time = 0
-        self.resize_delay = 1/60  # Limit to 60 FPS
-        self.last_mouse_x = None
-        self.last_mouse_y = None
-        self.pending_resize = None
+        self.window.configure(bg=TRANSPARENT_COLOR)
+        try:
+            self.window.attributes('-transparentcolor', TRANSPARENT_COLOR)
+        except TclError:
+            pass  # Color keying is Windows only
+
+        self.canvas = Canvas(self.window, bg=TRANSPARENT_COLOR, highlightthickness=0, bd=0)
+        self.canvas.pack(fill='both', expand=True)
+        self.canvas.bind('<Button-1>', self.on_press)
+        self.canvas.bind('<B1-Motion>', self.on_drag)
+        self.canvas.bind('<ButtonRelease-1>', self.on_release)
+        self.canvas.bind('<Motion>', self.on_motion)
+        self.canvas.bind('<Leave>', self.on_leave)
+
+        manager = self.manager
+        self.controls = {}  # name -> control: 'nw', 'ne', 'sw', 'se', then the controls
+        for corner in ('nw', 'ne', 'sw', 'se'):
+            self.controls[corner] = ResizeWidget(self, corner)
+        self.controls['move'] = MoveWidget(self)
+        self.controls['mute'] = MuteWidget(self, self.window_name, app_state=manager.app_state)
+        self.controls['minimize'] = MinimizeWidget(self)
+        self.controls['volume'] = VolumeWidget(self, self.window_name, app_state=manager.app_state)
+
+    def layout(self, width, height):
+        """Overlay position of every control for a window of the given size"""
+        size = self.size
+        positions = {
+            'nw': (0, 0),
+            'ne': (width - size, 0),
+            'sw': (0, height - size),
+            'se': (width - size, height - size),
+        }
+        # Controls sit in a row centered on the top edge
+        move_x = (width - size) // 2
+        for name, offset in self.CONTROL_OFFSETS.items():
+            positions[name] = (move_x + size * offset, 0)
+        return positions
 
     def exists(self):
-        """Check if widget window still exists"""
         return self.window.winfo_exists()
 
-    def update_position(self, x, y):
-        """Update widget position"""
-        self.window.geometry(f"{self.size}x{self.size}+{x}+{y}")
+    def repair(self, rect):
+        """Rebuild the overlay if its window was destroyed behind our back"""
+        if not self.exists():
+            if self.manager.debug_mode:
+                print(f"Overlay for {self.window_name} no longer exists, recreating")
+            self.destroy()
+            self.build()
+            self.move_to(rect)
+
+    def move_to(self, rect):
+        """Make the overlay cover the window rect"""
+        if rect == self.rect:
+            return
+        x, y, right, bottom = rect
+        width, height = right - x, bottom - y
+        if self.rect is None or (width, height) != (self.rect[2] - self.rect[0], self.rect[3] - self.rect[1]):
+            for name, position in self.layout(width, height).items():
+                self.controls[name].place(*position)
+            self.window.geometry(f"{width}x{height}+{x}+{y}")
+        else:
+            self.window.geometry(f"+{x}+{y}")
+        self.rect = rect
+
+    def refresh_state(self, reason, mute_states):
+        if mute_states is None:
+            self.controls['mute'].set_color('gray')
+            self.controls['mute'].set_state(None)
+        else:
+            self.controls['mute'].update_mute_state(reason, mute_states)
+        self.controls['volume'].update_volume_state()
+
+    def hit_test(self, x, y):
+        """Control at overlay coordinates (x, y), or None"""
+        for control in self.controls.values():
+            if control.contains(x, y):
+                return control
+        return None
+
+    def on_press(self, event):
+        self.active = self.hit_test(event.x, event.y)
+        if self.active is not None:
+            self.active.press(event)
+
+    def on_drag(self, event):
+        if self.active is not None:
+            self.active.drag(event)
+
+    def on_release(self, event):
+        active, self.active = self.active, None
+        if active is not None:
+            active.release(event)
+
+    def on_motion(self, event):
+        control = self.hit_test(event.x, event.y)
+        if control is not self.hover:
+            self.hover = control
+            self.show_tooltip(control)
+
+    def on_leave(self, event):
+        self.hover = None
+        self.manager.tooltip.hide(self)
+
+    def show_tooltip(self, control):
+        """Point the shared tooltip at a control, or hide it when the pointer is on empty space"""
+        if control is None:
+            self.manager.tooltip.hide(self)
+            return
+        _, top, right, _ = control.bounds
+        self.manager.tooltip.show(control, self.window.winfo_rootx() + right + 5,
+                                  self.window.winfo_rooty() + top)
 
-    def destroy(self):
-        """Destroy the widget window"""
-        print("destroy widget")
+    def show(self):
+        if self.exists():
+            self.window.deiconify()
+
+    def hide(self):
+        self.manager.tooltip.hide(self)
         if self.exists():
+            self.window.withdraw()
+
+    def destroy(self):
+        self.manager.tooltip.hide(self)
+        if self.window.winfo_exists():
             self.window.destroy()
 
+class ResizeWidget(OverlayControl):
+    def __init__(self, widget_set, corner):
+        super().__init__(widget_set)
+        self.corner = corner
+        self.start_x = None
+        self.start_y = None
+        self.start_rect = None
+        self.resizing = False
+        self.pipeline = FramePacedDrag(self.canvas, self.apply_resize, debug_mode=self.debug_mode)
+
+    def press(self, event):
+        self.start_resize(event)
+
+    def drag(self, event):
+        self.do_resize(event)
+
+    def release(self, event):
+        self.end_resize(event)
+
     def start_resize(self, event):
         """Start window resize operation"""
         self.manager.is_resizing = True
@@ -837,179 +848,69 @@ class ResizeWidget:
             print(f"starting resize {self.corner}")
 
     def apply_resize(self, new_rect):
-        """Apply resize with rate limiting"""
-        current_time = time.time()
-        if current_time - self.last_resize_time >= self.resize_delay:
-            try:
-                # Apply new window position and size
-                win32gui.SetWindowPos(self.hwnd, 0, 
-                                    new_rect[0], new_rect[1],
-                                    new_rect[2] - new_rect[0],
-                                    new_rect[3] - new_rect[1],
-                                    win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
-                
-                # Update widget positions
-                if self.manager:
-                    rect = win32gui.GetWindowRect(self.hwnd)
-                    x, y, right, bottom = rect
-                    corners = [
-                        ('nw', x, y),
-                        ('ne', right - self.size, y),
-                        ('sw', x, bottom - self.size),
-                        ('se', right - self.size, bottom - self.size)
-                    ]
-                    
-                    # Find our window in the manager's widgets
-                    for key, widgets in self.manager.widgets.items():
-                        if any(widget is self for widget in widgets):
-                            # Update corner widgets
-                            for widget, (corner, wx, wy) in zip(widgets, corners):
-                                if widget is not self:  # Don't update the widget being dragged
-                                    widget.update_position(wx, wy)
-                            
-                            # Update control widgets
-                            move_x = x + (right - x - self.size) // 2
-                            move_y = y
-                            
-                            if key in self.manager.move_widgets:
-                                self.manager.move_widgets[key].update_position(move_x, move_y)
-                            if key in self.manager.mute_widgets:
-                                self.manager.mute_widgets[key].update_position(move_x - self.size * 2, move_y)
-                            if key in self.manager.minimize_widgets:
-                                self.manager.minimize_widgets[key].update_position(move_x + self.size * 2, move_y)
-                            if key in self.manager.volume_widgets:
-                                self.manager.volume_widgets[key].update_position(move_x + self.size * 4, move_y)
-                            break
-                
-                self.last_resize_time = current_time
-                self.pending_resize = None
-            except Exception as e:
-                if self.debug_mode:
-                    print(f"Error applying resize: {e}")
+        """Resize the window to new_rect and move the overlay along"""
+        win32gui.SetWindowPos(self.hwnd, 0, 
+                            new_rect[0], new_rect[1],
+                            new_rect[2] - new_rect[0],
+                            new_rect[3] - new_rect[1],
+                            win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
+        
+        # The window may clamp the size, so follow where it actually ended up
+        self.widget_set.move_to(win32gui.GetWindowRect(self.hwnd))
 
     def do_resize(self, event):
         """Handle window resize operation"""
-        try:
-            if not self.resizing or self.start_x is None:
-                return
-
-            # Get current mouse position instead of using event coordinates
-            current_x = self.window.winfo_pointerx()
-            current_y = self.window.winfo_pointery()
-
-            # Skip if mouse hasn't moved since last resize
-            if (self.last_mouse_x == current_x and 
-                self.last_mouse_y == current_y):
-                return
-
-            # Update last known mouse position
-            self.last_mouse_x = current_x
-            self.last_mouse_y = current_y
+        if not self.resizing or self.start_x is None:
+            return
 
-            dx = current_x - self.start_x
-            dy = current_y - self.start_y
-            x, y, right, bottom = self.start_rect
-            
-            if self.corner == 'nw':
-                new_rect = (x + dx, y + dy, right, bottom)
-            elif self.corner == 'ne':
-                new_rect = (x, y + dy, right + dx, bottom)
-            elif self.corner == 'sw':
-                new_rect = (x + dx, y, right, bottom + dy)
-            elif self.corner == 'se':
-                new_rect = (x, y, right + dx, bottom + dy)
-            
-            # Store the pending resize
-            self.pending_resize = new_rect
-            
-            # Apply immediately if enough time has passed
-            current_time = time.time()
-            if current_time - self.last_resize_time >= self.resize_delay:
-                self.apply_resize(new_rect)
-            
-        except Exception as e:
-            if self.debug_mode:
-                print(f"Error in do_resize: {e}")
+        dx = event.x_root - self.start_x
+        dy = event.y_root - self.start_y
+        x, y, right, bottom = self.start_rect
+        
+        if self.corner == 'nw':
+            new_rect = (x + dx, y + dy, right, bottom)
+        elif self.corner == 'ne':
+            new_rect = (x, y + dy, right + dx, bottom)
+        elif self.corner == 'sw':
+            new_rect = (x + dx, y, right, bottom + dy)
+        else:
+            new_rect = (x, y, right + dx, bottom + dy)
+        
+        # Only the latest target is kept; it is applied on the next frame
+        self.pipeline.submit(new_rect)
 
     def end_resize(self, event):
         """Handle end of resize operation"""
         self.resizing = False
-        self.manager.is_resizing = False
-        # Clear mouse position tracking
-        self.last_mouse_x = None
-        self.last_mouse_y = None
         # Apply any final pending resize
-        if self.pending_resize:
-            self.apply_resize(self.pending_resize)
-        self.pending_resize = None
+        self.pipeline.finish("Resize")
+        self.manager.is_resizing = False
+        self.start_x = None
+        self.start_y = None
         if self.debug_mode:
             print("ending resize")
 
-class MoveWidget:
-    def __init__(self, hwnd, position, size, manager: ResizeWidgetManager, debug_mode=False):
-        self.hwnd = hwnd
-        self.size = size
-        self.debug_mode = debug_mode
-        self.manager = manager
-        
-        self.window = Toplevel()
-        self.window.overrideredirect(True)
-        self.window.attributes('-topmost', True)
-        self.window.geometry(f"{size}x{size}+{position[0]}+{position[1]}")
-        self.window.configure(bg='#4b6eaf')  # Use a distinct color
-        
-        # Create tooltip window
-        self.tooltip = Toplevel()
-        self.tooltip.withdraw()  # Hide initially
-        self.tooltip.overrideredirect(True)
-        self.tooltip.attributes('-topmost', True)
-        self.tooltip.configure(bg='#2b2b2b')
-        self.tooltip_label = Label(self.tooltip, bg='#2b2b2b', fg='white',
-                                 text="Click and drag to move window",
-                                 font=('Arial', 8), padx=5, pady=3)
-        self.tooltip_label.pack()
-        
-        # Bind mouse events
-        self.window.bind('<Button-1>', self.start_move)
-        self.window.bind('<B1-Motion>', self.do_move)
-        self.window.bind('<ButtonRelease-1>', self.end_move)
-        self.window.bind('<Enter>', self.show_tooltip)
-        self.window.bind('<Leave>', self.hide_tooltip)
-        self.window.bind('<Motion>', self.update_tooltip_position)
-        
+class MoveWidget(OverlayControl):
+    color = '#4b6eaf'  # Use a distinct color
+
+    def __init__(self, widget_set):
+        super().__init__(widget_set)
         self.start_x = None
         self.start_y = None
         self.start_rect = None
+        self.pipeline = FramePacedDrag(self.canvas, self.apply_move, debug_mode=self.debug_mode)
 
-    def show_tooltip(self, event):
-        """Show the tooltip"""
-        if self.tooltip.state() == 'withdrawn':
-            self.update_tooltip_position(event)
-            self.tooltip.deiconify()
+    def tooltip_text(self):
+        return "Click and drag to move window"
 
-    def hide_tooltip(self, event):
-        """Hide the tooltip"""
-        self.tooltip.withdraw()
-
-    def update_tooltip_position(self, event):
-        """Update tooltip position near the widget"""
-        x = self.window.winfo_rootx() + self.size + 5
-        y = self.window.winfo_rooty()
-        self.tooltip.geometry(f"+{x}+{y}")
-
-    def exists(self):
-        """Check if widget window still exists"""
-        return self.window.winfo_exists()
+    def press(self, event):
+        self.start_move(event)
 
-    def update_position(self, x, y):
-        """Update widget position"""
-        self.window.geometry(f"{self.size}x{self.size}+{x}+{y}")
+    def drag(self, event):
+        self.do_move(event)
 
-    def destroy(self):
-        """Destroy the widget window"""
-        if self.exists():
-            self.tooltip.destroy()
-            self.window.destroy()
+    def release(self, event):
+        self.end_move(event)
 
     def start_move(self, event):
         """Start window move operation"""
@@ -1020,29 +921,28 @@ class MoveWidget:
         if self.debug_mode:
             print(f"Starting move from ({self.start_x}, {self.start_y})")
 
+    def apply_move(self, new_rect):
+        """Move the window to new_rect (same size) and move the overlay along"""
+        x, y, right, bottom = new_rect
+        win32gui.SetWindowPos(self.hwnd, 0,
+                            x, y, right - x, bottom - y,
+                            win32con.SWP_NOSIZE | win32con.SWP_NOZORDER)
+        self.widget_set.move_to(new_rect)
+
     def do_move(self, event):
         """Handle window move operation"""
-        try:
-            if self.start_x is None:
-                return
+        if self.start_x is None:
+            return
 
-            dx = event.x_root - self.start_x
-            dy = event.y_root - self.start_y
-            x, y, right, bottom = self.start_rect
-            width = right - x
-            height = bottom - y
-            
-            # Move window to new position
-            win32gui.SetWindowPos(self.hwnd, 0,
-                                x + dx, y + dy, width, height,
-                                win32con.SWP_NOSIZE | win32con.SWP_NOZORDER)
-            
-            if self.debug_mode:
-                print(f"Moving window by ({dx}, {dy})")
-                
-        except Exception as e:
-            if self.debug_mode:
-                print(f"Error moving window: {e}")
+        dx = event.x_root - self.start_x
+        dy = event.y_root - self.start_y
+        x, y, right, bottom = self.start_rect
+        
+        # Only the latest target is kept; it is applied on the next frame
+        self.pipeline.submit((x + dx, y + dy, right + dx, bottom + dy))
 
     def end_move(self, event):
-        self.manager.is_resizing = False
\ No newline at end of file
+        self.pipeline.finish("Move")
+        self.manager.is_resizing = False
+        self.start_x = None
+        self.start_y = None
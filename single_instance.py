@@ -0,0 +1,312 @@
+import errno
+import hashlib
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+COMMANDS = ("show", "toggle_lock", "reload")
+COMMAND_FLAGS = {
+    "--show": "show",
+    "--toggle-lock": "toggle_lock",
+    "--reload-config": "reload",
+}
+POLL_MS = 250
+REPLY_TIMEOUT = 2.0  # Seconds to wait for the running instance to acknowledge
+MAX_COMMAND = 64
+ACCEPT_RETRY_MIN = 0.05  # Seconds between failed accepts, doubling up to ACCEPT_RETRY_MAX
+ACCEPT_RETRY_MAX = 1.0
+
+# Named pipe constants (winbase.h / winerror.h) that pywin32 does not export
+FILE_FLAG_FIRST_PIPE_INSTANCE = 0x00080000
+PIPE_REJECT_REMOTE_CLIENTS = 0x00000008
+ERROR_PIPE_CONNECTED = 535
+
+
+def command_from_args(argv):
+    """Return the command asked for on the command line; a plain launch means "show" """
+    for arg in argv:
+        if arg in COMMAND_FLAGS:
+            return COMMAND_FLAGS[arg]
+    return "show"
+
+
+def default_address(name="AppMuter"):
+    """Return (address, family) of the per-user channel for this install"""
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or "user"
+    install = os.path.dirname(os.path.abspath(__file__))
+    tag = hashlib.sha1(f"{user}|{install}".encode()).hexdigest()[:12]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{name}-{tag}", "AF_PIPE"
+    return os.path.join(tempfile.gettempdir(), f"{name}-{tag}.sock"), "AF_UNIX"
+
+
+class SecurePipeListener:
+    """Named pipe server that the same user can reach from an unelevated process
+
+    multiprocessing's pipe listener uses the default DACL, which only lets
+    administrators write to a pipe an elevated process created. This pipe
+    grants the current user (and SYSTEM) access with a medium integrity
+    label, and it owns the name exclusively through its first instance.
+    Clients are plain multiprocessing.connection.Client(address, "AF_PIPE")
+    connections in message mode.
+    """
+
+    def __init__(self, address):
+        import pywintypes
+        import win32api
+        import win32file
+        import win32pipe
+        import win32security
+        self.pywintypes = pywintypes
+        self.win32file = win32file
+        self.win32pipe = win32pipe
+
+        token = win32security.OpenProcessToken(win32api.GetCurrentProcess(), win32security.TOKEN_QUERY)
+        user_sid = win32security.ConvertSidToStringSid(win32security.GetTokenInformation(token, win32security.TokenUser)[0])
+        attributes = win32security.SECURITY_ATTRIBUTES()
+        attributes.SECURITY_DESCRIPTOR = win32security.ConvertStringSecurityDescriptorToSecurityDescriptor(
+            f"D:P(A;;GA;;;{user_sid})(A;;GA;;;SY)S:(ML;;NW;;;ME)", win32security.SDDL_REVISION_1)
+        try:
+            self.handle = win32pipe.CreateNamedPipe(
+                address,
+                win32pipe.PIPE_ACCESS_DUPLEX | FILE_FLAG_FIRST_PIPE_INSTANCE,
+                win32pipe.PIPE_TYPE_MESSAGE | win32pipe.PIPE_READMODE_MESSAGE | win32pipe.PIPE_WAIT
+                | PIPE_REJECT_REMOTE_CLIENTS,
+                1, MAX_COMMAND, MAX_COMMAND, 0, attributes)
+        except pywintypes.error as e:
+            raise PermissionError(e.winerror, e.strerror)  # Another instance owns the name
+
+    def accept(self):
+        """Wait for the next client; the single pipe instance is reused for each"""
+        try:
+            self.win32pipe.ConnectNamedPipe(self.handle, None)
+        except self.pywintypes.error as e:
+            if e.winerror != ERROR_PIPE_CONNECTED:  # Client connected before we waited
+                # E.g. ERROR_NO_DATA when the client already left; until the instance is
+                # disconnected every later ConnectNamedPipe fails the same way
+                self.disconnect()
+                raise OSError(e.winerror, e.strerror)
+        return _PipeServerConnection(self)
+
+    def disconnect(self):
+        try:
+            self.win32pipe.DisconnectNamedPipe(self.handle)
+        except self.pywintypes.error:
+            pass
+
+    def close(self):
+        self.handle.Close()
+
+
+class _PipeServerConnection:
+    """The connected end of a SecurePipeListener, with the Connection methods _serve() uses"""
+
+    def __init__(self, listener):
+        self.listener = listener
+        self.handle = listener.handle
+
+    def poll(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                available = self.listener.win32pipe.PeekNamedPipe(self.handle, 0)[1]
+            except self.listener.pywintypes.error:
+                raise EOFError
+            if available:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def recv_bytes(self, maxlength):
+        try:
+            return bytes(self.listener.win32file.ReadFile(self.handle, maxlength)[1])
+        except self.listener.pywintypes.error as e:
+            raise OSError(e.winerror, e.strerror)
+
+    def send_bytes(self, data):
+        try:
+            self.listener.win32file.WriteFile(self.handle, data)
+            self.listener.win32file.FlushFileBuffers(self.handle)
+        except self.listener.pywintypes.error as e:
+            raise OSError(e.winerror, e.strerror)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.listener.disconnect()
+
+
+class InstanceChannel:
+    """Single-instance lock and command channel over a named pipe (a Unix socket elsewhere)
+
+    listen() both takes the lock and opens the channel: the listener owns
+    the pipe's first instance, so a second listen() on the same address
+    fails while the first instance runs. On Windows the pipe is a
+    SecurePipeListener, so an unelevated launch can reach an elevated
+    instance without a UAC prompt. send() hands a command to that
+    instance. Commands travel as raw bytes from a fixed set (nothing is
+    unpickled); an accept thread queues them and poll() drains the queue
+    on the Tk thread.
+    """
+
+    def __init__(self, address=None, family=None, debug_mode=False):
+        if address is None:
+            address, family = default_address()
+        self.address = address
+        self.family = family
+        self.debug_mode = debug_mode
+        self.listener = None
+        self.thread = None
+        self.commands = queue.SimpleQueue()
+        self.closed = False
+
+    def send(self, command, timeout=REPLY_TIMEOUT):
+        """Hand a command to the running instance; False if none took it"""
+        from multiprocessing.connection import Client
+        try:
+            conn = Client(self.address, family=self.family)
+        except OSError as e:
+            if self.debug_mode and not isinstance(e, (FileNotFoundError, ConnectionRefusedError)):
+                print(f"Could not reach the running instance: {e}")
+            return False
+        try:
+            with conn:
+                conn.send_bytes(command.encode("ascii"))
+                return conn.poll(timeout) and conn.recv_bytes(MAX_COMMAND) == b"ok"
+        except (OSError, EOFError) as e:
+            if self.debug_mode:
+                print(f"Error sending {command} to the running instance: {e}")
+            return False
+
+    def listen(self):
+        """Become the running instance; False if another instance already is"""
+        try:
+            self.listener = self._create_listener()
+        except OSError as e:
+            if not self._remove_stale_socket(e):
+                return False
+            self.listener = self._create_listener()
+        self.thread = threading.Thread(target=self._serve, args=(self.listener,), daemon=True,
+                                       name="InstanceChannel")
+        self.thread.start()
+        return True
+
+    def _create_listener(self):
+        if self.family == "AF_PIPE":
+            return SecurePipeListener(self.address)
+        from multiprocessing.connection import Listener
+        return Listener(self.address, family=self.family)
+
+    def _remove_stale_socket(self, error):
+        """A Unix socket file outlives a crashed owner; remove it if nothing answers there"""
+        if self.family != "AF_UNIX" or error.errno != errno.EADDRINUSE:
+            return False
+        import socket
+        probe = socket.socket(socket.AF_UNIX)
+        try:
+            probe.connect(self.address)
+            return False  # Someone is listening
+        except ConnectionRefusedError:
+            os.remove(self.address)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _serve(self, listener):
+        # Uses its own reference, close() may clear self.listener at any point
+        retry = ACCEPT_RETRY_MIN
+        while not self.closed:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError) as e:
+                # A client gave up mid-connect, or we are closing; back off in case it keeps failing
+                if self.closed:
+                    break
+                if self.debug_mode:
+                    print(f"Error accepting an instance command: {e}")
+                time.sleep(retry)
+                retry = min(retry * 2, ACCEPT_RETRY_MAX)
+                continue
+            retry = ACCEPT_RETRY_MIN
+            try:
+                with conn:
+                    if not conn.poll(REPLY_TIMEOUT):
+                        continue
+                    command = conn.recv_bytes(MAX_COMMAND).decode("ascii", "replace")
+                    if command in COMMANDS:
+                        self.commands.put(command)
+                        conn.send_bytes(b"ok")
+                    else:
+                        conn.send_bytes(b"unknown")
+            except EOFError:
+                continue  # Closed without a command, e.g. another launch checking for a stale socket
+            except OSError as e:
+                if self.debug_mode:
+                    print(f"Error reading an instance command: {e}")
+
+    def poll(self):
+        """Return the commands received since the last call"""
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def close(self):
+        self.closed = True
+        if self.listener is not None:
+            # The accept thread may be blocked waiting for a client; connect once so it
+            # returns and sees closed, instead of closing the handle under its wait
+            self._wake_serve_thread()
+            if self.thread is not None:
+                self.thread.join(REPLY_TIMEOUT)
+            try:
+                self.listener.close()
+            except OSError:
+                pass
+            self.listener = None
+
+    def _wake_serve_thread(self):
+        from multiprocessing.connection import Client
+        try:
+            Client(self.address, family=self.family).close()
+        except OSError:
+            pass
+
+
+class SimulatedInstanceChannel:
+    """Stand-in for InstanceChannel; channels sharing a registry dict see each other"""
+
+    def __init__(self, registry, address="AppMuter"):
+        self.registry = registry  # address -> listening channel
+        self.address = address
+        self.received = []
+
+    def send(self, command, timeout=REPLY_TIMEOUT):
+        owner = self.registry.get(self.address)
+        if owner is None or command not in COMMANDS:
+            return False
+        owner.received.append(command)
+        return True
+
+    def listen(self):
+        if self.registry.get(self.address, self) is not self:
+            return False
+        self.registry[self.address] = self
+        return True
+
+    def poll(self):
+        commands, self.received = self.received, []
+        return commands
+
+    def close(self):
+        if self.registry.get(self.address) is self:
+            del self.registry[self.address]
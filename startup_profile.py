@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+
+# app_muter.py imports this first, so anything heavier is imported where it is used
+
+PROFILE_ENV = "APP_MUTER_PROFILE"  # "1" prints the profile; "exit" also quits after the first mute tick
+REPORT_PREFIX = "STARTUP "
+
+# Default budgets in milliseconds, checked by the benchmark below. Tight enough that pulling
+# pycaw/comtypes or PIL back into the module imports goes over
+BUDGETS = {
+    "imports": 400,
+    "first_mute_tick": 1200,
+}
+
+
+class StartupProfile:
+    """Milestones from the first line of app_muter.py to the first mute tick"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock()
+        self.marks = {}  # name -> milliseconds since start, in order
+
+    def mark(self, name):
+        """Record a milestone the first time it is reached"""
+        if name not in self.marks:
+            self.marks[name] = (self.clock() - self.start) * 1000
+
+    def report(self):
+        previous = 0
+        lines = ["Startup profile:"]
+        for name, elapsed in self.marks.items():
+            lines.append(f"  {name:<16} {elapsed:8.1f} ms  (+{elapsed - previous:.1f})")
+            previous = elapsed
+        return "\n".join(lines)
+
+    def over_budget(self, budgets):
+        """Return (name, elapsed, budget) for every milestone over its budget, or missing"""
+        return [(name, self.marks.get(name), budget) for name, budget in budgets.items()
+                if self.marks.get(name) is None or self.marks[name] > budget]
+
+    def emit(self):
+        """Print the machine-readable line the benchmark parses"""
+        import json
+        print(REPORT_PREFIX + json.dumps(self.marks), flush=True)
+
+
+def profile_mode():
+    return os.environ.get(PROFILE_ENV, "")
+
+
+def run_once(script, timeout):
+    """Start app_muter.py in profile mode and return its milestones"""
+    import json
+    import subprocess
+    env = dict(os.environ, **{PROFILE_ENV: "exit"})
+    result = subprocess.run([sys.executable, script], env=env, capture_output=True, text=True,
+                            timeout=timeout)
+    for line in result.stdout.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            return json.loads(line[len(REPORT_PREFIX):])
+    raise RuntimeError(f"no startup profile in output (exit code {result.returncode}):\n"
+                       f"{result.stdout[-2000:]}{result.stderr[-2000:]}")
+
+
+def slowest_imports(module, count):
+    """Top imports by cumulative time, from python -X importtime"""
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # Header line
+        rows.append((int(fields[1]), fields[2].strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main(argv):
+    """Benchmark startup against the time budgets; exits non-zero when over budget"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure App Muter startup against a time budget")
+    parser.add_argument("--runs", type=int, default=3, help="number of launches (the best one counts)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for each launch")
+    for name, budget in BUDGETS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=budget, dest=name,
+                            help=f"budget for {name} in ms (default {budget})")
+    parser.add_argument("--imports-detail", type=int, default=0, metavar="N",
+                        help="also list the N slowest imports of app_muter")
+    args = parser.parse_args(argv)
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_muter.py")
+    budgets = {name: getattr(args, name) for name in BUDGETS}
+
+    best = None
+    for run in range(args.runs):
+        marks = run_once(script, args.timeout)
+        print(f"Run {run + 1}: " + ", ".join(f"{name} {elapsed:.0f} ms" for name, elapsed in marks.items()))
+        if best is None or marks.get("first_mute_tick", float("inf")) < best.get("first_mute_tick", float("inf")):
+            best = marks
+
+    profile = StartupProfile()
+    profile.marks = best
+    print(profile.report())
+
+    if args.imports_detail:
+        print("Slowest imports:")
+        for cumulative_us, name in slowest_imports("app_muter", args.imports_detail):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = profile.over_budget(budgets)
+    for name, elapsed, budget in failures:
+        if elapsed is None:
+            print(f"FAIL {name}: never reached")
+        else:
+            print(f"FAIL {name}: {elapsed:.0f} ms is over the {budget:.0f} ms budget")
+    if not failures:
+        print("Startup is within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
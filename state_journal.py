@@ -0,0 +1,84 @@
+import json
+import os
+
+
+class StateJournal:
+    """Append-only log of section updates kept next to a TOML file
+
+    Each line is one JSON record {"section": name, "value": ...} (or
+    "deleted": true). Replaying the log on top of the TOML file's contents
+    recovers changes that were not compacted yet. A torn last line from a
+    hard kill mid-append is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self.size = os.path.getsize(path)
+        except OSError:
+            self.size = 0
+        self.records = 0
+
+    def append(self, changes, deleted=None):
+        """Append one record per changed section and force it to disk"""
+        lines = []
+        for section, value in changes.items():
+            if value is deleted:
+                lines.append(json.dumps({"section": section, "deleted": True}))
+            else:
+                lines.append(json.dumps({"section": section, "value": value}, separators=(",", ":")))
+        text = "\n".join(lines) + "\n"
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(text.encode("utf-8"))
+        self.records += len(lines)
+
+    def replay(self, data):
+        """Apply logged records to data in place and return how many were applied"""
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.readlines()
+        except OSError:
+            return 0
+
+        applied = 0
+        good_size = 0
+        for line in lines:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("record was cut short")
+                record = json.loads(line)
+                section = record["section"]
+            except (ValueError, KeyError, TypeError):
+                break  # Torn write at the tail, nothing after it is trustworthy
+            if record.get("deleted"):
+                data.pop(section, None)
+            else:
+                data[section] = record["value"]
+            applied += 1
+            good_size += len(line)
+        self.records = applied
+
+        # Cut off a torn tail, or the next append would continue its line and be lost with it
+        if good_size < sum(len(line) for line in lines):
+            try:
+                with open(self.path, "r+b") as f:
+                    f.truncate(good_size)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Error truncating {os.path.basename(self.path)}: {e}")
+        self.size = good_size
+        return applied
+
+    def reset(self):
+        """Empty the journal once its records are part of the TOML file"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.size = 0
+        self.records = 0
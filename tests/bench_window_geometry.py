@@ -0,0 +1,60 @@
+"""Compare cached target rects with recomputing them for every window
+
+Run from the repo root: python -m tests.bench_window_geometry [windows] [repeats]
+"""
+import random
+import sys
+import time
+
+from window_geometry import DisplayTopology, GeometryCache, compile_size_spec, fit_size, place
+
+PRESETS = [{"width": "fit_16_9", "height": "fit_16_9"}, {"width": "fit_21_9", "height": "fit_21_9"},
+           {"width": 1920, "height": 1080}, {"width": 1280, "height": 720}]
+PLACEMENTS = ["center", "top", "bottom_right", "no_change"]
+TOPOLOGY = DisplayTopology({1: (0, 0, 2560, 1400), 2: (2560, 0, 4480, 1040)})
+
+
+def recompute(monitor, dpi, spec, placement):
+    left, top, right, bottom = TOPOLOGY.work_area(monitor)
+    if spec[0] == "fit":
+        width, height = fit_size(right - left, bottom - top, spec[1], dpi)
+    else:
+        width, height = spec[1], spec[2]
+    x, y = place(placement, right - left, bottom - top, width, height)
+    return x, y, width, height
+
+
+def best_of(repeats, func, lookups):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for lookup in lookups:
+            func(*lookup)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    windows = int(argv[0]) if argv else 5000
+    repeats = int(argv[1]) if len(argv) > 1 else 20
+    rng = random.Random(0)
+    specs = [compile_size_spec(preset) for preset in PRESETS]
+    lookups = [(rng.choice([1, 2]), rng.choice([96, 144]), rng.choice(specs), rng.choice(PLACEMENTS))
+               for _ in range(windows)]
+
+    cache = GeometryCache()
+    cache.update_topology(TOPOLOGY)
+    for lookup in lookups:
+        assert cache.target_rect(*lookup) == recompute(*lookup)
+
+    cached = best_of(repeats, cache.target_rect, lookups)
+    recomputed = best_of(repeats, recompute, lookups)
+    print(f"{windows} lookups, best of {repeats}:")
+    print(f"  cache hits: {cached * 1000:.2f}ms ({cached / windows * 1e9:.0f}ns per window)")
+    print(f"  recompute:  {recomputed * 1000:.2f}ms ({recomputed / windows * 1e9:.0f}ns per window)")
+    print(f"  {recomputed / cached:.1f}x faster from the cache, {len(cache._rects)} cached rects")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,27 @@
+import pytest
+
+
+class ManualScheduler:
+    """Just enough of Tk's after() for tests; callbacks run when run_pending() is called"""
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+
+@pytest.fixture
+def scheduler():
+    return ManualScheduler()
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+toml = pytest.importorskip("toml")
+
+from config_store import ConfigStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = os.path.join(tmp_path, "config.toml")
+    with open(path, "w") as f:
+        toml.dump({"A": {"x": 1}, "B": {"y": 1}}, f)
+    return path
+
+
+@pytest.fixture
+def store(path):
+    with open(path) as f:
+        data = toml.load(f)
+    # Long delays, so nothing is journaled or compacted behind the test's back
+    store = ConfigStore(path, data, debounce=60, max_delay=60, compact_interval=3600)
+    yield store
+    store.close()
+
+
+def external_edit(path, data):
+    with open(path, "w") as f:
+        toml.dump(data, f)
+    with open(path) as f:
+        return toml.load(f)
+
+
+def test_reload_keeps_journaled_changes(path, store):
+    store.data["A"]["x"] = 2
+    store.mark_dirty("A")
+    store.flush()
+    assert store.journal.records == 1
+
+    edited = external_edit(path, {"A": {"x": 1}, "B": {"y": 5}})
+    assert store.reload(edited) == ["A"]
+
+    assert edited == {"A": {"x": 2}, "B": {"y": 5}}
+    with open(path) as f:
+        assert toml.load(f) == edited
+    assert store.journal.records == 0
+    assert not os.path.exists(store.journal.path)
+
+
+def test_reload_keeps_queued_changes(path, store):
+    store.data["A"]["x"] = 3
+    store.mark_dirty("A")
+
+    edited = external_edit(path, {"A": {"x": 1}, "B": {"y": 5}})
+    assert store.reload(edited) == ["A"]
+    assert edited == {"A": {"x": 3}, "B": {"y": 5}}
+    assert store.matches(edited)
+
+
+def test_reload_without_unsaved_changes(path, store):
+    edited = external_edit(path, {"A": {"x": 1}, "B": {"y": 5}})
+    assert store.reload(edited) == []
+    assert edited == {"A": {"x": 1}, "B": {"y": 5}}
+    assert store.matches(edited)
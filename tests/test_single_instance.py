@@ -0,0 +1,90 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from single_instance import InstanceChannel, SimulatedInstanceChannel, command_from_args
+
+
+@pytest.fixture
+def registry():
+    return {}
+
+
+@pytest.fixture
+def running(registry):
+    channel = SimulatedInstanceChannel(registry)
+    assert channel.listen()
+    return channel
+
+
+def test_second_launch_cannot_listen(registry, running):
+    assert not SimulatedInstanceChannel(registry).listen()
+
+
+def test_second_launch_hands_its_command_over(registry, running):
+    second = SimulatedInstanceChannel(registry)
+
+    assert second.send(command_from_args(["--reload-config"]))
+    assert running.poll() == ["reload"]
+    assert running.poll() == []
+
+
+def test_unknown_command_is_refused(registry, running):
+    assert not SimulatedInstanceChannel(registry).send("exit")
+    assert running.poll() == []
+
+
+def test_address_is_free_after_close(registry, running):
+    second = SimulatedInstanceChannel(registry)
+    running.close()
+
+    assert not second.send("show")
+    assert second.listen()
+
+
+def test_plain_launch_means_show():
+    assert command_from_args([]) == "show"
+    assert command_from_args(["--toggle-lock"]) == "toggle_lock"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a Unix socket address")
+def test_unix_socket_round_trip(tmp_path):
+    address = str(tmp_path / "channel.sock")
+    running = InstanceChannel(address, "AF_UNIX")
+    assert running.listen()
+    try:
+        assert not InstanceChannel(address, "AF_UNIX").listen()
+        assert InstanceChannel(address, "AF_UNIX").send("toggle_lock")
+        assert running.poll() == ["toggle_lock"]
+    finally:
+        running.close()
+    assert not running.thread.is_alive()  # close() woke the thread blocked in accept()
+
+
+class FailingListener:
+    """Listener whose accept() keeps failing, like a pipe instance that was never disconnected"""
+
+    def __init__(self):
+        self.accepts = 0
+
+    def accept(self):
+        self.accepts += 1
+        raise OSError(232, "The pipe is being closed")
+
+    def close(self):
+        pass
+
+
+def test_failing_accept_backs_off():
+    channel = InstanceChannel("unused", "AF_UNIX")
+    listener = FailingListener()
+    thread = threading.Thread(target=channel._serve, args=(listener,), daemon=True)
+    thread.start()
+    time.sleep(0.5)
+    channel.closed = True
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert listener.accepts <= 6  # 0.05 + 0.1 + 0.2 + 0.4 s of back-off, not a busy loop
@@ -0,0 +1,129 @@
+import gc
+import tracemalloc
+
+import pytest
+
+tkinter = pytest.importorskip("tkinter")
+
+from volume_rows import AppRow, AppRowModel, VirtualAppList
+
+CYCLES = 2000
+WARMUP = 50
+MEMORY_SLACK = 256 * 1024  # Bytes; one leaked row per cycle would be several MB
+
+
+class FakeAppState:
+    """Just the app state an AppRow reads"""
+
+    theme = {'bg': '#2b2b2b', 'fg': '#ffffff', 'button': '#3c3f41', 'active': '#4b6eaf'}
+    RESOLUTION_PRESETS = {"1080p": {"width": 1920, "height": 1080}}
+    WINDOW_PLACEMENTS = {"Center": "center"}
+    BORDER_STYLES = {"No Change": "no_change"}
+
+    def __init__(self):
+        self.force_muted_apps = set()
+        self.pid_match_apps = []
+        self.hide_titlebar_apps = []
+        self.maximize_apps = []
+        self.custom_resolution_apps = {}
+        self.always_on_top_apps = []
+        self.resize_widget_apps = []
+        self.auto_restore_positions = []
+        self.startup_delays = {}
+        self.window_placements = {}
+        self.border_styles = {}
+
+    def get_app_volume(self, app_name):
+        return 100
+
+
+class FakeOwner:
+    def __init__(self):
+        self.app_state = FakeAppState()
+
+
+@pytest.fixture(scope="module")
+def root():
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def owner():
+    return FakeOwner()
+
+
+@pytest.fixture
+def models(owner):
+    return [AppRowModel(f"app{i}.exe").load(owner.app_state) for i in range(20)]
+
+
+def tcl_counts(root):
+    return {name: len(root.tk.splitlist(root.tk.call(*command)))
+            for name, command in (("vars", ("info", "vars")),
+                                  ("commands", ("info", "commands")),
+                                  ("after", ("after", "info")))}
+
+
+def assert_flat(root, churn):
+    """Run churn() many times and check that neither Tcl nor Python memory grows"""
+    for _ in range(WARMUP):  # Tk and tkinter create some state on first use
+        churn()
+    root.update()
+    gc.collect()
+    before = tcl_counts(root)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for _ in range(CYCLES):
+            churn()
+        root.update()
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert tcl_counts(root) == before
+    assert growth < MEMORY_SLACK, f"{growth} bytes retained after {CYCLES} cycles"
+
+
+def test_row_create_bind_dispose_is_flat(root, owner, models):
+    def churn():
+        container = tkinter.Frame(root)
+        row = AppRow(container, owner)
+        row.bind(models[0])
+        row.bind(models[1])
+        row.dispose()
+        container.destroy()
+
+    assert_flat(root, churn)
+
+
+def test_list_build_dispose_is_flat(root, owner, models):
+    def churn():
+        container = tkinter.Frame(root)
+        app_list = VirtualAppList(container, owner)
+        app_list.set_models(models)
+        root.update()  # Runs the idle refresh that fills the pool
+        app_list.set_models(models[5:])  # Left pending, dispose() must cancel it
+        app_list.dispose()
+        container.destroy()
+
+    assert_flat(root, churn)
+
+
+def test_dispose_unsets_row_variables(root, owner, models):
+    container = tkinter.Frame(root)
+    row = AppRow(container, owner)
+    row.bind(models[0])
+    names = [str(var) for var in row.variables]
+    row.dispose()
+    container.destroy()
+
+    assert not any(root.tk.call("info", "exists", name) for name in names)
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from warm_start import SimulatedProcessProbe, WarmStart, decode_snapshot, encode_snapshot
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(tmp_path, "warm_start.bin")
+
+
+@pytest.fixture
+def saved(path):
+    probe = SimulatedProcessProbe({100: 1.0, 200: 2.0, 300: 3.0}, {10: 100, 11: 100, 20: 200, 30: 300})
+    processes = [(100, "a.exe", 1.0, True), (200, "b.exe", 2.0, False), (300, "c.exe", 3.0, False)]
+    exe_names = {100: "a.exe", 200: "b.exe", 400: "gone.exe"}
+    audio = {100: (True, 80), 200: (False, 100)}
+    assert WarmStart(path, probe).save(processes, [10, 11, 20, 30], foreground_pid=200, zero_cnt=3,
+                                       exe_names=exe_names, audio=audio)
+    return path
+
+
+def test_unchanged_processes_are_kept(saved):
+    probe = SimulatedProcessProbe({100: 1.0, 200: 2.0, 300: 3.0}, {10: 100, 11: 100, 20: 200, 30: 300})
+    state = WarmStart(saved, probe).load()
+
+    assert state["processes"] == [(100, 1.0, "a.exe", 1.0, True), (200, 2.0, "b.exe", 2.0, False),
+                                  (300, 3.0, "c.exe", 3.0, False)]
+    assert state["windows"] == [(10, 100), (11, 100), (20, 200), (30, 300)]
+    assert state["foreground_pid"] == 200
+    assert state["zero_cnt"] == 3
+    assert state["exe_names"] == {100: "a.exe", 200: "b.exe"}  # 400 had already exited when saved
+    assert state["audio"] == {100: (True, 80), 200: (False, 100)}
+
+
+def test_reused_pid_and_hwnd_are_dropped(saved):
+    # After the restart pid 200 belongs to a new process, 300 is gone and hwnd 11 was reused
+    probe = SimulatedProcessProbe({100: 1.0, 200: 9.0}, {10: 100, 11: 500, 20: 200})
+    state = WarmStart(saved, probe).load()
+
+    assert state["processes"] == [(100, 1.0, "a.exe", 1.0, True)]
+    assert state["windows"] == [(10, 100)]
+    assert state["foreground_pid"] is None
+    assert state["exe_names"] == {100: "a.exe"}
+    assert state["audio"] == {100: (True, 80)}
+
+
+def test_corrupt_snapshot_is_ignored(saved):
+    with open(saved, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert WarmStart(saved, SimulatedProcessProbe()).load() is None
+
+
+def test_torn_or_foreign_snapshot_is_rejected():
+    data = encode_snapshot({"zero_cnt": 1})
+    assert decode_snapshot(data) == {"zero_cnt": 1}
+    assert decode_snapshot(data[:-1]) is None
+    assert decode_snapshot(b"XXXX" + data[4:]) is None
+    assert decode_snapshot(b"") is None
+
+
+def test_missing_snapshot(path):
+    assert WarmStart(path, SimulatedProcessProbe()).load() is None
@@ -0,0 +1,81 @@
+import pytest
+
+from window_events import SimulatedWindowEvents, WindowTracker
+
+
+@pytest.fixture
+def events():
+    return SimulatedWindowEvents()
+
+
+@pytest.fixture
+def tracker(scheduler, events):
+    reported = []
+    tracker = WindowTracker(scheduler, events, reported.append, is_active=lambda: tracker.active)
+    tracker.active = True
+    tracker.reported = reported
+    tracker.watch(1)
+    tracker.watch(2)
+    return tracker
+
+
+def test_burst_of_moves_is_one_frame(scheduler, events, tracker):
+    for _ in range(100):
+        events.move(1)
+        events.move(2)
+        events.move(3)  # Not watched
+
+    assert len(scheduler.pending) == 1
+    scheduler.run_pending()
+    assert sorted(tracker.reported) == [1, 2]
+    assert tracker.frames == 1
+    assert tracker.events == 200
+
+
+def test_changed_reports_moves_once(events, tracker):
+    events.changed()
+    events.move(1)
+    assert events.changed()
+    assert not events.changed()
+
+
+def test_inactive_moves_wait_for_flush(scheduler, events, tracker):
+    tracker.active = False
+    events.move(1)
+
+    assert not scheduler.pending
+    assert tracker.reported == []
+    tracker.flush()
+    assert tracker.reported == [1]
+
+
+def test_unwatched_window_drops_pending_move(scheduler, events, tracker):
+    events.move(1)
+    tracker.unwatch(1)
+    scheduler.run_pending()
+    assert tracker.reported == []
+
+
+def test_location_hooks_follow_watched_processes(scheduler):
+    events = SimulatedWindowEvents({1: 100, 2: 100, 3: 200})
+    tracker = WindowTracker(scheduler, events, lambda hwnd: None)
+
+    tracker.watch(1)
+    tracker.watch(2)
+    tracker.watch(3)
+    assert events.location_hooks == {100: 2, 200: 1}
+
+    tracker.unwatch(1)
+    tracker.unwatch(3)
+    assert events.location_hooks == {100: 1}
+
+    tracker.stop()
+    assert events.location_hooks == {}
+
+
+def test_unhooked_process_moves_are_not_delivered(scheduler, events, tracker):
+    events.changed()
+    events.move(3)
+
+    assert not events.changed()
+    assert tracker.events == 0
@@ -0,0 +1,94 @@
+import pytest
+
+from window_geometry import DisplayTopology, GeometryCache, compile_size_spec, fit_size, parse_fit_ratio, place
+
+
+@pytest.mark.parametrize("value, ratio", [
+    ("fit_16_9", 16 / 9),
+    ("fit_21_9", 21 / 9),
+    ("fit_19_5_9", 19.5 / 9),
+    (1920, None),
+    ("1920", None),
+])
+def test_parse_fit_ratio(value, ratio):
+    assert parse_fit_ratio(value) == ratio
+
+
+@pytest.mark.parametrize("value", ["fit_16", "fit_", "fit_a_9", "fit_16_0", "fit_0_9", "fit_-16_9",
+                                   "fit_inf_9", "fit_nan_9"])
+def test_parse_fit_ratio_rejects_invalid_ratios(value):
+    with pytest.raises(ValueError):
+        parse_fit_ratio(value)
+
+
+def test_compile_size_spec():
+    assert compile_size_spec({"width": "fit_16_9", "height": "fit_16_9"}) == ("fit", 16 / 9)
+    assert compile_size_spec({"width": 1280, "height": 720}) == ("fixed", 1280, 720)
+
+
+@pytest.mark.parametrize("work, dpi, size", [
+    ((1920, 1080), 96, (1920, 1080)),  # Exact fit
+    ((2560, 1400), 96, (2488, 1400)),  # Wider than 16:9, fit to height
+    ((1080, 1920), 96, (1080, 607)),  # Taller than 16:9, fit to width
+    ((2560, 1400), 144, (2487, 1399)),  # Rounded at the scaled size
+])
+def test_fit_size(work, dpi, size):
+    assert fit_size(*work, 16 / 9, dpi) == size
+
+
+@pytest.mark.parametrize("placement, position", [
+    ("center", (320, 180)),
+    ("top", (320, 0)),
+    ("bottom", (320, 360)),
+    ("left", (0, 180)),
+    ("right", (640, 180)),
+    ("top_left", (0, 0)),
+    ("top_right", (640, 0)),
+    ("bottom_left", (0, 360)),
+    ("bottom_right", (640, 360)),
+    ("no_change", (None, None)),
+    ("unknown", (None, None)),
+])
+def test_place(placement, position):
+    assert place(placement, 1920, 1080, 1280, 720) == position
+
+
+@pytest.fixture
+def cache():
+    cache = GeometryCache()
+    cache.update_topology(DisplayTopology({1: (0, 0, 1920, 1080), 2: (1920, 0, 4480, 1400)}))
+    return cache
+
+
+def test_cache_hits_for_repeated_lookups(cache):
+    spec = ("fit", 16 / 9)
+    assert cache.target_rect(2, 96, spec, "center") == (36, 0, 2488, 1400)
+    assert cache.target_rect(2, 96, spec, "center") == (36, 0, 2488, 1400)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fixed_sizes_share_an_entry_across_dpis(cache):
+    spec = ("fixed", 1280, 720)
+    cache.target_rect(1, 96, spec, "center")
+    cache.target_rect(1, 144, spec, "center")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unknown_monitor(cache):
+    assert cache.target_rect(3, 96, ("fixed", 1280, 720), "center") is None
+
+
+def test_same_topology_keeps_cached_rects(cache):
+    cache.target_rect(1, 96, ("fixed", 1280, 720), "center")
+    cache.update_topology(DisplayTopology({2: (1920, 0, 4480, 1400), 1: (0, 0, 1920, 1080)}))
+    cache.target_rect(1, 96, ("fixed", 1280, 720), "center")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_topology_change_invalidates_cached_rects(cache):
+    spec = ("fit", 16 / 9)
+    cache.target_rect(2, 96, spec, "center")
+    cache.update_topology(DisplayTopology({1: (0, 0, 1920, 1080), 2: (1920, 0, 3840, 1040)}))
+
+    assert cache.target_rect(2, 96, spec, "center") == (36, 0, 1848, 1040)
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -0,0 +1,77 @@
+import pytest
+
+from window_guard import HungWindowGuard, SimulatedHangProbe
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def probe():
+    return SimulatedHangProbe(hung={1})
+
+
+@pytest.fixture
+def guard(probe, clock):
+    return HungWindowGuard(probe, clock=clock, base_cooldown=5.0)
+
+
+def allow_at(guard, clock, at, hwnd=1):
+    clock.now = at
+    return guard.allow(hwnd)
+
+
+def test_hung_window_is_skipped_during_cooldown(guard, clock):
+    assert not allow_at(guard, clock, 0)
+    assert not allow_at(guard, clock, 4)
+    assert guard.metrics["trips"] == 1
+    assert guard.metrics["skipped"] == 1
+
+
+def test_cooldown_doubles_with_each_failure(guard, probe, clock):
+    allow_at(guard, clock, 0)
+    allow_at(guard, clock, 5)  # Still hung, 10s
+    assert guard.breakers[1] == [2, 15.0]
+
+    probe.hung.clear()
+    probe.unresponsive.add(1)
+    allow_at(guard, clock, 15)  # Half-open probe times out, 20s
+    assert guard.breakers[1] == [3, 35.0]
+    assert guard.metrics["timeouts"] == 1
+
+
+def test_half_open_probe_closes_breaker(guard, probe, clock):
+    allow_at(guard, clock, 0)
+    probe.hung.clear()
+
+    assert allow_at(guard, clock, 5)
+    assert 1 not in guard.breakers
+    assert guard.metrics["recovered"] == 1
+    assert allow_at(guard, clock, 6)
+
+
+def test_other_windows_are_not_affected(guard, clock):
+    allow_at(guard, clock, 0)
+    assert allow_at(guard, clock, 1, hwnd=2)
+
+
+def test_stats(guard, clock):
+    allow_at(guard, clock, 0)
+    allow_at(guard, clock, 1)
+    stats = guard.stats()
+
+    assert stats == {"checks": 2, "skipped": 1, "hung": 1, "timeouts": 0, "slow_calls": 0,
+                     "trips": 1, "recovered": 0, "open": 1}
+    stats["checks"] = 100
+    assert guard.metrics["checks"] == 2  # A copy, not the live counters
+    assert guard.report().endswith("open=1")
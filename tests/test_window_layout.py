@@ -0,0 +1,39 @@
+import pytest
+
+from window_layout import (HWND_TOP, HWND_TOPMOST, SWP_NOACTIVATE, SWP_NOMOVE, SWP_NOSIZE, SWP_NOZORDER,
+                           LayoutTransaction, SimulatedLayoutBackend)
+
+HWNDS = range(1, 6)
+
+
+@pytest.fixture
+def backend():
+    return SimulatedLayoutBackend({hwnd: (0, 0, 800, 600) for hwnd in HWNDS})
+
+
+def queue_layout(layout):
+    for hwnd in HWNDS:
+        # Rules queue the resize and the move separately; they merge per window
+        layout.set_window_pos(hwnd, HWND_TOP, 0, 0, 1280, 720, SWP_NOMOVE | SWP_NOZORDER | SWP_NOACTIVATE)
+        layout.set_window_pos(hwnd, HWND_TOP, hwnd * 100, 50, 0, 0, SWP_NOSIZE | SWP_NOZORDER | SWP_NOACTIVATE)
+    layout.set_window_pos(3, HWND_TOPMOST, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE)
+
+
+def test_five_window_layout_is_one_recomposition(backend):
+    layout = LayoutTransaction(backend)
+    queue_layout(layout)
+
+    assert layout.commit() == len(HWNDS)
+    assert backend.recompositions == 1
+    assert len(backend.batches[0]) == len(HWNDS)
+    assert backend.rects == {hwnd: (hwnd * 100, 50, hwnd * 100 + 1280, 770) for hwnd in HWNDS}
+    assert backend.topmost == {3}
+
+
+def test_empty_commit_does_not_reach_backend(backend):
+    layout = LayoutTransaction(backend)
+    queue_layout(layout)
+    layout.commit()
+
+    assert layout.commit() == 0
+    assert backend.recompositions == 1
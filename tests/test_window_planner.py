@@ -0,0 +1,70 @@
+import pytest
+
+from window_geometry import DisplayTopology
+from window_planner import SimulatedDesktop, WindowRulePlanner, diff_plans
+
+OLD_CONFIG = {
+    "HIDE_TITLEBAR_APPS": ["a.exe"],
+    "CUSTOM_RESOLUTION_APPS": {"b.exe": {"width": 1280, "height": 720}},
+    "ALWAYS_ON_TOP_APPS": ["c.exe"],
+}
+NEW_CONFIG = {
+    "HIDE_TITLEBAR_APPS": ["a.exe"],
+    "BORDER_STYLES": {"a.exe": "thin"},
+    "CUSTOM_RESOLUTION_APPS": {"b.exe": {"width": 1920, "height": 1080}},
+    "ALWAYS_ON_TOP_APPS": ["d.exe"],
+}
+
+
+@pytest.fixture
+def desktop():
+    desktop = SimulatedDesktop()
+    for name in ("a.exe", "b.exe", "c.exe", "d.exe", "unmanaged.exe"):
+        desktop.add_window(name, style=0x14CF0000, rect=(0, 0, 800, 600))
+    return desktop
+
+
+def plan(config, desktop):
+    return WindowRulePlanner.from_config(config).plan(desktop)
+
+
+def test_plan_names_the_rule_behind_each_action(desktop):
+    actions = [(action.process_name, action.kind, action.rule) for action in plan(OLD_CONFIG, desktop)]
+
+    assert actions == [
+        ("a.exe", "style", "HIDE_TITLEBAR_APPS"),
+        ("b.exe", "resize", "CUSTOM_RESOLUTION_APPS"),
+        ("b.exe", "move", "WINDOW_PLACEMENTS"),
+        ("c.exe", "topmost", "ALWAYS_ON_TOP_APPS"),
+    ]
+
+
+def test_diff_between_config_versions(desktop):
+    added, removed, changed = diff_plans(plan(OLD_CONFIG, desktop), plan(NEW_CONFIG, desktop))
+
+    assert [(action.process_name, action.kind) for action in added] == [("d.exe", "topmost")]
+    assert [(action.process_name, action.kind) for action in removed] == [("c.exe", "topmost")]
+    assert [(new.process_name, new.kind) for old, new in changed] == [
+        ("a.exe", "style"), ("b.exe", "resize"), ("b.exe", "move")]
+    values = {new.kind: new.value for old, new in changed}
+    assert values["resize"] == (1920, 1080)
+    assert values["move"] == (320, 160)
+
+
+def test_diff_of_identical_plans_is_empty(desktop):
+    actions = plan(NEW_CONFIG, desktop)
+    assert diff_plans(actions, actions) == ([], [], [])
+
+
+def test_dry_run_leaves_live_geometry_alone(desktop):
+    planner = WindowRulePlanner.from_config(OLD_CONFIG)
+    live = planner.geometry
+    live.update_topology(DisplayTopology({7: (0, 0, 1920, 1080)}))
+    live.target_rect(7, 96, ("fixed", 1280, 720), "center")
+
+    dry_run = planner.dry_run()
+    assert [action.kind for action in dry_run.plan(desktop)] == ["style", "resize", "move", "topmost"]
+    assert dry_run.custom_resolution_apps is planner.custom_resolution_apps
+    assert live.topology.work_areas == {7: (0, 0, 1920, 1080)}
+    live.target_rect(7, 96, ("fixed", 1280, 720), "center")
+    assert (live.hits, live.misses) == (1, 1)
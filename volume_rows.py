@@ -0,0 +1,462 @@
+import math
+from tkinter import Frame, Label, Checkbutton, Scale, OptionMenu, Entry, Button, Scrollbar, Canvas, IntVar, StringVar
+
+# Spare rows kept in the pool beyond what fits on screen
+POOL_SLACK = 2
+
+
+class AppRowModel:
+    """Plain per-app settings and status shown by one row of the volume window"""
+
+    __slots__ = ("app_name", "force_muted", "volume", "pid_match", "hide_titlebar", "maximize",
+                 "custom_resolution", "preset", "placement", "border", "startup_delay",
+                 "always_on_top", "resize_widgets", "auto_restore", "is_muted", "current_volume")
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.is_muted = None  # Unknown until the first status update
+        self.current_volume = None
+
+    def load(self, app_state):
+        """Read this app's settings from the app state"""
+        name = self.app_name
+        self.force_muted = 1 if name in app_state.force_muted_apps else 0
+        self.volume = app_state.get_app_volume(name)
+        self.pid_match = 1 if name in app_state.pid_match_apps else 0
+        self.hide_titlebar = 1 if name in app_state.hide_titlebar_apps else 0
+        self.maximize = 1 if name in app_state.maximize_apps else 0
+        self.custom_resolution = 1 if name in app_state.custom_resolution_apps else 0
+        self.always_on_top = 1 if name in app_state.always_on_top_apps else 0
+        self.resize_widgets = 1 if name in app_state.resize_widget_apps else 0
+        self.auto_restore = 1 if name in app_state.auto_restore_positions else 0
+        self.startup_delay = str(app_state.startup_delays.get(name, 0))
+
+        # Get current preset based on saved dimensions
+        rule = app_state.custom_resolution_apps.get(name)
+        current_dims = rule.as_dict() if rule is not None else {}
+        self.preset = "1080p"  # default
+        for preset, dims in app_state.RESOLUTION_PRESETS.items():
+            if dims == current_dims:
+                self.preset = preset
+
+        current_placement = app_state.window_placements.get(name, "center")
+        self.placement = [k for k, v in app_state.WINDOW_PLACEMENTS.items() if v == current_placement][0]
+        current_style = app_state.border_styles.get(name, "no_change")
+        self.border = [k for k, v in app_state.BORDER_STYLES.items() if v == current_style][0]
+        return self
+
+
+class AppRow:
+    """A recyclable row of widgets that displays whichever AppRowModel it is bound to"""
+
+    def __init__(self, parent, owner):
+        self.owner = owner
+        self.model = None
+        self.item = None  # Canvas window item holding the row
+        self.index = None  # Position in the list the row is placed at
+        app_state = owner.app_state
+        theme = app_state.theme
+
+        def checkbutton(master, text, var, field):
+            widget = Checkbutton(master, text=text, variable=var,
+                                 bg=theme['bg'],
+                                 fg=theme['fg'],
+                                 selectcolor=theme['button'],
+                                 activebackground=theme['bg'],
+                                 command=lambda: self.on_toggle(field, var))
+            widget.pack(side='left', padx=5)
+            return widget
+
+        def option_menu(master, var, choices, command):
+            menu = OptionMenu(master, var, *choices, command=lambda *args: command())
+            menu.config(bg=theme['button'],
+                        fg=theme['fg'],
+                        activebackground=theme['active'])
+            menu["menu"].config(bg=theme['button'],
+                                fg=theme['fg'])
+            menu.pack(side='left', padx=2)
+            return menu
+
+        # Tk variables belong to the row, not to an app, so they are reused on rebind
+        self.mute_var = IntVar(parent)
+        self.volume_var = IntVar(parent)
+        self.pid_match_var = IntVar(parent)
+        self.hide_titlebar_var = IntVar(parent)
+        self.maximize_var = IntVar(parent)
+        self.resolution_var = IntVar(parent)
+        self.preset_var = StringVar(parent)
+        self.placement_var = StringVar(parent)
+        self.border_var = StringVar(parent)
+        self.delay_var = StringVar(parent)
+        self.always_on_top_var = IntVar(parent)
+        self.resize_widget_var = IntVar(parent)
+        self.auto_restore_var = IntVar(parent)
+        self.variables = (self.mute_var, self.volume_var, self.pid_match_var, self.hide_titlebar_var,
+                          self.maximize_var, self.resolution_var, self.preset_var, self.placement_var,
+                          self.border_var, self.delay_var, self.always_on_top_var,
+                          self.resize_widget_var, self.auto_restore_var)
+
+        self.frame = Frame(parent, bg=theme['bg'])
+
+        # App name label
+        self.name_label = Label(self.frame, text="",
+                                bg=theme['bg'],
+                                fg=theme['fg'],
+                                width=20, anchor='w')
+        self.name_label.pack(side='left')
+
+        # Status frame to hold mute and volume labels
+        status_frame = Frame(self.frame, bg=theme['bg'])
+        status_frame.pack(side='left', padx=5)
+
+        checkbutton(status_frame, "Force Mute", self.mute_var, "force_muted")
+
+        # Mute status label
+        self.mute_label = Label(status_frame, text="", width=8,
+                                bg=theme['bg'],
+                                fg=theme['fg'])
+        self.mute_label.pack(side='left')
+
+        # Volume level label
+        self.volume_label = Label(status_frame, text="", width=6,
+                                  bg=theme['bg'],
+                                  fg=theme['fg'])
+        self.volume_label.pack(side='left')
+
+        # Volume slider
+        self.scale = Scale(self.frame, from_=0, to=100,
+                           orient='horizontal',
+                           variable=self.volume_var,
+                           bg=theme['bg'],
+                           fg=theme['fg'],
+                           troughcolor=theme['button'],
+                           activebackground=theme['active'],
+                           command=self.on_volume)
+        self.scale.pack(side='left', fill='x', expand=True)
+
+        checkbutton(self.frame, "Match PID", self.pid_match_var, "pid_match")
+        checkbutton(self.frame, "Hide Title", self.hide_titlebar_var, "hide_titlebar")
+        checkbutton(self.frame, "Maximize", self.maximize_var, "maximize")
+
+        # Custom resolution frame
+        resolution_frame = Frame(self.frame, bg=theme['bg'])
+        resolution_frame.pack(side='left', padx=5)
+
+        Checkbutton(resolution_frame, text="Resolution:",
+                    variable=self.resolution_var,
+                    bg=theme['bg'],
+                    fg=theme['fg'],
+                    selectcolor=theme['button'],
+                    activebackground=theme['bg'],
+                    command=self.on_resolution).pack(side='left')
+        option_menu(resolution_frame, self.preset_var, list(app_state.RESOLUTION_PRESETS.keys()),
+                    self.on_resolution)
+
+        # Window placement dropdown
+        placement_frame = Frame(self.frame, bg=theme['bg'])
+        placement_frame.pack(side='left', padx=5)
+        Label(placement_frame, text="Position:",
+              bg=theme['bg'],
+              fg=theme['fg']).pack(side='left')
+        option_menu(placement_frame, self.placement_var, list(app_state.WINDOW_PLACEMENTS.keys()),
+                    self.on_placement)
+
+        # Border style dropdown
+        border_frame = Frame(self.frame, bg=theme['bg'])
+        border_frame.pack(side='left', padx=5)
+        Label(border_frame, text="Border:",
+              bg=theme['bg'],
+              fg=theme['fg']).pack(side='left')
+        option_menu(border_frame, self.border_var, list(app_state.BORDER_STYLES.keys()),
+                    self.on_border)
+
+        # Startup delay setting
+        delay_frame = Frame(self.frame, bg=theme['bg'])
+        delay_frame.pack(side='left', padx=5)
+        Label(delay_frame, text="Startup Delay (s):",
+              bg=theme['bg'],
+              fg=theme['fg']).pack(side='left')
+        self.delay_entry = Entry(delay_frame, textvariable=self.delay_var,
+                                 bg=theme['button'],
+                                 fg=theme['fg'],
+                                 width=5)
+        self.delay_entry.pack(side='left', padx=2)
+        self.delay_entry.bind('<Return>', self.on_delay)
+        self.delay_entry.bind('<FocusOut>', self.on_delay)
+
+        checkbutton(self.frame, "Always on Top", self.always_on_top_var, "always_on_top")
+        checkbutton(self.frame, "Resize Widgets", self.resize_widget_var, "resize_widgets")
+
+        # Window position buttons frame
+        position_frame = Frame(self.frame, bg=theme['bg'])
+        position_frame.pack(side='left', padx=5)
+
+        Button(position_frame, text="Save Position",
+               command=lambda: self.owner.on_save_position(self.model.app_name),
+               bg=theme['button'],
+               fg=theme['fg'],
+               activebackground=theme['active']).pack(side='left', padx=2)
+
+        Button(position_frame, text="Restore Position",
+               command=lambda: self.owner.on_restore_position(self.model.app_name),
+               bg=theme['button'],
+               fg=theme['fg'],
+               activebackground=theme['active']).pack(side='left', padx=2)
+
+        checkbutton(position_frame, "Auto-Restore", self.auto_restore_var, "auto_restore")
+
+    def bind(self, model):
+        """Show a different app in this row"""
+        self.model = model
+        self.name_label.config(text=model.app_name)
+        self.mute_var.set(model.force_muted)
+        self.volume_var.set(model.volume)
+        self.pid_match_var.set(model.pid_match)
+        self.hide_titlebar_var.set(model.hide_titlebar)
+        self.maximize_var.set(model.maximize)
+        self.resolution_var.set(model.custom_resolution)
+        self.preset_var.set(model.preset)
+        self.placement_var.set(model.placement)
+        self.border_var.set(model.border)
+        self.delay_var.set(model.startup_delay)
+        self.always_on_top_var.set(model.always_on_top)
+        self.resize_widget_var.set(model.resize_widgets)
+        self.auto_restore_var.set(model.auto_restore)
+        self.update_status()
+
+    def dispose(self):
+        """Destroy the row's widgets and unset its Tcl variables
+
+        Destroying the frame deletes the Tcl commands behind every command=
+        callback and binding in the row, which drops their references back
+        to the row and the window.
+        """
+        self.model = None
+        tk = self.frame.tk
+        self.frame.destroy()
+        for var in self.variables:
+            tk.call('unset', '-nocomplain', str(var))
+        self.variables = ()
+
+    def update_status(self):
+        """Refresh the mute/volume indicators from the model"""
+        model = self.model
+        if model.is_muted is None:
+            self.mute_label.config(text="")
+            self.volume_label.config(text="")
+        else:
+            self.mute_label.config(text="Muted" if model.is_muted else "Unmuted",
+                                   fg="#ff6b6b" if model.is_muted else "#69db7c")
+            self.volume_label.config(text=f"{model.current_volume}%")
+        if self.volume_var.get() != model.volume:
+            self.volume_var.set(model.volume)
+        if self.mute_var.get() != model.force_muted:
+            self.mute_var.set(model.force_muted)
+
+    def on_toggle(self, field, var):
+        value = var.get()
+        setattr(self.model, field, value)
+        handler = {
+            "force_muted": self.owner.on_mute_change,
+            "pid_match": self.owner.on_pid_match_change,
+            "hide_titlebar": self.owner.on_hide_titlebar_change,
+            "maximize": self.owner.on_maximize_change,
+            "always_on_top": self.owner.on_always_on_top_change,
+            "resize_widgets": self.owner.on_resize_widget_change,
+            "auto_restore": self.owner.on_auto_restore_change,
+        }[field]
+        handler(self.model.app_name, bool(value))
+
+    def on_volume(self, value):
+        # Tk also calls this after bind() sets the variable, which is not a user change
+        volume = int(float(value))
+        if self.model is None or volume == self.model.volume:
+            return
+        self.model.volume = volume
+        self.owner.on_volume_change(self.model.app_name, volume)
+
+    def on_resolution(self):
+        self.model.custom_resolution = self.resolution_var.get()
+        self.model.preset = self.preset_var.get()
+        enabled = bool(self.model.custom_resolution)
+        self.owner.on_resolution_change(self.model.app_name, enabled, self.model.preset if enabled else None)
+
+    def on_placement(self):
+        self.model.placement = self.placement_var.get()
+        self.owner.on_placement_change(self.model.app_name, self.model.placement)
+
+    def on_border(self):
+        self.model.border = self.border_var.get()
+        self.owner.on_border_change(self.model.app_name, self.model.border)
+
+    def on_delay(self, event=None):
+        if self.model is None or self.delay_var.get() == self.model.startup_delay:
+            return
+        self.model.startup_delay = self.owner.on_startup_delay_change(self.model.app_name,
+                                                                      self.delay_var.get())
+        self.delay_var.set(self.model.startup_delay)
+
+
+class VirtualAppList:
+    """Scrollable list that only renders the visible rows, from a pool of recycled AppRows"""
+
+    def __init__(self, parent, owner):
+        self.owner = owner
+        self.models = []
+        self.rows = []
+        self.visible_rows = []
+        self.row_height = None
+        self.scrollregion = None
+        self.last_scroll = None
+        self.refresh_job = None
+        self.measuring = False
+        theme = owner.app_state.theme
+
+        self.vscrollbar = Scrollbar(parent)
+        self.vscrollbar.pack(side='right', fill='y')
+
+        self.canvas = Canvas(parent,
+                             bg=theme['bg'],
+                             yscrollcommand=self.on_scroll,
+                             highlightthickness=0)  # Remove canvas border
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.vscrollbar.config(command=self.canvas.yview)
+
+        # Update row widths and the visible range when the canvas resizes
+        self.canvas.bind('<Configure>', self.on_canvas_configure)
+
+        # Add mouse wheel scrolling
+        def on_mousewheel(event):
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.mousewheel_id = self.canvas.bind_all("<MouseWheel>", on_mousewheel)
+
+    def set_models(self, models):
+        """Replace the displayed models; rows already showing a model keep it"""
+        self.models = models
+        self.schedule_refresh()
+
+    def on_scroll(self, first, last):
+        self.vscrollbar.set(first, last)
+        if (first, last) != self.last_scroll:
+            self.last_scroll = (first, last)
+            self.schedule_refresh()
+
+    def release(self, model):
+        """Detach a model that left the list from the row still holding it"""
+        for row in self.rows:
+            if row.model is model:
+                row.model = None
+                # Until the next refresh, rebind() and update_status() must not see it
+                if row in self.visible_rows:
+                    self.visible_rows.remove(row)
+                if row.index is not None:
+                    row.index = None
+                    self.canvas.itemconfig(row.item, state='hidden')
+
+    def dispose_row(self, row):
+        self.rows.remove(row)
+        self.canvas.delete(row.item)
+        row.dispose()
+
+    def dispose(self):
+        """Tear down every pooled row and pending callback"""
+        if self.refresh_job is not None:
+            self.canvas.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        for row in list(self.rows):
+            self.dispose_row(row)
+        self.models = []
+        self.visible_rows = []
+        self.unbind_mousewheel()
+
+    def on_canvas_configure(self, event):
+        for row in self.rows:
+            self.canvas.itemconfig(row.item, width=event.width - 10)
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        """Coalesce refresh requests into one per idle cycle"""
+        if self.refresh_job is None and not self.measuring:
+            self.refresh_job = self.canvas.after_idle(self.refresh)
+
+    def add_row(self):
+        row = AppRow(self.canvas, self.owner)
+        row.item = self.canvas.create_window((5, 0), window=row.frame, anchor='nw',
+                                             width=max(self.canvas.winfo_width() - 10, 1),
+                                             state='hidden')
+        self.rows.append(row)
+
+        if self.row_height is None:
+            # Let pack compute the row size without re-entering refresh()
+            self.measuring = True
+            row.frame.update_idletasks()
+            self.measuring = False
+            self.row_height = row.frame.winfo_reqheight() + 4  # 2px padding above and below
+            self.canvas.configure(yscrollincrement=self.row_height)
+
+    def refresh(self):
+        """Bind pooled rows to the models that are currently scrolled into view"""
+        self.refresh_job = None
+        if not self.canvas.winfo_exists():
+            return
+        if self.row_height is None:
+            self.add_row()
+
+        # Reconfiguring the scroll region fires yscrollcommand, so only do it on change
+        scrollregion = (0, 0, self.canvas.winfo_width(), len(self.models) * self.row_height)
+        if scrollregion != self.scrollregion:
+            self.scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+
+        first = max(0, int(self.canvas.canvasy(0) // self.row_height))
+        visible = math.ceil(max(self.canvas.winfo_height(), 1) / self.row_height) + 1
+        while len(self.rows) < min(visible, len(self.models)):
+            self.add_row()
+
+        window = self.models[first:first + visible]
+
+        # Keyed by model: a row that already shows a visible app keeps it untouched,
+        # so its slider, entry text and focus survive apps coming and going around it
+        wanted = set(window)
+        bound = {row.model: row for row in self.rows if row.model in wanted}
+        free = [row for row in self.rows if row.model not in wanted]
+
+        self.visible_rows = []
+        for index, model in enumerate(window, first):
+            row = bound.get(model)
+            if row is None:
+                row = free.pop()
+                row.bind(model)
+            if row.index != index:
+                row.index = index
+                self.canvas.coords(row.item, 5, index * self.row_height + 2)
+                self.canvas.itemconfig(row.item, state='normal')
+            self.visible_rows.append(row)
+
+        # Shrink the pool when fewer rows fit, e.g. after the window got smaller
+        excess = len(self.rows) - (len(window) + POOL_SLACK)
+        while excess > 0 and free:
+            self.dispose_row(free.pop())
+            excess -= 1
+
+        for row in free:
+            if row.index is not None:
+                row.index = None
+                self.canvas.itemconfig(row.item, state='hidden')
+
+    def rebind(self):
+        """Redisplay the visible rows after their models were reloaded"""
+        for row in self.visible_rows:
+            row.bind(row.model)
+
+    def update_status(self):
+        """Refresh status indicators of the visible rows"""
+        for row in self.visible_rows:
+            row.update_status()
+
+    def unbind_mousewheel(self):
+        self.canvas.unbind_all("<MouseWheel>")
+        if self.mousewheel_id is not None:
+            # bind_all() never deletes its Tcl command, not even when the canvas is destroyed
+            self.canvas.deletecommand(self.mousewheel_id)
+            self.mousewheel_id = None
@@ -0,0 +1,177 @@
+import marshal
+import os
+import struct
+import time
+import zlib
+
+SNAPSHOT_MAGIC = b"AMWS"
+SNAPSHOT_VERSION = 2
+HEADER = struct.Struct("<4sHHI")  # magic, snapshot version, marshal version, crc32 of the payload
+SAVE_INTERVAL_MS = 30000
+
+
+def encode_snapshot(state):
+    payload = marshal.dumps(state)
+    return HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, marshal.version, zlib.crc32(payload)) + payload
+
+
+def decode_snapshot(data):
+    """Return the snapshot's state, or None if it is torn or from another version"""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, marshal_version, crc = HEADER.unpack_from(data)
+    payload = data[HEADER.size:]
+    if (magic, version, marshal_version) != (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, marshal.version):
+        return None
+    if zlib.crc32(payload) != crc:
+        return None
+    try:
+        state = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+class Win32ProcessProbe:
+    """Reads the live process and window facts a snapshot is checked against"""
+
+    def __init__(self):
+        import psutil
+        import win32gui
+        import win32process
+        self.psutil = psutil
+        self.win32gui = win32gui
+        self.win32process = win32process
+
+    def create_time(self, pid):
+        try:
+            return self.psutil.Process(pid).create_time()
+        except Exception:
+            return None
+
+    def window_pid(self, hwnd):
+        try:
+            if not self.win32gui.IsWindow(hwnd):
+                return None
+            return self.win32process.GetWindowThreadProcessId(hwnd)[1]
+        except Exception:
+            return None
+
+
+class SimulatedProcessProbe:
+    """Stand-in for Win32ProcessProbe with processes and windows set by hand"""
+
+    def __init__(self, processes=None, windows=None):
+        self.processes = dict(processes or {})  # pid -> create time
+        self.windows = dict(windows or {})  # hwnd -> pid
+
+    def create_time(self, pid):
+        return self.processes.get(pid)
+
+    def window_pid(self, hwnd):
+        return self.windows.get(hwnd)
+
+
+class WarmStart:
+    """Compact binary snapshot of the state that is otherwise rebuilt after a restart
+
+    The snapshot holds, per process that had windows, its pid, create time,
+    exe name, when it was first seen and whether its window position was
+    auto-restored, plus the windows whose startup delay had expired, the
+    inputs of the mute decision (the last foreground audio process and the
+    quiet tick count), the exe names of the audio session processes and
+    the mute/volume state last applied to them. On load, a process is kept
+    only if a live process still has the same (pid, create_time), and a
+    window only if it still belongs to such a process, so a reused pid or
+    hwnd never inherits stale state.
+    """
+
+    def __init__(self, path, probe, debug_mode=False):
+        self.path = path
+        self.probe = probe
+        self.debug_mode = debug_mode
+
+    def save(self, processes, windows, foreground_pid, zero_cnt, exe_names, audio):
+        """Write the snapshot
+
+        processes are (pid, exe name, first seen, auto-restored) tuples and
+        windows are hwnds; exe_names maps pids to exe names and audio maps
+        pids to their last applied (muted, volume).
+        """
+        create_times = {}
+
+        def create_time_of(pid):
+            if pid not in create_times:
+                create_times[pid] = self.probe.create_time(pid)
+            return create_times[pid]
+
+        records = []
+        for pid, name, first_seen, auto_restored in processes:
+            create_time = create_time_of(pid)
+            if create_time is not None:
+                records.append((pid, create_time, name, first_seen, bool(auto_restored)))
+        live = {record[0] for record in records}
+        # The last foreground audio session is often a child process without windows
+        foreground = None
+        if foreground_pid is not None:
+            create_time = create_time_of(foreground_pid)
+            if create_time is not None:
+                foreground = (foreground_pid, create_time)
+        state = {
+            "saved": time.time(),
+            "processes": records,
+            "windows": [(hwnd, pid) for hwnd, pid in ((hwnd, self.probe.window_pid(hwnd)) for hwnd in windows)
+                        if pid in live],
+            "foreground": foreground,
+            "zero_cnt": zero_cnt,
+            "exe_names": [(pid, create_time_of(pid), name) for pid, name in exe_names.items()
+                          if create_time_of(pid) is not None],
+            "audio": [(pid, create_time_of(pid), muted, volume) for pid, (muted, volume) in audio.items()
+                      if create_time_of(pid) is not None],
+        }
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(encode_snapshot(state))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving warm start snapshot: {e}")
+            return False
+        if self.debug_mode:
+            print(f"Saved warm start snapshot: {len(records)} processes, {len(state['windows'])} windows")
+        return True
+
+    def load(self):
+        """Return the snapshot's state with everything that no longer matches dropped, or None"""
+        try:
+            with open(self.path, "rb") as f:
+                state = decode_snapshot(f.read())
+        except OSError:
+            return None
+        if state is None:
+            print("Ignoring unreadable warm start snapshot")
+            return None
+
+        processes = [record for record in state.get("processes", ())
+                     if self.probe.create_time(record[0]) == record[1]]
+        live = {record[0] for record in processes}
+        windows = [(hwnd, pid) for hwnd, pid in state.get("windows", ())
+                   if pid in live and self.probe.window_pid(hwnd) == pid]
+        foreground = state.get("foreground")
+        if foreground is not None and self.probe.create_time(foreground[0]) != foreground[1]:
+            foreground = None
+        exe_names = {pid: name for pid, create_time, name in state.get("exe_names", ())
+                     if self.probe.create_time(pid) == create_time}
+        audio = {pid: (muted, volume) for pid, create_time, muted, volume in state.get("audio", ())
+                 if self.probe.create_time(pid) == create_time}
+        if self.debug_mode:
+            print(f"Warm start: kept {len(processes)}/{len(state.get('processes', ()))} processes, "
+                  f"{len(windows)}/{len(state.get('windows', ()))} windows")
+        return {
+            "processes": processes,
+            "windows": windows,
+            "foreground_pid": foreground[0] if foreground is not None else None,
+            "zero_cnt": state.get("zero_cnt", 0),
+            "exe_names": exe_names,
+            "audio": audio,
+        }
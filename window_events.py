@@ -0,0 +1,285 @@
+import ctypes
+import os
+
+# WinEvent constants (winuser.h)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+
+FRAME_MS = 16  # One display frame at 60 Hz
+
+WINDOW_EVENTS = frozenset((
+    EVENT_SYSTEM_FOREGROUND,
+    EVENT_SYSTEM_MINIMIZEEND,
+    EVENT_OBJECT_CREATE,
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_SHOW,
+    EVENT_OBJECT_HIDE,
+    EVENT_OBJECT_LOCATIONCHANGE,
+))
+
+
+class AppWindowScanner:
+    """Finds the visible top-level windows of a set of apps in one EnumWindows pass
+
+    Exe names are cached per pid and the cache is pruned to the pids seen in
+    the latest pass, so each process is looked up once while it keeps windows.
+    """
+
+    def __init__(self, debug_mode=False):
+        import psutil
+        import win32gui
+        import win32process
+        self.psutil = psutil
+        self.win32gui = win32gui
+        self.win32process = win32process
+        self.debug_mode = debug_mode
+        self.process_names = {}  # pid -> exe name ("" when it can't be read)
+
+    def process_name(self, pid):
+        try:
+            return os.path.basename(self.psutil.Process(pid).exe())
+        except Exception:
+            return ""
+
+    def scan(self, app_names):
+        """Return {app name: [hwnd, ...]} for every visible window of the given apps"""
+        found = {app_name: [] for app_name in app_names}
+        if not found:
+            return found
+        known = self.process_names
+        seen = {}
+
+        def enum_windows_callback(hwnd, _):
+            if not self.win32gui.IsWindowVisible(hwnd):
+                return True
+            try:
+                _, pid = self.win32process.GetWindowThreadProcessId(hwnd)
+            except Exception:
+                return True
+            name = seen.get(pid)
+            if name is None:
+                name = known.get(pid)
+                if name is None:
+                    name = self.process_name(pid)
+                seen[pid] = name
+            if name in found:
+                found[name].append(hwnd)
+            return True
+
+        self.win32gui.EnumWindows(enum_windows_callback, None)
+        self.process_names = seen
+        if self.debug_mode:
+            print(f"Window scan: {sum(len(hwnds) for hwnds in found.values())} windows "
+                  f"for {len(found)} apps, {len(seen)} processes cached")
+        return found
+
+
+class Win32WindowEvents:
+    """Flags window creation, destruction, show/hide, activation and moves of watched windows
+
+    Uses out-of-context WinEvent hooks, whose callbacks are delivered on the
+    thread that installed them while it pumps messages, i.e. on the Tk loop.
+    The callback only sets a flag; changed() reads and clears it so a
+    periodic tick can skip its scan while nothing happened. Location changes
+    (which include every caret and cursor move on the desktop) are only
+    hooked for the processes of windows passed to watch_window(), one hook
+    per process, and passed to location_listener(hwnd), if one is set.
+    """
+
+    def __init__(self):
+        from ctypes import wintypes
+        self.user32 = ctypes.windll.user32
+        proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                       wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+        self.user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, proc_type,
+                                                wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+        self.user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        self.user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        self.proc = proc_type(self.on_event)  # Must stay referenced while hooked
+        self.dirty = True  # Scan once on the first tick
+        self.location_listener = None
+        self.hooks = []
+        self.location_hooks = {}  # pid -> [hook, number of watched windows]
+        self.window_pids = {}  # watched hwnd -> pid
+        for first, last in ((EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MINIMIZEEND),
+                            (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE)):
+            hook = self.set_hook(first, last, 0)
+            if not hook:
+                self.close()
+                raise OSError(f"SetWinEventHook failed for events {first:#x}-{last:#x}")
+            self.hooks.append(hook)
+
+    def set_hook(self, first, last, pid):
+        return self.user32.SetWinEventHook(first, last, None, self.proc, pid, 0,
+                                           WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+
+    def watch_window(self, hwnd):
+        """Hook location changes of the window's process, if not already hooked"""
+        if hwnd in self.window_pids:
+            return
+        pid = ctypes.c_ulong()
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        pid = pid.value
+        if not pid:
+            return  # Window is gone; a pid of 0 would hook every process
+        entry = self.location_hooks.get(pid)
+        if entry is None:
+            hook = self.set_hook(EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE, pid)
+            if not hook:
+                return
+            entry = self.location_hooks[pid] = [hook, 0]
+        entry[1] += 1
+        self.window_pids[hwnd] = pid
+
+    def unwatch_window(self, hwnd):
+        """Drop the window's process hook once none of its windows are watched"""
+        pid = self.window_pids.pop(hwnd, None)
+        entry = self.location_hooks.get(pid)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            self.user32.UnhookWinEvent(entry[0])
+            del self.location_hooks[pid]
+
+    def on_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        # Skip caret/cursor/child-object noise; only whole windows matter
+        if id_object == OBJID_WINDOW and event in WINDOW_EVENTS:
+            self.dirty = True
+            if event == EVENT_OBJECT_LOCATIONCHANGE and self.location_listener is not None:
+                self.location_listener(hwnd)
+
+    def changed(self):
+        """Check (and reset) whether any window changed since the last call"""
+        dirty = self.dirty
+        self.dirty = False
+        return dirty
+
+    def close(self):
+        for hook in self.hooks:
+            self.user32.UnhookWinEvent(hook)
+        for hook, count in self.location_hooks.values():
+            self.user32.UnhookWinEvent(hook)
+        self.hooks = []
+        self.location_hooks = {}
+        self.window_pids = {}
+
+
+class SimulatedWindowEvents:
+    """Stand-in for Win32WindowEvents that tests and benchmarks drive by hand"""
+
+    def __init__(self, window_pids=None):
+        self.dirty = True
+        self.location_listener = None
+        self.window_pids = dict(window_pids or {})  # hwnd -> pid; a window is its own process if missing
+        self.location_hooks = {}  # pid -> number of watched windows
+        self.watched = set()
+
+    def watch_window(self, hwnd):
+        if hwnd not in self.watched:
+            self.watched.add(hwnd)
+            pid = self.window_pids.get(hwnd, hwnd)
+            self.location_hooks[pid] = self.location_hooks.get(pid, 0) + 1
+
+    def unwatch_window(self, hwnd):
+        if hwnd in self.watched:
+            self.watched.discard(hwnd)
+            pid = self.window_pids.get(hwnd, hwnd)
+            self.location_hooks[pid] -= 1
+            if not self.location_hooks[pid]:
+                del self.location_hooks[pid]
+
+    def move(self, hwnd):
+        """Report that a window moved or was resized; only hooked processes report moves"""
+        if self.window_pids.get(hwnd, hwnd) not in self.location_hooks:
+            return
+        self.dirty = True
+        if self.location_listener is not None:
+            self.location_listener(hwnd)
+
+    def changed(self):
+        dirty = self.dirty
+        self.dirty = False
+        return dirty
+
+    def close(self):
+        pass
+
+
+class WindowTracker:
+    """Follows the location of watched windows, reporting each at most once per frame
+
+    Location events only mark a window as moved. While is_active() is true a
+    single after() per frame reports every moved window to on_move(hwnd);
+    while inactive, moves are just collected until the next flush().
+    """
+
+    def __init__(self, root, events, on_move, is_active=lambda: True, frame_ms=FRAME_MS,
+                 debug_mode=False):
+        self.root = root
+        self.window_events = events
+        self.on_move = on_move
+        self.is_active = is_active
+        self.frame_ms = frame_ms
+        self.debug_mode = debug_mode
+        self.watched = set()
+        self.moved = set()
+        self.events = 0
+        self.frames = 0
+        self._after_id = None
+        events.location_listener = self.on_location_change
+
+    def watch(self, hwnd):
+        if hwnd not in self.watched:
+            self.watched.add(hwnd)
+            self.window_events.watch_window(hwnd)
+
+    def unwatch(self, hwnd):
+        if hwnd in self.watched:
+            self.watched.discard(hwnd)
+            self.window_events.unwatch_window(hwnd)
+        self.moved.discard(hwnd)
+
+    def on_location_change(self, hwnd):
+        if hwnd not in self.watched:
+            return
+        self.events += 1
+        self.moved.add(hwnd)
+        if self._after_id is None and self.is_active():
+            self._after_id = self.root.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        """Report every window that moved since the last frame"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if not self.moved:
+            return
+        moved, self.moved = self.moved, set()
+        self.frames += 1
+        for hwnd in moved:
+            try:
+                self.on_move(hwnd)
+            except Exception as e:
+                if self.debug_mode:
+                    print(f"Error following window {hwnd}: {e}")
+        if self.debug_mode:
+            print(f"Followed {len(moved)} window(s); {self.events} location events in {self.frames} frames")
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        for hwnd in self.watched:
+            self.window_events.unwatch_window(hwnd)
+        self.watched.clear()
+        self.moved.clear()
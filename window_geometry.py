@@ -0,0 +1,146 @@
+import math
+
+DEFAULT_DPI = 96
+
+
+def parse_fit_ratio(value):
+    """Parse a "fit_W_H" preset value into an aspect ratio ("fit_19_5_9" -> 19.5/9)"""
+    if not isinstance(value, str) or not value.startswith("fit_"):
+        return None
+    parts = value[len("fit_"):].split("_")
+    if len(parts) < 2:
+        raise ValueError(f"Invalid fit preset: {value}")
+    numerator = float(".".join(parts[:-1]))
+    denominator = float(parts[-1])
+    if not (0 < numerator < math.inf and 0 < denominator < math.inf):
+        raise ValueError(f"Invalid fit preset: {value}")
+    return numerator / denominator
+
+
+def compile_size_spec(settings):
+    """Turn a {"width": ..., "height": ...} setting into a hashable size spec
+
+    Fixed sizes become ("fixed", width, height), fit presets ("fit", ratio).
+    """
+    width = settings["width"]
+    ratio = parse_fit_ratio(width)
+    if ratio is not None:
+        return ("fit", ratio)
+    return ("fixed", int(width), int(settings["height"]))
+
+
+def fit_size(work_width, work_height, ratio, dpi=DEFAULT_DPI):
+    """Largest size with the given aspect ratio that fits the work area at this DPI"""
+    dpi_scale = dpi / float(DEFAULT_DPI)
+    scaled_width = int(work_width / dpi_scale)
+    scaled_height = int(work_height / dpi_scale)
+
+    if (scaled_width / scaled_height) > ratio:
+        # Screen is wider than target ratio, fit to height
+        target_height = scaled_height
+        target_width = int(scaled_height * ratio)
+    else:
+        # Screen is taller than target ratio, fit to width
+        target_width = scaled_width
+        target_height = int(scaled_width / ratio)
+
+    # Scale back to actual pixels
+    return int(target_width * dpi_scale), int(target_height * dpi_scale)
+
+
+def place(placement, screen_width, screen_height, window_width, window_height):
+    """Calculate window position based on placement setting"""
+    if placement == "center":
+        return (screen_width - window_width) // 2, (screen_height - window_height) // 2
+    elif placement == "top":
+        return (screen_width - window_width) // 2, 0
+    elif placement == "bottom":
+        return (screen_width - window_width) // 2, screen_height - window_height
+    elif placement == "left":
+        return 0, (screen_height - window_height) // 2
+    elif placement == "right":
+        return screen_width - window_width, (screen_height - window_height) // 2
+    elif placement == "top_left":
+        return 0, 0
+    elif placement == "top_right":
+        return screen_width - window_width, 0
+    elif placement == "bottom_left":
+        return 0, screen_height - window_height
+    elif placement == "bottom_right":
+        return screen_width - window_width, screen_height - window_height
+    return None, None  # "no_change" and unknown placements keep the current position
+
+
+class DisplayTopology:
+    """Snapshot of the attached monitors and their work areas"""
+
+    __slots__ = ("work_areas", "signature")
+
+    def __init__(self, work_areas):
+        self.work_areas = dict(work_areas)  # monitor handle -> (left, top, right, bottom)
+        self.signature = tuple(sorted(self.work_areas.items()))
+
+    def work_area(self, monitor):
+        return self.work_areas.get(monitor)
+
+
+def read_display_topology():
+    """Read the current monitor layout from Windows"""
+    import win32api
+
+    work_areas = {}
+    for monitor, _, _ in win32api.EnumDisplayMonitors():
+        handle = int(monitor)
+        work_areas[handle] = tuple(win32api.GetMonitorInfo(handle)['Work'])
+    return DisplayTopology(work_areas)
+
+
+class GeometryCache:
+    """Target rects cached per (monitor, DPI, size spec, placement)
+
+    The cache only holds results for the current display topology and is
+    dropped when update_topology() sees a different monitor layout. Only
+    read_display_topology() talks to Windows, so everything else here runs
+    on any platform.
+    """
+
+    def __init__(self):
+        self.topology = DisplayTopology({})
+        self._rects = {}
+        self.hits = 0
+        self.misses = 0
+
+    def update_topology(self, topology):
+        """Install a new topology, invalidating cached rects if the layout changed"""
+        if topology.signature != self.topology.signature:
+            self._rects.clear()
+        self.topology = topology
+        return self.topology
+
+    def target_rect(self, monitor, dpi, spec, placement):
+        """Return (x, y, width, height) for a compiled size spec; x and y are None when the position is unchanged"""
+        if spec[0] == "fixed":
+            dpi = None  # Fixed sizes do not depend on DPI, share one cache entry
+        key = (monitor, dpi, spec, placement)
+
+        rect = self._rects.get(key)
+        if rect is not None:
+            self.hits += 1
+            return rect
+        self.misses += 1
+
+        work_area = self.topology.work_area(monitor)
+        if work_area is None:
+            return None
+        screen_width = work_area[2] - work_area[0]
+        screen_height = work_area[3] - work_area[1]
+
+        if spec[0] == "fit":
+            width, height = fit_size(screen_width, screen_height, spec[1], dpi or DEFAULT_DPI)
+        else:
+            width, height = spec[1], spec[2]
+
+        x, y = place(placement, screen_width, screen_height, width, height)
+        rect = (x, y, width, height)
+        self._rects[key] = rect
+        return rect
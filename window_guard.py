@@ -0,0 +1,140 @@
+import time
+
+
+class Win32HangProbe:
+    """Detects hung windows without blocking on them"""
+
+    def __init__(self, timeout_ms=100):
+        import ctypes
+        import win32con
+        import win32gui
+        self.user32 = ctypes.windll.user32
+        self.win32con = win32con
+        self.win32gui = win32gui
+        self.timeout_ms = timeout_ms
+
+    def is_hung(self, hwnd):
+        """Ask Windows whether the owning thread stopped pumping messages (cheap, never blocks)"""
+        return bool(self.user32.IsHungAppWindow(hwnd))
+
+    def responds(self, hwnd):
+        """Round-trip a WM_NULL with a bounded timeout"""
+        try:
+            self.win32gui.SendMessageTimeout(hwnd, self.win32con.WM_NULL, 0, 0,
+                                             self.win32con.SMTO_ABORTIFHUNG,
+                                             self.timeout_ms)
+            return True
+        except Exception:
+            return False
+
+
+class SimulatedHangProbe:
+    """Stand-in probe for tests: windows are hung or unresponsive when listed"""
+
+    def __init__(self, hung=(), unresponsive=()):
+        self.hung = set(hung)
+        self.unresponsive = set(unresponsive)
+
+    def is_hung(self, hwnd):
+        return hwnd in self.hung
+
+    def responds(self, hwnd):
+        return hwnd not in self.hung and hwnd not in self.unresponsive
+
+
+class HungWindowGuard:
+    """Circuit breaker that skips windows whose owning thread is hung or slow
+
+    A window that is hung, fails the bounded WM_NULL probe or makes a window
+    call take longer than slow_call seconds is skipped for a cooling-off
+    period that doubles with every consecutive failure. After the cooldown
+    the next allow() probes the window and closes the breaker if it answers.
+    """
+
+    def __init__(self, probe, clock=time.monotonic, base_cooldown=5.0, max_cooldown=300.0,
+                 slow_call=0.25, debug_mode=False):
+        self.probe = probe
+        self.clock = clock
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.slow_call = slow_call
+        self.debug_mode = debug_mode
+        self.breakers = {}  # hwnd -> [consecutive failures, open until]
+        self.metrics = {
+            "checks": 0,
+            "skipped": 0,
+            "hung": 0,
+            "timeouts": 0,
+            "slow_calls": 0,
+            "trips": 0,
+            "recovered": 0,
+        }
+
+    def allow(self, hwnd, probe_responsive=False):
+        """Check whether a window may be touched right now"""
+        self.metrics["checks"] += 1
+
+        breaker = self.breakers.get(hwnd)
+        if breaker is not None:
+            if self.clock() < breaker[1]:
+                self.metrics["skipped"] += 1
+                return False
+            probe_responsive = True  # Half-open: the window has to answer before it is trusted again
+
+        if self.probe.is_hung(hwnd):
+            self.metrics["hung"] += 1
+            self.trip(hwnd, "hung")
+            return False
+
+        if probe_responsive and not self.probe.responds(hwnd):
+            self.metrics["timeouts"] += 1
+            self.trip(hwnd, "probe timed out")
+            return False
+
+        if breaker is not None:
+            # Half-open probe went through, close the breaker; callers that only use
+            # allow() (e.g. topmost) never reach call(), which would close it otherwise
+            del self.breakers[hwnd]
+            self.metrics["recovered"] += 1
+        return True
+
+    def call(self, hwnd, func, *args):
+        """Run a window call that may block, and trip the breaker if it was slow"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.slow_call:
+                self.metrics["slow_calls"] += 1
+                self.trip(hwnd, f"{func.__name__} took {elapsed * 1000:.0f}ms")
+            elif hwnd in self.breakers and self.clock() >= self.breakers[hwnd][1]:
+                # Half-open call went through, close the breaker
+                del self.breakers[hwnd]
+                self.metrics["recovered"] += 1
+
+    def trip(self, hwnd, reason):
+        """Open the breaker for a window with exponential backoff"""
+        failures = self.breakers.get(hwnd, [0, 0])[0] + 1
+        cooldown = min(self.base_cooldown * 2 ** (failures - 1), self.max_cooldown)
+        self.breakers[hwnd] = [failures, self.clock() + cooldown]
+        self.metrics["trips"] += 1
+        print(f"Skipping window {hwnd} for {cooldown:.0f}s ({reason})")
+        if self.debug_mode:
+            print(f"Hung window stats: {self.report()}")
+
+    def forget(self, live_hwnds):
+        """Drop breakers for windows that no longer exist"""
+        for hwnd in list(self.breakers.keys()):
+            if hwnd not in live_hwnds:
+                del self.breakers[hwnd]
+
+    def stats(self):
+        """Return a copy of the metrics plus the number of open breakers"""
+        stats = dict(self.metrics)
+        stats["open"] = len(self.breakers)
+        return stats
+
+    def report(self):
+        """Return the stats as a printable summary"""
+        return ", ".join(f"{name}={count}" for name, count in self.stats().items())
@@ -0,0 +1,168 @@
+# SetWindowPos flags, duplicated from win32con so the simulated backend runs anywhere
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+SWP_FRAMECHANGED = 0x0020
+SWP_ASYNCWINDOWPOS = 0x4000
+
+HWND_TOP = 0
+HWND_TOPMOST = -1
+HWND_NOTOPMOST = -2
+
+
+class WindowMove:
+    """One pending SetWindowPos call"""
+
+    __slots__ = ("hwnd", "insert_after", "x", "y", "width", "height", "flags")
+
+    def __init__(self, hwnd, insert_after, x, y, width, height, flags):
+        self.hwnd = hwnd
+        self.insert_after = insert_after
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.flags = flags
+
+    def merge(self, other):
+        """Fold a later move for the same window into this one"""
+        if not other.flags & SWP_NOMOVE:
+            self.x, self.y = other.x, other.y
+        if not other.flags & SWP_NOSIZE:
+            self.width, self.height = other.width, other.height
+        if not other.flags & SWP_NOZORDER:
+            self.insert_after = other.insert_after
+
+        # Suppression flags survive only if both moves asked for them
+        kept = self.flags & other.flags & (SWP_NOMOVE | SWP_NOSIZE | SWP_NOZORDER)
+        extra = (self.flags | other.flags) & ~(SWP_NOMOVE | SWP_NOSIZE | SWP_NOZORDER)
+        self.flags = kept | extra
+
+    def as_tuple(self):
+        return (self.hwnd, self.insert_after, self.x, self.y, self.width, self.height, self.flags)
+
+    def __repr__(self):
+        return f"WindowMove{self.as_tuple()}"
+
+
+class LayoutTransaction:
+    """Collects the window moves of one enforcement pass and commits them together"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.moves = {}  # hwnd -> WindowMove, in insertion order
+
+    def set_window_pos(self, hwnd, insert_after, x, y, width, height, flags):
+        """Queue a SetWindowPos-style change; repeated calls for one window are merged"""
+        move = WindowMove(hwnd, insert_after, x, y, width, height, flags)
+        if hwnd in self.moves:
+            self.moves[hwnd].merge(move)
+        else:
+            self.moves[hwnd] = move
+
+    def discard(self, hwnd):
+        """Drop any queued change for a window"""
+        self.moves.pop(hwnd, None)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def commit(self):
+        """Apply all queued moves in one batch and return how many were applied"""
+        if not self.moves:
+            return 0
+        moves = list(self.moves.values())
+        self.moves = {}
+        return self.backend.apply(moves)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+class Win32LayoutBackend:
+    """Applies a batch with BeginDeferWindowPos/DeferWindowPos/EndDeferWindowPos
+
+    With a HungWindowGuard, windows that are hung or cooling off are left out
+    of the batch, since EndDeferWindowPos waits on every window's thread.
+    Single moves and the per-window fallback use SWP_ASYNCWINDOWPOS so they
+    never wait on another thread.
+    """
+
+    def __init__(self, guard=None, debug_mode=False):
+        import win32gui
+        self.win32gui = win32gui
+        self.guard = guard
+        self.debug_mode = debug_mode
+
+    def apply(self, moves):
+        if self.guard is not None:
+            moves = [move for move in moves if self.guard.allow(move.hwnd, probe_responsive=True)]
+        if not moves:
+            return 0
+        if len(moves) == 1:
+            return self.apply_async(moves)
+
+        try:
+            hdwp = self.win32gui.BeginDeferWindowPos(len(moves))
+            for move in moves:
+                hdwp = self.win32gui.DeferWindowPos(hdwp, *move.as_tuple())
+            self.win32gui.EndDeferWindowPos(hdwp)
+            return len(moves)
+        except Exception as e:
+            # One bad window (closed, different parent, ...) fails the whole batch
+            if self.debug_mode:
+                print(f"Deferred window positioning failed, applying moves one by one: {e}")
+        return self.apply_async(moves)
+
+    def apply_async(self, moves):
+        """Post each move to the owning thread instead of waiting for it"""
+        applied = 0
+        for move in moves:
+            args = (move.hwnd, move.insert_after, move.x, move.y, move.width, move.height,
+                    move.flags | SWP_ASYNCWINDOWPOS)
+            try:
+                if self.guard is not None:
+                    self.guard.call(move.hwnd, self.win32gui.SetWindowPos, *args)
+                else:
+                    self.win32gui.SetWindowPos(*args)
+                applied += 1
+            except Exception as e:
+                print(f"Error moving window {move.hwnd}: {e}")
+        return applied
+
+
+class SimulatedLayoutBackend:
+    """In-memory window rects; records every batch so tests can count recompositions"""
+
+    def __init__(self, rects=None):
+        self.rects = dict(rects or {})  # hwnd -> (left, top, right, bottom)
+        self.topmost = set()
+        self.batches = []
+
+    @property
+    def recompositions(self):
+        return len(self.batches)
+
+    def apply(self, moves):
+        self.batches.append([move.as_tuple() for move in moves])
+        for move in moves:
+            left, top, right, bottom = self.rects.get(move.hwnd, (0, 0, 0, 0))
+            width, height = right - left, bottom - top
+            if not move.flags & SWP_NOMOVE:
+                left, top = move.x, move.y
+            if not move.flags & SWP_NOSIZE:
+                width, height = move.width, move.height
+            self.rects[move.hwnd] = (left, top, left + width, top + height)
+
+            if not move.flags & SWP_NOZORDER:
+                if move.insert_after == HWND_TOPMOST:
+                    self.topmost.add(move.hwnd)
+                elif move.insert_after == HWND_NOTOPMOST:
+                    self.topmost.discard(move.hwnd)
+        return len(moves)
@@ -0,0 +1,334 @@
+import random
+import sys
+import time
+
+from window_geometry import DisplayTopology, GeometryCache
+
+# Window styles, same values as win32con so plans match the live desktop bit for bit
+WS_OVERLAPPED = 0
+WS_TILED = 0
+WS_POPUP = -2147483648
+WS_BORDER = 0x00800000
+WS_DLGFRAME = 0x00400000
+WS_CAPTION = 0x00C00000
+WS_SYSMENU = 0x00080000
+WS_THICKFRAME = 0x00040000
+WS_MINIMIZEBOX = 0x00020000
+WS_MAXIMIZEBOX = 0x00010000
+WS_TILEDWINDOW = 0x00CF0000
+
+
+class WindowInfo:
+    """Everything the planner needs to know about one window"""
+
+    __slots__ = ("hwnd", "pid", "process_name", "style", "rect", "visible", "iconic",
+                 "maximized", "monitor", "dpi")
+
+    def __init__(self, hwnd, pid, process_name, style=0, rect=(0, 0, 0, 0), visible=True,
+                 iconic=False, maximized=False, monitor=None, dpi=96):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.process_name = process_name
+        self.style = style
+        self.rect = tuple(rect)
+        self.visible = visible
+        self.iconic = iconic
+        self.maximized = maximized
+        self.monitor = monitor
+        self.dpi = dpi
+
+
+class PlannedAction:
+    """One change the enforcement pass would make, and the rule that caused it"""
+
+    __slots__ = ("hwnd", "process_name", "kind", "rule", "value")
+
+    def __init__(self, hwnd, process_name, kind, rule, value):
+        self.hwnd = hwnd
+        self.process_name = process_name
+        self.kind = kind  # "style", "resize", "move" or "topmost"
+        self.rule = rule
+        self.value = value
+
+    def key(self):
+        return (self.process_name, self.hwnd, self.kind)
+
+    def describe(self):
+        value = hex(self.value) if self.kind == "style" else self.value
+        return f"{self.process_name} ({self.hwnd}): {self.kind} -> {value} [{self.rule}]"
+
+    def __repr__(self):
+        return f"PlannedAction({self.describe()})"
+
+
+def compute_style(style, border_style):
+    """Style of a window with its title bar hidden and the given border style applied"""
+    # Remove all title bar related styles
+    style &= ~(WS_CAPTION | WS_SYSMENU | WS_MINIMIZEBOX | WS_MAXIMIZEBOX)
+
+    if border_style != "no_change":
+        style &= ~(WS_BORDER | WS_THICKFRAME | WS_DLGFRAME)
+
+        if border_style == "normal":
+            style &= ~(WS_DLGFRAME | WS_OVERLAPPED | WS_TILEDWINDOW | WS_POPUP | WS_TILED)
+            style |= WS_THICKFRAME
+        elif border_style == "thin":
+            style |= WS_BORDER
+        elif border_style == "dialog":
+            style |= WS_DLGFRAME
+        elif border_style == "tool":
+            style |= WS_BORDER
+            style &= ~(WS_MAXIMIZEBOX | WS_MINIMIZEBOX)
+    return style
+
+
+class WindowRulePlanner:
+    """Turns window rules into an ordered action plan without touching any window"""
+
+    def __init__(self, hide_titlebar_apps, border_styles, custom_resolution_apps,
+                 window_placements, always_on_top_apps, geometry=None):
+        # These are the live containers owned by AppState, so edits in the UI apply immediately
+        self.hide_titlebar_apps = hide_titlebar_apps
+        self.border_styles = border_styles
+        self.custom_resolution_apps = custom_resolution_apps
+        self.window_placements = window_placements
+        self.always_on_top_apps = always_on_top_apps
+        self.geometry = geometry or GeometryCache()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a planner straight from a parsed config.toml"""
+        from config_model import load_config
+        settings = load_config(config)
+        return cls(settings.hide_titlebar_apps,
+                   settings.border_styles,
+                   settings.custom_resolution_apps,
+                   settings.window_placements,
+                   settings.always_on_top_apps,
+                   GeometryCache())
+
+    def dry_run(self):
+        """Planner over the same rules with a geometry cache of its own, for plans that are not applied"""
+        return type(self)(self.hide_titlebar_apps, self.border_styles, self.custom_resolution_apps,
+                          self.window_placements, self.always_on_top_apps, GeometryCache())
+
+    def manages(self, process_name):
+        """Check if any window rule applies to this process"""
+        return (process_name in self.hide_titlebar_apps
+                or process_name in self.custom_resolution_apps
+                or process_name in self.always_on_top_apps)
+
+    def needs_geometry(self, process_name):
+        """Check if planning this process needs rect, placement and monitor info"""
+        return process_name in self.custom_resolution_apps
+
+    def plan_window(self, info):
+        """Return the actions for a single window"""
+        actions = []
+        name = info.process_name
+
+        # Handle title bars and borders
+        if name in self.hide_titlebar_apps:
+            border_style = self.border_styles.get(name, "no_change")
+            style = compute_style(info.style, border_style)
+            if style != info.style:
+                rule = "BORDER_STYLES" if border_style != "no_change" else "HIDE_TITLEBAR_APPS"
+                actions.append(PlannedAction(info.hwnd, name, "style", rule, style))
+
+        # Handle custom resolutions
+        if name in self.custom_resolution_apps and info.visible and not info.iconic and not info.maximized:
+            spec = self.custom_resolution_apps[name].spec  # ResolutionRule, compiled when loaded
+            placement = self.window_placements.get(name, "center")
+            dpi = info.dpi if spec[0] == "fit" else None
+            target = self.geometry.target_rect(info.monitor, dpi, spec, placement)
+
+            if target is not None:
+                x, y, width, height = target
+                left, top, right, bottom = info.rect
+                if x is None or y is None:
+                    x, y = left, top
+
+                if (width, height) != (right - left, bottom - top):
+                    actions.append(PlannedAction(info.hwnd, name, "resize", "CUSTOM_RESOLUTION_APPS",
+                                                 (width, height)))
+                if (x, y) != (left, top):
+                    actions.append(PlannedAction(info.hwnd, name, "move", "WINDOW_PLACEMENTS",
+                                                 (x, y)))
+
+        # Handle always on top
+        if name in self.always_on_top_apps:
+            actions.append(PlannedAction(info.hwnd, name, "topmost", "ALWAYS_ON_TOP_APPS", True))
+
+        return actions
+
+    def plan(self, desktop, skip=()):
+        """Return the ordered actions for every managed window on a desktop"""
+        self.geometry.update_topology(desktop.topology())
+        actions = []
+        for info in desktop.windows(self):
+            if info.hwnd in skip:
+                continue
+            actions.extend(self.plan_window(info))
+        return actions
+
+
+def diff_plans(old_plan, new_plan):
+    """Compare two plans and return (added, removed, changed) actions"""
+    old = {action.key(): action for action in old_plan}
+    new = {action.key(): action for action in new_plan}
+
+    added = [action for key, action in new.items() if key not in old]
+    removed = [action for key, action in old.items() if key not in new]
+    changed = [(old[key], action) for key, action in new.items()
+               if key in old and (old[key].value, old[key].rule) != (action.value, action.rule)]
+    return added, removed, changed
+
+
+class Win32Desktop:
+    """Reads windows from the live desktop; never modifies them"""
+
+    def __init__(self, guard=None):
+        import ctypes
+        import os
+        import psutil
+        import win32api
+        import win32con
+        import win32gui
+        import win32process
+        self.user32 = ctypes.windll.user32
+        self.os = os
+        self.psutil = psutil
+        self.win32api = win32api
+        self.win32con = win32con
+        self.win32gui = win32gui
+        self.win32process = win32process
+        self.guard = guard
+
+    def topology(self):
+        from window_geometry import read_display_topology
+        return read_display_topology()
+
+    def describe(self, hwnd, pid, process_name, geometry=True):
+        """Snapshot a window; geometry fields are only read when a rule needs them"""
+        info = WindowInfo(hwnd, pid, process_name,
+                          style=self.win32gui.GetWindowLong(hwnd, self.win32con.GWL_STYLE))
+        if not geometry:
+            return info
+
+        info.visible = bool(self.win32gui.IsWindowVisible(hwnd))
+        info.iconic = bool(self.win32gui.IsIconic(hwnd))
+        if info.visible and not info.iconic:
+            if self.guard is not None:
+                placement = self.guard.call(hwnd, self.win32gui.GetWindowPlacement, hwnd)
+            else:
+                placement = self.win32gui.GetWindowPlacement(hwnd)
+            info.maximized = placement[1] == self.win32con.SW_SHOWMAXIMIZED
+            info.rect = self.win32gui.GetWindowRect(hwnd)
+            info.monitor = int(self.win32api.MonitorFromWindow(hwnd, self.win32con.MONITOR_DEFAULTTONEAREST))
+            info.dpi = self.user32.GetDpiForWindow(hwnd)
+        return info
+
+    def windows(self, planner):
+        """Describe every window whose process is managed by the planner"""
+        found = []
+
+        def enum_windows_callback(hwnd, _):
+            try:
+                _, pid = self.win32process.GetWindowThreadProcessId(hwnd)
+                process_name = self.os.path.basename(self.psutil.Process(pid).exe())
+                if planner.manages(process_name):
+                    found.append(self.describe(hwnd, pid, process_name,
+                                               geometry=planner.needs_geometry(process_name)))
+            except Exception:
+                pass  # Ignore errors for inaccessible windows
+            return True
+
+        self.win32gui.EnumWindows(enum_windows_callback, None)
+        return found
+
+
+class SimulatedDesktop:
+    """In-memory desktop for tests and for benchmarking the planner off Windows"""
+
+    def __init__(self, work_areas=None):
+        self.display = DisplayTopology(work_areas or {1: (0, 0, 2560, 1400)})
+        self.infos = []
+
+    def add_window(self, process_name, **fields):
+        hwnd = fields.pop("hwnd", 0x10000 + len(self.infos) * 4)
+        pid = fields.pop("pid", 1000 + len(self.infos))
+        fields.setdefault("monitor", next(iter(self.display.work_areas)))
+        info = WindowInfo(hwnd, pid, process_name, **fields)
+        self.infos.append(info)
+        return info
+
+    @classmethod
+    def generate(cls, count, process_names, seed=0):
+        """Desktop with `count` windows spread over the given process names"""
+        rng = random.Random(seed)
+        desktop = cls()
+        for i in range(count):
+            x, y = rng.randrange(0, 1600), rng.randrange(0, 800)
+            width, height = rng.choice([(800, 600), (1280, 720), (1920, 1080)])
+            style = rng.choice([0x14CF0000, 0x16CF0000, 0x96000000 - 2 ** 32])
+            desktop.add_window(process_names[i % len(process_names)],
+                               style=style, rect=(x, y, x + width, y + height),
+                               iconic=rng.random() < 0.05)
+        return desktop
+
+    def topology(self):
+        return self.display
+
+    def windows(self, planner):
+        return [info for info in self.infos if planner.manages(info.process_name)]
+
+
+def main(argv):
+    """Plan (and optionally diff) config files against a simulated desktop"""
+    import argparse
+    import toml
+
+    parser = argparse.ArgumentParser(description="Dry-run window rules against a simulated desktop")
+    parser.add_argument("config", help="config.toml to plan")
+    parser.add_argument("compare", nargs="?", help="second config.toml to diff against")
+    parser.add_argument("--windows", type=int, default=5000, help="number of simulated windows")
+    parser.add_argument("--show", action="store_true", help="print every planned action")
+    args = parser.parse_args(argv)
+
+    configs = [toml.load(args.config)]
+    if args.compare:
+        configs.append(toml.load(args.compare))
+
+    process_names = set()
+    for config in configs:
+        planner = WindowRulePlanner.from_config(config)
+        process_names.update(planner.hide_titlebar_apps, planner.custom_resolution_apps,
+                             planner.always_on_top_apps)
+    process_names = sorted(process_names) + [f"unmanaged{i}.exe" for i in range(20)]
+    desktop = SimulatedDesktop.generate(args.windows, process_names)
+
+    plans = []
+    for path, config in zip([args.config, args.compare], configs):
+        planner = WindowRulePlanner.from_config(config)
+        start = time.perf_counter()
+        plan = planner.plan(desktop)
+        elapsed = time.perf_counter() - start
+        plans.append(plan)
+        print(f"{path}: {len(plan)} actions for {args.windows} windows in {elapsed * 1000:.1f}ms")
+        if args.show:
+            for action in plan:
+                print(f"  {action.describe()}")
+
+    if len(plans) == 2:
+        added, removed, changed = diff_plans(*plans)
+        for action in added:
+            print(f"+ {action.describe()}")
+        for action in removed:
+            print(f"- {action.describe()}")
+        for old, new in changed:
+            print(f"~ {old.describe()}  =>  {new.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
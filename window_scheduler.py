@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import math
+import time
+
+
+class TimerHeap:
+    """Keyed one-shot timers multiplexed onto a single Tk after() slot"""
+
+    def __init__(self, root, clock=time.time, debug_mode=False):
+        self.root = root
+        self.clock = clock
+        self.debug_mode = debug_mode
+        self._heap = []
+        self._entries = {}  # key -> [due, seq, key, callback, active]
+        self._counter = itertools.count()
+        self._after_id = None
+        self._armed_due = None
+
+    def schedule(self, key, due, callback):
+        """Run callback at clock time `due`, replacing any timer pending for key"""
+        self.cancel(key)
+        entry = [due, next(self._counter), key, callback, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def cancel(self, key):
+        """Cancel the timer pending for key, if any"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[4] = False  # Lazily removed when it reaches the top of the heap
+
+    def is_pending(self, key):
+        """Check if a timer is pending for key"""
+        return key in self._entries
+
+    def pending_keys(self):
+        """Return keys of all pending timers"""
+        return list(self._entries.keys())
+
+    def clear(self):
+        """Cancel all timers"""
+        self._entries.clear()
+        self._heap.clear()
+        self._disarm()
+
+    def _disarm(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+        self._armed_due = None
+
+    def _arm(self):
+        """Point the Tk timer at the earliest live deadline"""
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._disarm()
+            return
+
+        due = self._heap[0][0]
+        if self._after_id is not None and self._armed_due == due:
+            return
+
+        self._disarm()
+        delay_ms = max(0, math.ceil((due - self.clock()) * 1000))
+        self._after_id = self.root.after(delay_ms, self._fire)
+        self._armed_due = due
+
+    def _fire(self):
+        """Run every timer whose deadline has passed, then re-arm"""
+        self._after_id = None
+        self._armed_due = None
+        now = self.clock()
+
+        while self._heap and self._heap[0][0] <= now:
+            due, _, key, callback, active = heapq.heappop(self._heap)
+            if not active:
+                continue
+            del self._entries[key]
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error running timer for {key}: {e}")
+            if self.debug_mode:
+                print(f"Timer for {key} fired {(self.clock() - due) * 1000:.1f}ms after deadline")
+
+        self._arm()
+
+
+class DebouncedCall:
+    """Runs a callback once triggers have stopped arriving for delay_ms"""
+
+    def __init__(self, widget, delay_ms, callback, clock=time.monotonic):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self.clock = clock
+        self._after_id = None
+        self._last_trigger = None
+
+    def trigger(self):
+        """Note a change; the callback runs delay_ms after the last one"""
+        self._last_trigger = self.clock()
+        # Re-arming on every trigger would churn Tk timers during a drag, so
+        # _fire() checks how long it has been quiet and re-arms if needed
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def is_pending(self):
+        return self._after_id is not None
+
+    def cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+
+    def flush(self):
+        """Cancel the timer and run the callback right away"""
+        self.cancel()
+        self.callback()
+
+    def _fire(self):
+        self._after_id = None
+        remaining_ms = math.ceil(self.delay_ms - (self.clock() - self._last_trigger) * 1000)
+        if remaining_ms > 0:
+            self._after_id = self.widget.after(remaining_ms, self._fire)
+            return
+        try:
+            self.callback()
+        except Exception as e:
+            print(f"Error running debounced {getattr(self.callback, '__name__', self.callback)}: {e}")